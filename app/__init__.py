@@ -8,6 +8,7 @@ from flask import Flask
 from flask_cors import CORS
 from flask_moment import Moment
 from config import config
+from app.utils.serialization import FastJSONProvider
 from datetime import datetime
 
 def create_app(config_name='default'):
@@ -27,12 +28,18 @@ def create_app(config_name='default'):
     # Load configuration
     app.config.from_object(config[config_name])
     
+    # orjson-backed JSON for API responses (stdlib json if not installed)
+    app.json = FastJSONProvider(app)
+    
     # Initialize extensions
     init_extensions(app)
     
     # Register Jinja2 filters
     register_filters(app)
     
+    # Build the format registry and conversion executor once for all requests
+    init_registries(app)
+    
     # Register blueprints
     register_blueprints(app)
     
@@ -53,6 +60,27 @@ def init_extensions(app):
     # Initialize Flask-Moment for datetime handling
     Moment(app)
 
+def init_registries(app):
+    """Build lookup tables and shared services used by all requests"""
+    from app.services.format_registry import init_format_registry
+    from app.services.executor import init_conversion_executor
+    from app.services.scheduler import init_job_scheduler
+    from app.services.estimator import init_conversion_estimator
+    from app.services.media_probe import init_media_probe
+    from app.services.pandoc_server import init_pandoc_server_pool
+    from app.services.font_cache import init_font_cache
+    from app.services.conversion_planner import init_conversion_planner
+    from app.services.job_expiry import init_job_expiry
+    init_format_registry(app)
+    init_conversion_estimator(app)
+    init_media_probe(app)
+    init_pandoc_server_pool(app)
+    init_font_cache(app)
+    init_conversion_planner(app)
+    init_conversion_executor(app)
+    init_job_scheduler(app)
+    init_job_expiry(app)
+
 def register_filters(app):
     """Register custom Jinja2 filters"""
     
@@ -0,0 +1,433 @@
+"""
+Command Line Interface for FileConverter Pro
+
+Bulk conversions (nightly backfills, migrations) do not need the HTTP
+API: going through /api/upload and /api/convert costs multipart encoding,
+request dispatch and a copy of every input into the upload folder. The
+fileconverter CLI reads files where they are, runs ConversionService
+directly on a thread pool (engines still share the adaptive executor's
+slots) and writes outputs next to their sources or into a mirror tree.
+
+Every finished file is appended to a JSON-lines journal. Rerunning the
+same command skips files the journal records as converted (unless the
+source changed since), and inputs with the same content as an already
+converted file reuse its output instead of being converted again.
+
+The watch command runs the same conversions as a daemon, for files
+dropped into directories listed in a rules file (see folder_watcher).
+
+Usage:
+    python -m app.cli convert photos/ --to webp --output-dir converted/photos
+    python -m app.cli convert manifest.txt --to pdf --workers 8
+    python -m app.cli watch --rules watch_rules.json
+"""
+
+import contextvars
+import json
+import os
+import shutil
+import signal
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+import click
+
+from app import create_app
+from app.utils.helpers import calculate_file_hash
+
+JOURNAL_FILENAME = '.fileconverter-journal.jsonl'
+
+
+class ConversionJournal:
+    """Append-only record of finished conversions, keyed by source and target"""
+
+    def __init__(self, path: str):
+        self.path = path
+        # (source, target) -> latest entry
+        self.entries: Dict[Tuple[str, str], Dict] = {}
+        # (checksum, target, options) -> output of a successful conversion
+        self.outputs: Dict[Tuple[str, str, str], str] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except ValueError:
+                        # A line cut short by an interruption
+                        continue
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a')
+
+    def _index(self, entry: Dict):
+        self.entries[(entry['source'], entry['target'])] = entry
+        if entry['status'] == 'converted':
+            self.outputs[(entry['checksum'], entry['target'], entry['options'])] = entry['output']
+
+    def is_done(self, source: str, target: str, stat: os.stat_result) -> bool:
+        """Check whether a source was converted and has not changed since"""
+        entry = self.entries.get((source, target))
+        return bool(
+            entry
+            and entry['status'] in ('converted', 'reused')
+            and entry['size'] == stat.st_size
+            and entry['mtime_ns'] == stat.st_mtime_ns
+            and os.path.exists(entry['output'])
+        )
+
+    def find_output(self, checksum: str, target: str, options_key: str) -> Optional[str]:
+        """Get an existing output converted from identical content"""
+        with self._lock:
+            output = self.outputs.get((checksum, target, options_key))
+        return output if output and os.path.exists(output) else None
+
+    def record(self, entry: Dict):
+        """Append an entry and flush it, so an interruption loses at most this line"""
+        entry['recorded_at'] = datetime.utcnow().isoformat()
+        with self._lock:
+            self._index(entry)
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def iter_sources(source: str, target_format: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    List the files to convert
+
+    Args:
+        source: Directory to walk, or manifest file with one path per line
+            (optionally followed by a tab and a per-file target format)
+        target_format: Target for files without their own
+
+    Yields:
+        Tuples of (absolute path, path relative to the source root, target)
+    """
+    if os.path.isdir(source):
+        root = os.path.abspath(source)
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Skip hidden directories (and with them, journals and VCS data)
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith('.'))
+            for filename in sorted(filenames):
+                if filename.startswith('.'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                yield path, os.path.relpath(path, root), target_format
+        return
+
+    root = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            path, _, per_target = line.partition('\t')
+            path = os.path.abspath(os.path.join(root, path.strip()))
+            relative = os.path.relpath(path, root)
+            if relative.startswith(os.pardir):
+                # Mirror files outside the manifest's directory by absolute path
+                relative = path.lstrip(os.sep)
+            yield path, relative, (per_target.strip() or target_format).lower()
+
+
+class BulkConverter:
+    """Converts files in place or into a mirror tree, recording a journal"""
+
+    def __init__(self, app, journal: ConversionJournal, output_dir: Optional[str],
+                 options: Dict, overwrite: bool = False):
+        from app.services.converter import ConversionService
+        from app.services.format_registry import get_format_registry
+
+        self.app = app
+        self.journal = journal
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.options = options
+        self.options_key = json.dumps(options, sort_keys=True)
+        self.overwrite = overwrite
+        self.service = ConversionService()
+        self.registry = get_format_registry()
+        self.counts = {'converted': 0, 'reused': 0, 'skipped': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def destination(self, path: str, relative: str, output_format: str) -> str:
+        """Where the output of a source file goes"""
+        if self.output_dir:
+            base = os.path.join(self.output_dir, os.path.splitext(relative)[0])
+        else:
+            base = os.path.splitext(path)[0]
+        return f"{base}.{output_format}"
+
+    def convert(self, path: str, relative: str, target_format: str) -> Tuple[str, str]:
+        """
+        Convert one file
+
+        Returns:
+            Tuple of (status, message) where status is one of converted,
+            reused, skipped or failed
+        """
+        extension = os.path.splitext(path)[1][1:].lower()
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            return self._finish('failed', f"{relative}: {e}")
+
+        if extension == target_format or not self.registry.is_supported(extension):
+            return self._finish('skipped', relative)
+        if self.output_dir and path.startswith(self.output_dir + os.sep):
+            # Outputs of an earlier run mirrored inside the source tree
+            return self._finish('skipped', relative)
+        if self.journal.is_done(path, target_format, stat):
+            return self._finish('skipped', relative)
+
+        destination = self.destination(path, relative, target_format)
+        if os.path.exists(destination) and not self.overwrite:
+            return self._finish('skipped', f"{relative}: {destination} exists")
+
+        checksum = calculate_file_hash(path)
+        entry = {
+            'source': path,
+            'target': target_format,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': checksum,
+            'options': self.options_key,
+        }
+
+        # Identical content converted earlier (duplicates are common in backfills)
+        previous = self.journal.find_output(checksum, target_format, self.options_key)
+        if previous:
+            destination = self.destination(path, relative, os.path.splitext(previous)[1][1:])
+            if previous != destination:
+                self._install(previous, destination, copy=True)
+            self.journal.record(dict(entry, status='reused', output=destination))
+            return self._finish('reused', f"{relative} -> {destination}")
+
+        file_info = {
+            'id': uuid.uuid4().hex,
+            'original_filename': os.path.basename(path),
+            'filename': os.path.basename(path),
+            'path': path,
+            'size': stat.st_size,
+            'extension': extension,
+            'checksum': checksum,
+        }
+        result = self.service.convert_single_file(file_info, target_format, dict(self.options))
+        if not result['success']:
+            self.journal.record(dict(entry, status='failed', output=None, error=result['error']))
+            return self._finish('failed', f"{relative}: {result['error']}")
+
+        converted = result['file_info']
+        destination = self.destination(path, relative, converted['extension'])
+        self._install(converted['path'], destination)
+        self.journal.record(dict(entry, status='converted', output=destination))
+        return self._finish('converted', f"{relative} -> {destination}")
+
+    @staticmethod
+    def _install(source: str, destination: str, copy: bool = False):
+        """
+        Put a file in place atomically
+
+        The file is first moved (or copied) to a hidden temporary name in
+        the destination directory and then renamed, so readers of the
+        output tree never see a partial file.
+        """
+        directory, name = os.path.split(destination)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            if copy:
+                shutil.copyfile(source, temp_path)
+            else:
+                # A rename when the converted folder is on the same filesystem
+                shutil.move(source, temp_path)
+            os.replace(temp_path, destination)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _finish(self, status: str, message: str) -> Tuple[str, str]:
+        with self._lock:
+            self.counts[status] += 1
+        return status, message
+
+
+@click.group(name='fileconverter')
+@click.option('--config', 'config_name', default=lambda: os.getenv('FLASK_CONFIG') or 'default',
+              help='Configuration name (default: $FLASK_CONFIG or "default")')
+@click.pass_context
+def cli(ctx, config_name):
+    """FileConverter Pro command line tools"""
+    ctx.obj = create_app(config_name)
+
+
+@cli.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--to', 'target_format', required=True, help='Target format extension')
+@click.option('--output-dir', type=click.Path(file_okay=False),
+              help='Mirror the source tree here (default: write next to each source)')
+@click.option('--journal', 'journal_path', type=click.Path(dir_okay=False),
+              help=f'Journal file (default: {JOURNAL_FILENAME} in the output root)')
+@click.option('--workers', type=int, default=0,
+              help='Files converted concurrently (default: heavy + light executor slots)')
+@click.option('--options', 'options_json', default='{}', help='Conversion options as a JSON object')
+@click.option('--overwrite', is_flag=True, help='Replace outputs the journal does not know about')
+@click.option('--quiet', is_flag=True, help='Only report failures and the summary')
+@click.pass_obj
+def convert(app, source, target_format, output_dir, journal_path, workers, options_json,
+            overwrite, quiet):
+    """
+    Convert a directory tree or the files listed in a manifest
+
+    Interrupted runs resume where they stopped when rerun with the same
+    journal.
+    """
+    try:
+        options = json.loads(options_json)
+    except ValueError as e:
+        raise click.BadParameter(f"not valid JSON: {e}", param_hint='--options')
+    if not isinstance(options, dict):
+        raise click.BadParameter('must be a JSON object', param_hint='--options')
+
+    target_format = target_format.lower().lstrip('.')
+    if not journal_path:
+        root = output_dir or (source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source)))
+        journal_path = os.path.join(root, JOURNAL_FILENAME)
+    if workers <= 0:
+        workers = app.config['CONCURRENCY_HEAVY_MAX'] + app.config['CONCURRENCY_LIGHT_MAX']
+
+    with app.app_context():
+        if not app.extensions['format_registry'].is_supported(target_format):
+            raise click.BadParameter(f'"{target_format}" is not a supported format', param_hint='--to')
+        os.makedirs(app.config['CONVERTED_FOLDER'], exist_ok=True)
+        os.makedirs(app.config['TEMP_FOLDER'], exist_ok=True)
+
+        journal = ConversionJournal(journal_path)
+        converter = BulkConverter(app, journal, output_dir, options, overwrite)
+
+        def report(future, relative):
+            # One file failing (a full disk, an engine bug) must not stop the run
+            try:
+                status, message = future.result()
+            except Exception as e:
+                status, message = converter._finish('failed', f"{relative}: {e}")
+            if status == 'failed':
+                click.echo(f"failed     {message}", err=True)
+            elif not quiet and status != 'skipped':
+                click.echo(f"{status:<10} {message}")
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cli-convert')
+        # future -> relative path of its file
+        pending = {}
+        try:
+            # Submit lazily so a tree of hundreds of thousands of files never
+            # sits in memory as futures
+            for path, relative, per_target in iter_sources(source, target_format):
+                if len(pending) >= workers * 4:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report(future, pending.pop(future))
+                # Each task runs in a copy of this context so it sees the app context
+                future = pool.submit(
+                    contextvars.copy_context().run, converter.convert, path, relative, per_target
+                )
+                pending[future] = relative
+            for future, relative in pending.items():
+                report(future, relative)
+        except KeyboardInterrupt:
+            pool.shutdown(wait=True, cancel_futures=True)
+            click.echo(f"Interrupted; rerun with --journal {journal_path} to resume", err=True)
+            raise SystemExit(130)
+        finally:
+            # Workers still record to the journal until they have all stopped
+            pool.shutdown(wait=True)
+            journal.close()
+
+        counts = converter.counts
+        click.echo(
+            f"{counts['converted']} converted, {counts['reused']} reused, "
+            f"{counts['skipped']} skipped, {counts['failed']} failed (journal: {journal_path})"
+        )
+        if counts['failed']:
+            raise SystemExit(1)
+
+
+@cli.command()
+@click.option('--rules', 'rules_path', type=click.Path(exists=True, dir_okay=False),
+              help='Watch rules JSON file (default: WATCH_RULES_FILE)')
+@click.option('--journal', 'journal_path', type=click.Path(dir_okay=False),
+              help='Journal file (default: WATCH_JOURNAL_PATH)')
+@click.option('--poll', is_flag=True,
+              help='Poll instead of using inotify, e.g. for NFS shares written by other hosts')
+@click.pass_obj
+def watch(app, rules_path, journal_path, poll):
+    """
+    Convert files dropped into watched directories, writing outputs next to them
+
+    Each rule names a directory, a target format and optionally filename
+    patterns, recursion and conversion options. Runs until interrupted.
+    """
+    from app.services.executor import get_conversion_executor
+    from app.services.folder_watcher import FolderWatcher, load_watch_rules
+
+    config = app.config
+    with app.app_context():
+        try:
+            rules = load_watch_rules(rules_path or config['WATCH_RULES_FILE'])
+        except Exception as e:
+            raise click.ClickException(f"Could not load watch rules: {e}")
+        os.makedirs(config['CONVERTED_FOLDER'], exist_ok=True)
+        os.makedirs(config['TEMP_FOLDER'], exist_ok=True)
+
+        journal = ConversionJournal(journal_path or config['WATCH_JOURNAL_PATH'])
+        # Outputs are the watcher's own, so a changed source replaces its output
+        converters = {
+            rule['path']: BulkConverter(app, journal, None, rule['options'], overwrite=True)
+            for rule in rules
+        }
+        executor = get_conversion_executor()
+
+        def report(future):
+            try:
+                status, message = future.result()
+            except Exception as e:
+                status, message = 'failed', str(e)
+            if status == 'failed':
+                click.echo(f"failed     {message}", err=True)
+            elif status != 'skipped':
+                click.echo(f"{status:<10} {message}")
+
+        def queue(path, rule):
+            future = executor.submit(
+                converters[rule['path']].convert, path, os.path.relpath(path, rule['path']), rule['target']
+            )
+            future.add_done_callback(report)
+
+        watcher = FolderWatcher(
+            rules, queue,
+            settle_seconds=config['WATCH_SETTLE_SECONDS'],
+            poll_interval=config['WATCH_POLL_INTERVAL'],
+            use_inotify=not poll
+        )
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        click.echo(f"Watching {len(rules)} director{'y' if len(rules) == 1 else 'ies'} ({watcher.mode})")
+        try:
+            watcher.run(stop)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # Let queued conversions finish so the journal matches the outputs
+            executor.shutdown(wait=True)
+            journal.close()
+
+
+if __name__ == '__main__':
+    cli()
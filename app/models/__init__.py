@@ -14,6 +14,7 @@ from .conversion import (
     ConversionOptions,
     ConversionProgress,
     ConversionJob,
+    JobIndex,
     ConversionJobManager,
     job_manager
 )
@@ -27,6 +28,7 @@ __all__ = [
     'ConversionOptions',
     'ConversionProgress',
     'ConversionJob',
+    'JobIndex',
     'ConversionJobManager',
     'job_manager'
 ]
@@ -5,12 +5,18 @@ This module defines data models for tracking conversion jobs,
 file information, and conversion statistics.
 """
 
+import bisect
+import itertools
+import threading
+import time
 import uuid
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
-import json
+
+from app.utils.serialization import dumps_json, loads_json, pack, unpack
 
 
 class ConversionStatus(Enum):
@@ -23,6 +29,11 @@ class ConversionStatus(Enum):
     EXPIRED = "expired"
 
 
+def _fields_dict(obj) -> Dict:
+    """Shallow field dictionary of a slotted dataclass (dataclasses.asdict deep-copies)"""
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+
 class FileType(Enum):
     """Enumeration of file types"""
     IMAGE = "image"
@@ -36,7 +47,7 @@ class FileType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     """Information about a file"""
     id: str
@@ -57,7 +68,7 @@ class FileInfo:
     
     def to_dict(self) -> Dict:
         """Convert FileInfo to dictionary"""
-        return asdict(self)
+        return _fields_dict(self)
     
     @property
     def size_mb(self) -> float:
@@ -72,7 +83,7 @@ class FileInfo:
         return self.original_filename
 
 
-@dataclass
+@dataclass(slots=True)
 class ConvertedFile:
     """Information about a converted file"""
     id: str
@@ -87,6 +98,7 @@ class ConvertedFile:
     engine: str
     original_size: Optional[int] = None
     compression_ratio: Optional[float] = None
+    checksum: Optional[str] = None
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'ConvertedFile':
@@ -95,7 +107,7 @@ class ConvertedFile:
     
     def to_dict(self) -> Dict:
         """Convert ConvertedFile to dictionary"""
-        return asdict(self)
+        return _fields_dict(self)
     
     @property
     def size_mb(self) -> float:
@@ -110,7 +122,7 @@ class ConvertedFile:
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionError:
     """Information about a conversion error"""
     filename: str
@@ -129,14 +141,15 @@ class ConversionError:
     
     def to_dict(self) -> Dict:
         """Convert ConversionError to dictionary"""
-        return asdict(self)
+        return _fields_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionOptions:
     """Options for file conversion"""
     quality: Optional[int] = None
     resolution: Optional[tuple] = None
+    dpi: Optional[int] = None
     bitrate: Optional[str] = None
     fps: Optional[int] = None
     codec: Optional[str] = None
@@ -149,12 +162,11 @@ class ConversionOptions:
     
     def to_dict(self) -> Dict:
         """Convert ConversionOptions to dictionary"""
-        result = asdict(self)
         # Remove None values
-        return {k: v for k, v in result.items() if v is not None}
+        return {k: v for k, v in _fields_dict(self).items() if v is not None}
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionProgress:
     """Progress information for a conversion job"""
     current: int = 0
@@ -178,10 +190,10 @@ class ConversionProgress:
     
     def to_dict(self) -> Dict:
         """Convert ConversionProgress to dictionary"""
-        return asdict(self)
+        return _fields_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionJob:
     """Model for a conversion job"""
     id: str
@@ -202,7 +214,7 @@ class ConversionJob:
     expires_at: Optional[str] = None
     
     def __post_init__(self):
-        """Post-initialization processing"""
+        """Post-initialization processing (nested dicts are converted by from_dict)"""
         if isinstance(self.status, str):
             self.status = ConversionStatus(self.status)
         
@@ -211,17 +223,6 @@ class ConversionJob:
         
         if self.progress is None:
             self.progress = ConversionProgress(total=self.total_files)
-        
-        # Convert dict objects to dataclass objects
-        self.files = [FileInfo.from_dict(f) if isinstance(f, dict) else f for f in self.files]
-        self.converted_files = [ConvertedFile.from_dict(f) if isinstance(f, dict) else f for f in self.converted_files]
-        self.errors = [ConversionError.from_dict(e) if isinstance(e, dict) else e for e in self.errors]
-        
-        if isinstance(self.options, dict):
-            self.options = ConversionOptions.from_dict(self.options)
-        
-        if isinstance(self.progress, dict):
-            self.progress = ConversionProgress.from_dict(self.progress)
     
     @classmethod
     def create_new(cls, target_format: str, files: List[FileInfo], options: Optional[ConversionOptions] = None) -> 'ConversionJob':
@@ -243,25 +244,46 @@ class ConversionJob:
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'ConversionJob':
-        """Create ConversionJob from dictionary"""
+        """Create ConversionJob from dictionary, converting nested dicts"""
+        data = dict(data)
+        data['files'] = [FileInfo(**f) for f in data.get('files') or ()]
+        data['converted_files'] = [ConvertedFile(**f) for f in data.get('converted_files') or ()]
+        data['errors'] = [ConversionError(**e) for e in data.get('errors') or ()]
+        if data.get('options') is not None:
+            data['options'] = ConversionOptions(**data['options'])
+        if data.get('progress') is not None:
+            data['progress'] = ConversionProgress(**data['progress'])
         return cls(**data)
     
     def to_dict(self) -> Dict:
         """Convert ConversionJob to dictionary"""
-        result = asdict(self)
+        result = _fields_dict(self)
         # Convert enum to string
         result['status'] = self.status.value
+        result['files'] = [_fields_dict(f) for f in self.files]
+        result['converted_files'] = [_fields_dict(f) for f in self.converted_files]
+        result['errors'] = [_fields_dict(e) for e in self.errors]
+        result['options'] = _fields_dict(self.options) if self.options is not None else None
+        result['progress'] = _fields_dict(self.progress) if self.progress is not None else None
         return result
     
     def to_json(self) -> str:
         """Convert ConversionJob to JSON string"""
-        return json.dumps(self.to_dict(), default=str)
+        return dumps_json(self.to_dict()).decode('utf-8')
     
     @classmethod
     def from_json(cls, json_str: str) -> 'ConversionJob':
         """Create ConversionJob from JSON string"""
-        data = json.loads(json_str)
-        return cls.from_dict(data)
+        return cls.from_dict(loads_json(json_str))
+    
+    def to_bytes(self) -> bytes:
+        """Serialize for persistence (msgpack when available, else JSON)"""
+        return pack(self.to_dict())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ConversionJob':
+        """Create ConversionJob from to_bytes output"""
+        return cls.from_dict(unpack(data))
     
     def update_status(self, status: ConversionStatus):
         """Update job status"""
@@ -354,12 +376,192 @@ class ConversionJob:
         }
 
 
+class JobIndex:
+    """
+    Creation-ordered index of jobs with per-status counters
+
+    Job listings page through the index newest first from a cursor, so a
+    page costs O(log n + page size) however many jobs are stored, and the
+    statistics are running totals updated as jobs change. Jobs are
+    referenced by ID; the index does not hold the jobs themselves.
+
+    Removed jobs and old status entries are left in place as tombstones
+    and skipped when reading; the lists are compacted once the tombstones
+    outnumber the live jobs, so removals cost amortized O(1).
+    """
+
+    # Tombstones tolerated before any compaction
+    MIN_COMPACTION = 64
+
+    def __init__(self):
+        self._sequence = itertools.count(1)
+        # job_id -> [seq, status, total_files, completed_files]
+        self._entries: Dict[str, List] = {}
+        self._job_ids: Dict[int, str] = {}
+        self._created: Dict[int, float] = {}
+        # Sequence numbers in creation order, overall and per status
+        self._all: List[int] = []
+        self._by_status: Dict[str, List[int]] = {}
+        # Tombstoned sequence numbers per list (None for _all), sorted
+        self._dead: Dict[Optional[str], List[int]] = {}
+        self._tombstones = 0
+        self.status_counts: Counter = Counter()
+        self.total_files = 0
+        self.completed_files = 0
+        self._lock = threading.Lock()
+
+    def add(self, job_id: str, status: str, total_files: int = 0, completed_files: int = 0):
+        """Index a new job (jobs must be added in creation order)"""
+        with self._lock:
+            seq = next(self._sequence)
+            self._entries[job_id] = [seq, status, total_files, completed_files]
+            self._job_ids[seq] = job_id
+            self._created[seq] = time.time()
+            self._all.append(seq)
+            self._by_status.setdefault(status, []).append(seq)
+            self.status_counts[status] += 1
+            self.total_files += total_files
+            self.completed_files += completed_files
+
+    def update(self, job_id: str, status: Optional[str] = None,
+               completed_files: Optional[int] = None):
+        """Record a job's new status and/or completed file count"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                return
+            seq, old_status = entry[0], entry[1]
+            if status is not None and status != old_status:
+                self._bury(old_status, seq)
+                seqs = self._by_status.setdefault(status, [])
+                position = bisect.bisect_left(seqs, seq)
+                if position < len(seqs) and seqs[position] == seq:
+                    # Back to a status it had before: revive the tombstone
+                    dead = self._dead[status]
+                    del dead[bisect.bisect_left(dead, seq)]
+                    self._tombstones -= 1
+                else:
+                    seqs.insert(position, seq)
+                self.status_counts[old_status] -= 1
+                self.status_counts[status] += 1
+                entry[1] = status
+            if completed_files is not None:
+                self.completed_files += completed_files - entry[3]
+                entry[3] = completed_files
+            self._maybe_compact()
+
+    def remove(self, job_id: str):
+        """Drop a job from the index"""
+        with self._lock:
+            entry = self._entries.pop(job_id, None)
+            if entry is None:
+                return
+            seq, status, total_files, completed_files = entry
+            # Creation times stay until compaction so bisecting still works
+            del self._job_ids[seq]
+            self._bury(None, seq)
+            self._bury(status, seq)
+            self.status_counts[status] -= 1
+            self.total_files -= total_files
+            self.completed_files -= completed_files
+            self._maybe_compact()
+
+    def _bury(self, key: Optional[str], seq: int):
+        """Tombstone a sequence number in _all (key None) or a status list"""
+        dead = self._dead.setdefault(key, [])
+        if dead and dead[-1] > seq:
+            bisect.insort(dead, seq)
+        else:
+            # Oldest-first removal, as expiry does, only ever appends
+            dead.append(seq)
+        self._tombstones += 1
+
+    def _maybe_compact(self):
+        if self._tombstones <= len(self._entries) + self.MIN_COMPACTION:
+            return
+        self._all = [seq for seq in self._all if seq in self._job_ids]
+        for status, seqs in self._by_status.items():
+            self._by_status[status] = [seq for seq in seqs if self._live_id(seq, status) is not None]
+        self._created = {seq: self._created[seq] for seq in self._all}
+        self._dead = {}
+        self._tombstones = 0
+
+    def _live_id(self, seq: int, status: Optional[str]) -> Optional[str]:
+        """Job ID of a sequence number, or None if it is a tombstone"""
+        job_id = self._job_ids.get(seq)
+        if job_id is None or (status is not None and self._entries[job_id][1] != status):
+            return None
+        return job_id
+
+    def page(self, limit: int = 50, cursor: Optional[str] = None, status: Optional[str] = None,
+             created_after: Optional[float] = None) -> Tuple[List[str], Optional[str], int]:
+        """
+        Get one page of job IDs, newest first
+
+        Args:
+            limit: Page size
+            cursor: next_cursor of the previous page, if any
+            status: Only list jobs with this status
+            created_after: Only list jobs created after this UNIX time
+
+        Returns:
+            Tuple of (job IDs, cursor for the next page or None, number of
+            jobs matching the filters)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        with self._lock:
+            seqs = self._all if status is None else self._by_status.get(status, [])
+            start = 0
+            if created_after is not None:
+                start = bisect.bisect_right(seqs, created_after, key=self._created.__getitem__)
+            end = len(seqs)
+            if cursor:
+                end = max(start, bisect.bisect_left(seqs, int(cursor)))
+
+            job_ids = []
+            position = end
+            while position > start and len(job_ids) < limit:
+                position -= 1
+                job_id = self._live_id(seqs[position], status)
+                if job_id is not None:
+                    job_ids.append(job_id)
+            # Step over tombstones so a cursor always leads to more jobs
+            while position > start and self._live_id(seqs[position - 1], status) is None:
+                position -= 1
+            next_cursor = str(seqs[position]) if position > start and job_ids else None
+
+            total = len(seqs) - start
+            dead = self._dead.get(status)
+            if dead and start < len(seqs):
+                total -= len(dead) - bisect.bisect_left(dead, seqs[start])
+            return job_ids, next_cursor, total
+
+    def created_before(self, cutoff: float) -> List[str]:
+        """IDs of jobs created before a UNIX time, oldest first"""
+        with self._lock:
+            end = bisect.bisect_left(self._all, cutoff, key=self._created.__getitem__)
+            return [self._job_ids[seq] for seq in self._all[:end] if seq in self._job_ids]
+
+    def get_statistics(self) -> Dict:
+        """Running totals over the indexed jobs"""
+        with self._lock:
+            return {
+                'total_jobs': len(self._entries),
+                'status_counts': {status: count for status, count in self.status_counts.items() if count},
+                'total_files': self.total_files,
+                'completed_files': self.completed_files
+            }
+
+
 class ConversionJobManager:
     """Manager class for conversion jobs"""
     
     def __init__(self):
         # In production, this would be replaced with Redis or database storage
         self._jobs: Dict[str, ConversionJob] = {}
+        self._index = JobIndex()
     
     def create_job(self, target_format: str, files: List[Dict], options: Optional[Dict] = None) -> ConversionJob:
         """Create a new conversion job"""
@@ -374,6 +576,7 @@ class ConversionJobManager:
         
         # Store job
         self._jobs[job.id] = job
+        self._index.add(job.id, job.status.value, job.total_files, job.completed_files)
         
         return job
     
@@ -382,54 +585,44 @@ class ConversionJobManager:
         return self._jobs.get(job_id)
     
     def update_job(self, job: ConversionJob):
-        """Update a conversion job"""
+        """Update a conversion job (call after changing its status or progress)"""
         self._jobs[job.id] = job
+        self._index.update(job.id, status=job.status.value, completed_files=job.completed_files)
     
     def delete_job(self, job_id: str) -> bool:
         """Delete a conversion job"""
         if job_id in self._jobs:
             del self._jobs[job_id]
+            self._index.remove(job_id)
             return True
         return False
     
-    def list_jobs(self, limit: int = 50, status: Optional[ConversionStatus] = None) -> List[ConversionJob]:
-        """List conversion jobs with optional filtering"""
-        jobs = list(self._jobs.values())
-        
-        if status:
-            jobs = [job for job in jobs if job.status == status]
-        
-        # Sort by creation time (newest first)
-        jobs.sort(key=lambda j: j.created_at, reverse=True)
-        
-        return jobs[:limit]
+    def list_jobs(self, limit: int = 50, status: Optional[ConversionStatus] = None,
+                  cursor: Optional[str] = None) -> List[ConversionJob]:
+        """List conversion jobs newest first, with optional filtering and paging"""
+        job_ids, _, _ = self._index.page(limit, cursor, status.value if status else None)
+        return [self._jobs[job_id] for job_id in job_ids]
     
     def cleanup_expired_jobs(self, max_age_hours: int = 24) -> int:
         """Clean up expired jobs"""
-        from datetime import timedelta
-        
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
-        expired_jobs = []
-        
-        for job_id, job in self._jobs.items():
-            job_time = datetime.fromisoformat(job.created_at.replace('Z', '+00:00'))
-            if job_time < cutoff_time:
-                expired_jobs.append(job_id)
+        expired_jobs = self._index.created_before(time.time() - max_age_hours * 3600)
         
         for job_id in expired_jobs:
-            del self._jobs[job_id]
+            self.delete_job(job_id)
         
         return len(expired_jobs)
     
     def get_statistics(self) -> Dict:
-        """Get overall conversion statistics"""
-        total_jobs = len(self._jobs)
-        completed_jobs = sum(1 for job in self._jobs.values() if job.status == ConversionStatus.COMPLETED)
-        failed_jobs = sum(1 for job in self._jobs.values() if job.status == ConversionStatus.FAILED)
-        processing_jobs = sum(1 for job in self._jobs.values() if job.status == ConversionStatus.PROCESSING)
+        """Get overall conversion statistics (kept incrementally by the index)"""
+        stats = self._index.get_statistics()
+        counts = stats['status_counts']
+        total_jobs = stats['total_jobs']
+        completed_jobs = counts.get(ConversionStatus.COMPLETED.value, 0)
+        failed_jobs = counts.get(ConversionStatus.FAILED.value, 0)
+        processing_jobs = counts.get(ConversionStatus.PROCESSING.value, 0)
         
-        total_files_processed = sum(job.total_files for job in self._jobs.values())
-        total_files_converted = sum(job.completed_files for job in self._jobs.values())
+        total_files_processed = stats['total_files']
+        total_files_converted = stats['completed_files']
         
         return {
             'total_jobs': total_jobs,
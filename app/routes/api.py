@@ -7,24 +7,64 @@ upload handling, status checking, and file downloads.
 
 import os
 import uuid
-import json
 import time
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
-from flask import Blueprint, request, jsonify, current_app, send_file, abort
+from flask import Blueprint, Response, request, jsonify, current_app, abort, stream_with_context
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 
 # Import our services (we'll create these next)
+from app.models import ConversionStatus, JobIndex
 from app.services.file_handler import FileHandler
 from app.services.converter import ConversionService
+from app.services.scheduler import (
+    PRIORITY_CLASSES,
+    estimate_file_times,
+    get_client_id,
+    get_job_scheduler,
+    job_resource_class,
+)
+from app.services.format_registry import get_format_response
+from app.services.conversion_planner import get_conversion_planner
+from app.services.job_expiry import get_job_expiry, init_job_expiry
+from app.services.progress import progress_reporter
+from app.services.media_probe import PROBED_CATEGORIES, get_media_probe
+from app.services.resumable_upload import ResumableUploadManager, UploadSessionError
 from app.utils.validators import FileValidator
 from app.utils.helpers import format_file_size, get_file_type
+from app.utils.http_cache import combined_etag, prepared_json_response, send_download
 
 api_bp = Blueprint("api", __name__)
 
 # In-memory storage for conversion jobs (in production, use Redis or database)
 conversion_jobs = {}
 
+# Creation order and per-status counters for job listings
+job_index = JobIndex()
+
+# Notified whenever a job changes, for status event streams
+job_updates = threading.Condition()
+
+# Bumped on every job change (under job_updates); each job keeps the value
+# of its latest change in "version", so pollers can ask what changed since
+job_store_version = 0
+
+# Job states that never change again
+FINAL_JOB_STATES = ("completed", "failed", "cancelled")
+
+# Live jobs per uploaded file path (under job_updates); one upload can be
+# converted by several jobs and is only released with the last of them
+upload_refs = Counter()
+
+
+@api_bp.record_once
+def _register_job_expiry(state):
+    """Let the expiry thread remove jobs from this blueprint's job store"""
+    expiry = state.app.extensions.get("job_expiry") or init_job_expiry(state.app)
+    expiry.handler = _expire_job
+
 
 @api_bp.route("/upload", methods=["POST"])
 def upload_files():
@@ -99,8 +139,10 @@ def upload_files():
                     )
                     continue
 
-                # Save file
-                file_info = file_handler.save_uploaded_file(file)
+                # Save file, reusing the content sniffed during validation
+                file_info = file_handler.save_uploaded_file(
+                    file, content_info=validation_result["file_info"]
+                )
                 file_info.update(
                     {
                         "status": "uploaded",
@@ -168,6 +210,206 @@ def upload_files():
         )
 
 
+def _upload_session_error_response(error):
+    """Build the JSON response for a resumable upload error"""
+    return (
+        jsonify({"error": error.error, "message": error.message}),
+        error.status_code,
+    )
+
+
+def _upload_session_headers(session):
+    """tus-style headers describing an upload session"""
+    return {
+        "Upload-Offset": str(session["offset"]),
+        "Upload-Length": str(session["length"]),
+        "Upload-Expires": session["expires_at"],
+        "Cache-Control": "no-store",
+    }
+
+
+@api_bp.route("/uploads", methods=["POST"])
+def create_resumable_upload():
+    """
+    Create a resumable upload
+
+    Expected JSON data (or tus headers):
+        filename: Original filename (or Upload-Metadata filename)
+        size: Total file size in bytes (or Upload-Length header)
+
+    Returns:
+        201 with the upload ID, Location and Upload-Offset headers
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        filename = data.get("filename") or request.headers.get("Upload-Filename", "")
+        length = data.get("size", request.headers.get("Upload-Length", 0))
+
+        try:
+            length = int(length)
+        except (TypeError, ValueError):
+            length = 0
+
+        session = ResumableUploadManager().create_upload(filename, length)
+        headers = _upload_session_headers(session)
+        headers["Location"] = f"{request.base_url.rstrip('/')}/{session['id']}"
+
+        return (
+            jsonify(
+                {
+                    "message": "Upload created",
+                    "upload_id": session["id"],
+                    "offset": session["offset"],
+                    "length": session["length"],
+                    "expires_at": session["expires_at"],
+                }
+            ),
+            201,
+            headers,
+        )
+
+    except UploadSessionError as e:
+        return _upload_session_error_response(e)
+
+    except Exception as e:
+        current_app.logger.error(f"Resumable upload creation error: {e}")
+        return (
+            jsonify(
+                {
+                    "error": "Upload failed",
+                    "message": "Unable to create the upload",
+                }
+            ),
+            500,
+        )
+
+
+@api_bp.route("/uploads/<upload_id>", methods=["HEAD"])
+def get_resumable_upload_offset(upload_id):
+    """
+    Get the current offset of a resumable upload
+
+    Returns:
+        Empty 200 response with Upload-Offset and Upload-Length headers
+    """
+    try:
+        session = ResumableUploadManager().get_upload(upload_id)
+        return "", 200, _upload_session_headers(session)
+
+    except UploadSessionError as e:
+        return "", e.status_code, {"Cache-Control": "no-store"}
+
+
+@api_bp.route("/uploads/<upload_id>", methods=["PATCH"])
+def append_resumable_upload_chunk(upload_id):
+    """
+    Append a chunk to a resumable upload
+
+    Expected headers:
+        Upload-Offset: Offset at which the chunk body starts
+
+    Returns:
+        204 with the new Upload-Offset, or 409 if the offset does not match
+    """
+    try:
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            return (
+                jsonify(
+                    {
+                        "error": "Missing offset",
+                        "message": "Upload-Offset header is required",
+                    }
+                ),
+                400,
+            )
+
+        session = ResumableUploadManager().append_chunk(
+            upload_id, offset, request.stream
+        )
+        return "", 204, _upload_session_headers(session)
+
+    except UploadSessionError as e:
+        return _upload_session_error_response(e)
+
+    except Exception as e:
+        current_app.logger.error(f"Resumable upload chunk error for {upload_id}: {e}")
+        return (
+            jsonify(
+                {
+                    "error": "Upload failed",
+                    "message": "Chunk could not be stored, check the offset and resume",
+                }
+            ),
+            500,
+        )
+
+
+@api_bp.route("/uploads/<upload_id>", methods=["DELETE"])
+def delete_resumable_upload(upload_id):
+    """Abort a resumable upload and discard its data"""
+    try:
+        if not ResumableUploadManager().delete_upload(upload_id):
+            return (
+                jsonify(
+                    {
+                        "error": "Upload not found",
+                        "message": f"Upload {upload_id} does not exist",
+                    }
+                ),
+                404,
+            )
+        return "", 204
+
+    except UploadSessionError as e:
+        return _upload_session_error_response(e)
+
+
+@api_bp.route("/uploads/<upload_id>/complete", methods=["POST"])
+def complete_resumable_upload(upload_id):
+    """
+    Finalize a fully received resumable upload
+
+    Returns:
+        JSON response with the same file information as /api/upload
+    """
+    try:
+        file_info = ResumableUploadManager().finalize_upload(upload_id)
+        file_info.update(
+            {
+                "status": "uploaded",
+                "file_type": get_file_type(file_info["extension"]),
+                "size_formatted": format_file_size(file_info["size"]),
+            }
+        )
+
+        return (
+            jsonify(
+                {
+                    "message": "Upload completed successfully",
+                    "file": file_info,
+                }
+            ),
+            200,
+        )
+
+    except UploadSessionError as e:
+        return _upload_session_error_response(e)
+
+    except Exception as e:
+        current_app.logger.error(f"Resumable upload finalize error for {upload_id}: {e}")
+        return (
+            jsonify(
+                {
+                    "error": "Upload failed",
+                    "message": "An unexpected error occurred while completing the upload",
+                }
+            ),
+            500,
+        )
+
+
 @api_bp.route("/convert", methods=["POST"])
 def convert_files():
     """
@@ -198,6 +440,7 @@ def convert_files():
         files = data.get("files", [])
         target_format = data.get("target_format", "").lower().strip()
         options = data.get("options", {})
+        requested_priority = data.get("priority")
 
         # Validate input
         if not files:
@@ -216,6 +459,17 @@ def convert_files():
         if not target_format:
             target_format = None
 
+        if requested_priority is not None and requested_priority not in PRIORITY_CLASSES:
+            return (
+                jsonify(
+                    {
+                        "error": "Invalid priority",
+                        "message": f'Priority must be one of: {", ".join(PRIORITY_CLASSES)}',
+                    }
+                ),
+                400,
+            )
+
         if target_format and not validator.is_format_supported(target_format):
             return (
                 jsonify(
@@ -256,7 +510,10 @@ def convert_files():
 
             source_cat = validator.get_format_category(file_ext)
             target_cat = validator.get_format_category(file_target)
-            if source_cat != target_cat:
+            # The planner only links categories through cross-category engines
+            if source_cat != target_cat and not get_conversion_planner().plan(
+                file_ext, file_target, file.get("size", 0)
+            ):
                 return (
                     jsonify(
                         {
@@ -269,6 +526,26 @@ def convert_files():
 
             file["target_format"] = file_target
 
+        # Learned per-file estimates (size and extension only, so no file is
+        # read here) drive admission, priority and fair scheduling
+        scheduler = get_job_scheduler()
+        file_estimates = estimate_file_times(files, target_format, options)
+        estimated_cost = sum(file_estimates)
+
+        admitted, retry_after = scheduler.admit(estimated_cost)
+        if not admitted:
+            response = jsonify(
+                {
+                    "error": "Server busy",
+                    "message": "The conversion queue is full, please retry later",
+                    "retry_after": retry_after,
+                }
+            )
+            response.headers["Retry-After"] = str(retry_after)
+            return response, 503
+
+        priority = scheduler.classify(requested_priority, estimated_cost)
+
         # Create conversion job
         job_id = str(uuid.uuid4())
         job_data = {
@@ -284,41 +561,29 @@ def convert_files():
             "completed_files": 0,
             "converted_files": [],
             "errors": [],
+            "priority": priority,
+            "file_estimates": file_estimates,
+            "processed_files": 0,
         }
 
         # Store job in memory (in production, use Redis or database)
-        conversion_jobs[job_id] = job_data
-
-        # Start conversion process (this would typically be a Celery task)
-        try:
-            conversion_service = ConversionService()
-            # For now, we'll simulate async processing
-            # In production, this would be: conversion_service.convert_batch.delay(job_id)
-            result = conversion_service.convert_batch(
-                job_id, files, target_format, options
-            )
-
-            # Update job status
-            conversion_jobs[job_id].update(
-                {
-                    "status": "completed" if result["success"] else "failed",
-                    "updated_at": datetime.utcnow().isoformat(),
-                    "progress": 100,
-                    "completed_files": result.get("completed_count", 0),
-                    "converted_files": result.get("converted_files", []),
-                    "errors": result.get("errors", []),
-                }
-            )
-
-        except Exception as e:
-            current_app.logger.error(f"Conversion failed for job {job_id}: {e}")
-            conversion_jobs[job_id].update(
-                {
-                    "status": "failed",
-                    "updated_at": datetime.utcnow().isoformat(),
-                    "errors": [f"Conversion failed: {str(e)}"],
-                }
-            )
+        with job_updates:
+            job_data["version"] = _next_job_version()
+            conversion_jobs[job_id] = job_data
+            job_index.add(job_id, job_data["status"], job_data["total_files"])
+            upload_refs.update(file["path"] for file in files if file.get("path"))
+            job_updates.notify_all()
+        get_job_expiry().schedule(job_id)
+
+        # Queue the job for the conversion executor; clients poll /status
+        schedule = scheduler.submit(
+            job_id,
+            _run_conversion_job,
+            get_client_id(),
+            estimated_cost,
+            priority,
+            job_resource_class(files, target_format),
+        )
 
         return (
             jsonify(
@@ -326,7 +591,11 @@ def convert_files():
                     "message": "Conversion job created successfully",
                     "job_id": job_id,
                     "status": conversion_jobs[job_id]["status"],
-                    "estimated_time": len(files) * 2,  # 2 seconds per file estimate
+                    "priority": priority,
+                    "queue_position": schedule["queue_position"] if schedule else 0,
+                    "estimated_time": round(
+                        estimated_cost + (schedule["estimated_wait"] if schedule else 0)
+                    ),
                 }
             ),
             202,
@@ -345,6 +614,257 @@ def convert_files():
         )
 
 
+def _next_job_version():
+    """Advance the job store version; call with job_updates held"""
+    global job_store_version
+    job_store_version += 1
+    return job_store_version
+
+
+def _update_job(job, **fields):
+    """Update a job and wake status streams waiting for changes"""
+    with job_updates:
+        job.update(fields, updated_at=datetime.utcnow().isoformat(), version=_next_job_version())
+        if "status" in fields or "completed_files" in fields:
+            job_index.update(
+                job["id"], status=fields.get("status"), completed_files=fields.get("completed_files")
+            )
+        job_updates.notify_all()
+
+
+def _remove_job(job_id):
+    """
+    Drop a job record and release its files
+
+    Uploaded files still used by another job are kept.
+
+    Args:
+        job_id: Conversion job ID
+
+    Returns:
+        The removed job, or None if it was already gone
+    """
+    with job_updates:
+        job = conversion_jobs.pop(job_id, None)
+        if job is None:
+            return None
+        job_index.remove(job_id)
+
+        paths = [job.get("zip_path")]
+        paths.extend(file.get("path") for file in job.get("converted_files", []))
+        for file in job["files"]:
+            path = file.get("path")
+            if not path:
+                continue
+            upload_refs[path] -= 1
+            if upload_refs[path] <= 0:
+                del upload_refs[path]
+                paths.append(path)
+        job_updates.notify_all()
+
+    FileHandler().release_job_files(paths)
+    return job
+
+
+def _expire_job(job_id):
+    """
+    Expiry handler: remove a job once its TTL is up
+
+    Jobs still queued or running get another TTL instead, so files are
+    never pulled from under a conversion.
+
+    Args:
+        job_id: Conversion job ID
+    """
+    job = conversion_jobs.get(job_id)
+    if job is not None and job["status"] not in FINAL_JOB_STATES:
+        get_job_expiry().schedule(job_id)
+        return
+    if _remove_job(job_id) is not None:
+        current_app.logger.info(f"Expired conversion job {job_id}")
+
+
+def _probe_job_media(job):
+    """
+    Probe a job's audio/video inputs once, concurrently
+
+    Runs on the job's executor worker rather than in the request that
+    created it, since probing hashes each file; engines reuse the cached
+    results.
+
+    Args:
+        job: Conversion job
+    """
+    validator = FileValidator()
+    paths = [
+        file["path"]
+        for file in job["files"]
+        if file.get("path")
+        and validator.get_format_category(file.get("extension", "")) in PROBED_CATEGORIES
+    ]
+    if not paths:
+        return
+
+    media_info = get_media_probe().probe_many(paths)
+    _update_job(
+        job,
+        files=[
+            {**file, "media": media_info.get(file["path"])} if file.get("path") in media_info else file
+            for file in job["files"]
+        ],
+    )
+
+
+def _run_conversion_job(job_id):
+    """
+    Run a queued conversion job on an executor worker
+
+    Args:
+        job_id: Conversion job ID
+    """
+    job = conversion_jobs[job_id]
+    scheduler = get_job_scheduler()
+    _update_job(job, status="processing", file_started_at=time.time(), current_file=None)
+
+    def update_progress(processed, succeeded):
+        _update_job(
+            job,
+            progress=int(processed / job["total_files"] * 100),
+            completed_files=succeeded,
+            processed_files=processed,
+            file_started_at=time.time(),
+            current_file=None,
+        )
+        scheduler.update_remaining(job_id, _estimate_processing_remaining(job))
+
+    def update_file_progress(file_progress):
+        # Intra-file progress reported by the engine (e.g. ffmpeg -progress)
+        processed = job.get("processed_files", 0)
+        percentage = file_progress.get("percentage") or 0
+        _update_job(
+            job,
+            progress=int((processed + percentage / 100) / job["total_files"] * 100),
+            current_file=file_progress,
+        )
+        scheduler.update_remaining(job_id, _estimate_processing_remaining(job))
+
+    try:
+        _probe_job_media(job)
+        conversion_service = ConversionService()
+        with progress_reporter(update_file_progress):
+            result = conversion_service.convert_batch(
+                job_id,
+                job["files"],
+                job["target_format"],
+                job["options"],
+                progress_callback=update_progress,
+            )
+
+        # Update job status
+        _update_job(
+            job,
+            status="completed" if result["success"] else "failed",
+            progress=100,
+            completed_files=result.get("completed_count", 0),
+            converted_files=result.get("converted_files", []),
+            errors=result.get("errors", []),
+            resource_usage=result.get("resource_usage"),
+            current_file=None,
+        )
+
+    except Exception as e:
+        current_app.logger.error(f"Conversion failed for job {job_id}: {e}")
+        _update_job(
+            job,
+            status="failed",
+            errors=[f"Conversion failed: {str(e)}"],
+            current_file=None,
+        )
+
+
+def _estimate_processing_remaining(job):
+    """
+    Estimate the seconds left for a running job
+
+    The file in progress contributes the engine's own ETA when it reports
+    one, otherwise its estimate minus the time already spent on it; files
+    not yet started contribute their full estimate.
+    """
+    estimates = job.get("file_estimates", [])
+    processed = job.get("processed_files", 0)
+    if processed >= len(estimates):
+        return 0
+
+    current_file = job.get("current_file") or {}
+    if current_file.get("eta_seconds") is not None:
+        current = current_file["eta_seconds"]
+    else:
+        elapsed = time.time() - job.get("file_started_at", time.time())
+        current = max(0, estimates[processed] - elapsed)
+    return current + sum(estimates[processed + 1 :])
+
+
+def _job_status_payload(job_id, job):
+    """
+    Build the status representation shared by /status and its event stream
+
+    Args:
+        job_id: Conversion job ID
+        job: Job dictionary
+
+    Returns:
+        JSON-serializable status dictionary
+    """
+    # Calculate progress details
+    progress_details = {
+        "percentage": job["progress"],
+        "completed_files": job["completed_files"],
+        "total_files": job["total_files"],
+        "remaining_files": job["total_files"] - job["completed_files"],
+    }
+
+    # Estimated time remaining from the learned per-file estimates
+    schedule = None
+    if job["status"] == "queued":
+        schedule = get_job_scheduler().get_job_info(job_id)
+        estimated_remaining = sum(job.get("file_estimates", []))
+        if schedule:
+            estimated_remaining += schedule["estimated_wait"]
+    elif job["status"] == "processing":
+        estimated_remaining = _estimate_processing_remaining(job)
+    else:
+        estimated_remaining = 0
+
+    response_data = {
+        "job_id": job_id,
+        "status": job["status"],
+        "progress": progress_details,
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "estimated_remaining_seconds": int(estimated_remaining),
+        "target_format": job["target_format"],
+        "priority": job.get("priority", "normal"),
+    }
+
+    if schedule:
+        response_data["queue_position"] = schedule["queue_position"]
+
+    if job.get("current_file"):
+        response_data["current_file"] = job["current_file"]
+
+    # Include results if completed
+    if job["status"] in ["completed", "failed"]:
+        response_data.update(
+            {
+                "converted_files": job["converted_files"],
+                "errors": job["errors"],
+                "resource_usage": job.get("resource_usage"),
+            }
+        )
+
+    return response_data
+
+
 @api_bp.route("/status/<job_id>", methods=["GET"])
 def get_conversion_status(job_id):
     """
@@ -368,43 +888,7 @@ def get_conversion_status(job_id):
                 404,
             )
 
-        job = conversion_jobs[job_id]
-
-        # Calculate progress details
-        progress_details = {
-            "percentage": job["progress"],
-            "completed_files": job["completed_files"],
-            "total_files": job["total_files"],
-            "remaining_files": job["total_files"] - job["completed_files"],
-        }
-
-        # Calculate estimated time remaining
-        if job["status"] == "processing" and job["progress"] > 0:
-            elapsed_time = (
-                datetime.utcnow() - datetime.fromisoformat(job["created_at"])
-            ).total_seconds()
-            estimated_total = elapsed_time / (job["progress"] / 100)
-            estimated_remaining = max(0, estimated_total - elapsed_time)
-        else:
-            estimated_remaining = 0
-
-        response_data = {
-            "job_id": job_id,
-            "status": job["status"],
-            "progress": progress_details,
-            "created_at": job["created_at"],
-            "updated_at": job["updated_at"],
-            "estimated_remaining_seconds": int(estimated_remaining),
-            "target_format": job["target_format"],
-        }
-
-        # Include results if completed
-        if job["status"] in ["completed", "failed"]:
-            response_data.update(
-                {"converted_files": job["converted_files"], "errors": job["errors"]}
-            )
-
-        return jsonify(response_data), 200
+        return jsonify(_job_status_payload(job_id, conversion_jobs[job_id])), 200
 
     except Exception as e:
         current_app.logger.error(f"Status check error for job {job_id}: {e}")
@@ -419,6 +903,171 @@ def get_conversion_status(job_id):
         )
 
 
+def _compact_job_status(job):
+    """Minimal status for batch polling; full details stay on /status/<job_id>"""
+    return {
+        "status": job["status"],
+        "progress": job["progress"],
+        "completed_files": job["completed_files"],
+        "total_files": job["total_files"],
+        "error_count": len(job["errors"]),
+        "updated_at": job["updated_at"],
+        "version": job["version"],
+    }
+
+
+@api_bp.route("/status:batch", methods=["POST"])
+def get_batch_conversion_status():
+    """
+    Get the status of many jobs in one request, optionally long-polling
+
+    Request body:
+        job_ids: Job IDs to report on
+        wait: Seconds to hold the request until one of the jobs changes
+            (capped at STATUS_BATCH_MAX_WAIT; 0 answers immediately)
+        since: Store version from a previous response; jobs changed after
+            it count as changes (defaults to the version at request time)
+
+    Returns:
+        JSON response with a compact status per job ID ("not_found" for
+        unknown jobs), the store version to pass as the next "since", and
+        whether any listed job changed
+    """
+    data = request.get_json(silent=True) or {}
+    job_ids = data.get("job_ids")
+    max_jobs = current_app.config["STATUS_BATCH_MAX_JOBS"]
+    if (
+        not isinstance(job_ids, list)
+        or not job_ids
+        or not all(isinstance(job_id, str) for job_id in job_ids)
+    ):
+        return (
+            jsonify(
+                {
+                    "error": "Invalid job IDs",
+                    "message": "job_ids must be a non-empty list of job IDs",
+                }
+            ),
+            400,
+        )
+    if len(job_ids) > max_jobs:
+        return (
+            jsonify(
+                {
+                    "error": "Too many jobs",
+                    "message": f"At most {max_jobs} job IDs per request",
+                }
+            ),
+            400,
+        )
+
+    try:
+        wait = min(float(data.get("wait", 0)), current_app.config["STATUS_BATCH_MAX_WAIT"])
+        since = data.get("since")
+        since = int(since) if since is not None else None
+    except (TypeError, ValueError):
+        return (
+            jsonify(
+                {
+                    "error": "Invalid parameters",
+                    "message": "wait and since must be numbers",
+                }
+            ),
+            400,
+        )
+
+    job_ids = list(dict.fromkeys(job_ids))
+
+    def changed_since(version):
+        return any(
+            conversion_jobs[job_id]["version"] > version
+            for job_id in job_ids
+            if job_id in conversion_jobs
+        )
+
+    with job_updates:
+        if since is None:
+            since = job_store_version
+        changed = changed_since(since)
+
+        # Nothing to wait for once every listed job is finished or unknown
+        active = any(
+            conversion_jobs[job_id]["status"] not in FINAL_JOB_STATES
+            for job_id in job_ids
+            if job_id in conversion_jobs
+        )
+        deadline = time.monotonic() + max(0.0, wait)
+        while not changed and active:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            job_updates.wait(remaining)
+            changed = changed_since(since)
+
+        statuses = {
+            job_id: (
+                _compact_job_status(conversion_jobs[job_id])
+                if job_id in conversion_jobs
+                else {"status": "not_found"}
+            )
+            for job_id in job_ids
+        }
+        version = job_store_version
+
+    return jsonify({"jobs": statuses, "version": version, "changed": changed}), 200
+
+
+@api_bp.route("/status/<job_id>/events", methods=["GET"])
+def stream_conversion_status(job_id):
+    """
+    Stream job status as Server-Sent Events until the job finishes
+
+    Args:
+        job_id: Conversion job ID
+
+    Returns:
+        text/event-stream response or JSON error
+    """
+    if job_id not in conversion_jobs:
+        return (
+            jsonify(
+                {
+                    "error": "Job not found",
+                    "message": f"Conversion job {job_id} does not exist",
+                }
+            ),
+            404,
+        )
+
+    keepalive = current_app.config["SSE_KEEPALIVE_INTERVAL"]
+
+    def generate():
+        last_sent = None
+        while True:
+            job = conversion_jobs.get(job_id)
+            if job is None:
+                return
+
+            if job["updated_at"] != last_sent:
+                last_sent = job["updated_at"]
+                payload = current_app.json.dumps(_job_status_payload(job_id, job))
+                yield f"event: status\ndata: {payload}\n\n"
+
+            if job["status"] in FINAL_JOB_STATES:
+                return
+
+            with job_updates:
+                changed = job["updated_at"] != last_sent or job_updates.wait(keepalive)
+            if not changed:
+                yield ": keepalive\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @api_bp.route("/download/<job_id>", methods=["GET"])
 def download_converted_files(job_id):
     """
@@ -466,9 +1115,13 @@ def download_converted_files(job_id):
                 404,
             )
 
-        # Create ZIP file with converted files
-        file_handler = FileHandler()
-        zip_path = file_handler.create_download_zip(job_id, job["converted_files"])
+        # Build the ZIP once per job so resumed and ranged requests see the
+        # same bytes; a new archive on every request would break If-Range
+        zip_path = job.get("zip_path")
+        if not zip_path or not os.path.exists(zip_path):
+            file_handler = FileHandler()
+            zip_path = file_handler.create_download_zip(job_id, job["converted_files"])
+            job["zip_path"] = zip_path
 
         if not zip_path or not os.path.exists(zip_path):
             return (
@@ -481,12 +1134,16 @@ def download_converted_files(job_id):
                 500,
             )
 
+        checksums = [file_info.get("checksum") for file_info in job["converted_files"]]
+        etag = combined_etag(checksums) if all(checksums) else None
+
         # Send ZIP file
-        return send_file(
+        return send_download(
             zip_path,
-            as_attachment=True,
-            download_name=f"converted_files_{job_id[:8]}.zip",
+            f"converted_files_{job_id[:8]}.zip",
+            etag=etag,
             mimetype="application/zip",
+            max_age=current_app.config["DOWNLOAD_CACHE_MAX_AGE"],
         )
 
     except Exception as e:
@@ -569,7 +1226,12 @@ def download_single_file(job_id, filename):
                 404,
             )
 
-        return send_file(file_path, as_attachment=True, download_name=filename)
+        return send_download(
+            file_path,
+            filename,
+            etag=target_file.get("checksum"),
+            max_age=current_app.config["DOWNLOAD_CACHE_MAX_AGE"],
+        )
 
     except Exception as e:
         current_app.logger.error(f"Single file download error: {e}")
@@ -593,30 +1255,9 @@ def get_supported_formats():
         JSON response with supported formats by category
     """
     try:
-        supported_formats = current_app.config["ALLOWED_EXTENSIONS"]
-        conversion_engines = current_app.config["CONVERSION_ENGINES"]
-
-        # Add engine information to each category
-        formats_with_engines = {}
-        for category, formats in supported_formats.items():
-            formats_with_engines[category] = {
-                "formats": sorted(formats),
-                "count": len(formats),
-                "engines": conversion_engines.get(category, []),
-            }
-
-        return (
-            jsonify(
-                {
-                    "supported_formats": formats_with_engines,
-                    "total_formats": sum(
-                        len(formats) for formats in supported_formats.values()
-                    ),
-                    "categories": list(supported_formats.keys()),
-                    "last_updated": datetime.utcnow().isoformat(),
-                }
-            ),
-            200,
+        return prepared_json_response(
+            get_format_response("api_formats"),
+            current_app.config["FORMATS_CACHE_MAX_AGE"],
         )
 
     except Exception as e:
@@ -637,36 +1278,73 @@ def list_conversion_jobs():
     """
     List recent conversion jobs (for debugging/monitoring)
 
+    Query parameters:
+        limit: Page size (default 50, at most JOBS_PAGE_MAX)
+        cursor: next_cursor from the previous page
+        status: Only list jobs with this status
+
     Returns:
-        JSON response with job list
+        JSON response with one page of jobs, newest first
     """
+    status = request.args.get("status")
+    if status is not None and status not in [s.value for s in ConversionStatus]:
+        return (
+            jsonify(
+                {
+                    "error": "Invalid status",
+                    "message": f'Status must be one of: {", ".join(s.value for s in ConversionStatus)}',
+                }
+            ),
+            400,
+        )
+
     try:
-        # Get recent jobs (last 24 hours)
+        limit = min(
+            max(1, int(request.args.get("limit", 50))), current_app.config["JOBS_PAGE_MAX"]
+        )
+        # Recent jobs only (last 24 hours)
         cutoff_time = datetime.utcnow() - timedelta(hours=24)
-        recent_jobs = []
-
-        for job_id, job in conversion_jobs.items():
-            job_time = datetime.fromisoformat(job["created_at"])
-            if job_time > cutoff_time:
-                recent_jobs.append(
-                    {
-                        "job_id": job_id,
-                        "status": job["status"],
-                        "created_at": job["created_at"],
-                        "total_files": job["total_files"],
-                        "completed_files": job["completed_files"],
-                        "target_format": job["target_format"],
-                    }
-                )
+        job_ids, next_cursor, total_count = job_index.page(
+            limit,
+            cursor=request.args.get("cursor"),
+            status=status,
+            created_after=time.time() - 24 * 3600,
+        )
+    except ValueError:
+        return (
+            jsonify(
+                {
+                    "error": "Invalid parameters",
+                    "message": "limit and cursor must be values returned by this endpoint",
+                }
+            ),
+            400,
+        )
 
-        # Sort by creation time (newest first)
-        recent_jobs.sort(key=lambda x: x["created_at"], reverse=True)
+    try:
+        recent_jobs = []
+        for job_id in job_ids:
+            job = conversion_jobs.get(job_id)
+            if job is None:
+                continue
+            recent_jobs.append(
+                {
+                    "job_id": job_id,
+                    "status": job["status"],
+                    "created_at": job["created_at"],
+                    "total_files": job["total_files"],
+                    "completed_files": job["completed_files"],
+                    "target_format": job["target_format"],
+                }
+            )
 
         return (
             jsonify(
                 {
-                    "jobs": recent_jobs[:50],  # Limit to 50 most recent
-                    "total_count": len(recent_jobs),
+                    "jobs": recent_jobs,
+                    "next_cursor": next_cursor,
+                    "total_count": total_count,
+                    "status_counts": job_index.get_statistics()["status_counts"],
                     "cutoff_time": cutoff_time.isoformat(),
                 }
             ),
@@ -698,19 +1376,22 @@ def cleanup_old_files():
         file_handler = FileHandler()
         cleanup_result = file_handler.cleanup_old_files()
 
-        # Also cleanup old job records (older than 24 hours)
-        cutoff_time = datetime.utcnow() - timedelta(hours=24)
+        # Jobs normally expire on their own; sweep any past their TTL now,
+        # oldest first straight from the creation-ordered index. Jobs still
+        # running stay scheduled, as they would on expiry.
         jobs_cleaned = 0
+        expiry = get_job_expiry()
+        cutoff = time.time() - current_app.config["JOB_TTL_HOURS"] * 3600
+        for job_id in job_index.created_before(cutoff):
+            job = conversion_jobs.get(job_id)
+            if job is None or job["status"] not in FINAL_JOB_STATES:
+                continue
+            expiry.cancel(job_id)
+            if _remove_job(job_id) is not None:
+                jobs_cleaned += 1
 
-        jobs_to_remove = []
-        for job_id, job in conversion_jobs.items():
-            job_time = datetime.fromisoformat(job["created_at"])
-            if job_time < cutoff_time:
-                jobs_to_remove.append(job_id)
-
-        for job_id in jobs_to_remove:
-            del conversion_jobs[job_id]
-            jobs_cleaned += 1
+        # Drop abandoned resumable uploads
+        uploads_expired = ResumableUploadManager().expire_stale_uploads()
 
         return (
             jsonify(
@@ -719,6 +1400,7 @@ def cleanup_old_files():
                     "files_removed": cleanup_result.get("files_removed", 0),
                     "space_freed_mb": cleanup_result.get("space_freed_mb", 0),
                     "jobs_cleaned": jobs_cleaned,
+                    "uploads_expired": uploads_expired,
                     "cleanup_time": datetime.utcnow().isoformat(),
                 }
             ),
@@ -10,6 +10,15 @@ import subprocess
 import time
 from flask import Blueprint, jsonify, current_app
 
+from app.services.executor import get_conversion_executor
+from app.services.scheduler import get_job_scheduler
+from app.services.estimator import get_conversion_estimator
+from app.services.media_probe import get_media_probe
+from app.services.pandoc_server import get_pandoc_server_pool
+from app.services.font_cache import get_font_cache
+from app.services.conversion_planner import get_conversion_planner
+from app.services.job_expiry import get_job_expiry
+
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health')
@@ -32,6 +41,8 @@ def health_check():
             'memory': check_memory_usage()
         }
         
+        pandoc_pool = get_pandoc_server_pool()
+
         # Calculate response time
         response_time = round((time.time() - start_time) * 1000, 2)
         
@@ -46,7 +57,15 @@ def health_check():
             'response_time_ms': response_time,
             'version': '1.0.0',
             'environment': current_app.config.get('ENV', 'development'),
-            'checks': checks
+            'checks': checks,
+            'concurrency': get_conversion_executor().get_stats(),
+            'scheduler': get_job_scheduler().get_stats(),
+            'estimator': get_conversion_estimator().get_stats(),
+            'media_probe': get_media_probe().get_stats(),
+            'pandoc_server': pandoc_pool.get_stats() if pandoc_pool else None,
+            'font_cache': get_font_cache().get_stats(),
+            'planner': get_conversion_planner().get_stats(),
+            'job_expiry': get_job_expiry().get_stats()
         }), status_code
         
     except Exception as e:
@@ -6,7 +6,16 @@ for the user interface.
 """
 
 import os
-from flask import Blueprint, render_template, current_app, jsonify, request
+from flask import Blueprint, render_template, current_app, jsonify, request, make_response
+
+from app.services.format_registry import get_format_registry, get_format_response
+from app.utils.http_cache import (
+    apply_cache_headers,
+    deploy_fingerprint,
+    is_not_modified,
+    not_modified_response,
+    prepared_json_response
+)
 
 main_bp = Blueprint('main', __name__)
 
@@ -22,8 +31,8 @@ def index():
         # Get supported file types from config
         supported_formats = current_app.config['ALLOWED_EXTENSIONS']
         
-        # Calculate total supported formats
-        total_formats = sum(len(formats) for formats in supported_formats.values())
+        # Total supported formats from the startup registry
+        total_formats = get_format_registry().total_formats
         
         # Get conversion engines info
         conversion_engines = current_app.config['CONVERSION_ENGINES']
@@ -77,7 +86,7 @@ def about():
     try:
         # Application statistics
         app_stats = {
-            'supported_formats': sum(len(formats) for formats in current_app.config['ALLOWED_EXTENSIONS'].values()),
+            'supported_formats': get_format_registry().total_formats,
             'format_categories': len(current_app.config['ALLOWED_EXTENSIONS']),
             'max_file_size': current_app.config['MAX_FILE_SIZE_MB'],
             'max_batch_size': current_app.config['MAX_FILES_PER_BATCH'],
@@ -125,18 +134,27 @@ def formats():
         JSON or HTML response with supported formats
     """
     try:
-        supported_formats = current_app.config['ALLOWED_EXTENSIONS']
+        max_age = current_app.config['FORMATS_CACHE_MAX_AGE']
         
         # If request wants JSON (for API)
         if request.headers.get('Accept') == 'application/json':
-            return jsonify({
-                'supported_formats': supported_formats,
-                'total_formats': sum(len(formats) for formats in supported_formats.values()),
-                'categories': list(supported_formats.keys())
-            })
+            response = prepared_json_response(get_format_response('formats_page'), max_age)
+            response.vary.add('Accept')
+            return response
         
-        # Otherwise render HTML page
-        return render_template('formats.html', supported_formats=supported_formats)
+        # Otherwise render HTML page (revalidated against the same format set
+        # and the deployed templates and assets)
+        html_etag = (
+            f"html-{get_format_response('formats_page').etag}"
+            f"-{deploy_fingerprint(current_app._get_current_object())}"
+        )
+        if is_not_modified(html_etag):
+            return not_modified_response(html_etag, max_age)
+        
+        response = make_response(render_template(
+            'formats.html', supported_formats=current_app.config['ALLOWED_EXTENSIONS']
+        ))
+        return apply_cache_headers(response, html_etag, max_age, vary='Accept')
         
     except Exception as e:
         current_app.logger.error(f"Error in formats endpoint: {e}")
@@ -202,7 +220,7 @@ def help_page():
             },
             {
                 'question': 'Which formats are supported?',
-                'answer': f'We support over {sum(len(formats) for formats in current_app.config["ALLOWED_EXTENSIONS"].values())} different file formats across images, videos, audio, documents, and more.'
+                'answer': f'We support over {get_format_registry().total_formats} different file formats across images, videos, audio, documents, and more.'
             },
             {
                 'question': 'Is the service free to use?',
@@ -265,7 +283,5 @@ def inject_global_vars():
         'app_version': '1.0.0',
         'max_file_size_mb': current_app.config['MAX_FILE_SIZE_MB'],
         'max_files_per_batch': current_app.config['MAX_FILES_PER_BATCH'],
-        'total_supported_formats': sum(
-            len(formats) for formats in current_app.config['ALLOWED_EXTENSIONS'].values()
-        )
+        'total_supported_formats': get_format_registry().total_formats
     }
\ No newline at end of file
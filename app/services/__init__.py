@@ -12,6 +12,11 @@ from .converter import (
     VideoConverter,
     AudioConverter,
     DocumentConverter,
+    PdfConverter,
+    SpreadsheetConverter,
+    ArchiveConverter,
+    FontConverter,
+    PresentationConverter,
     ConversionService
 )
 
@@ -23,6 +28,11 @@ __all__ = [
     'VideoConverter', 
     'AudioConverter',
     'DocumentConverter',
+    'PdfConverter',
+    'SpreadsheetConverter',
+    'ArchiveConverter',
+    'FontConverter',
+    'PresentationConverter',
     'ConversionService'
 ]
 
@@ -33,7 +43,12 @@ SERVICES = {
     'image_converter': ImageConverter,
     'video_converter': VideoConverter,
     'audio_converter': AudioConverter,
-    'document_converter': DocumentConverter
+    'document_converter': DocumentConverter,
+    'pdf_converter': PdfConverter,
+    'spreadsheet_converter': SpreadsheetConverter,
+    'archive_converter': ArchiveConverter,
+    'font_converter': FontConverter,
+    'presentation_converter': PresentationConverter
 }
 
 def get_service(service_name: str, *args, **kwargs):
@@ -0,0 +1,483 @@
+"""
+Archive Repacking for FileConverter Pro
+
+Converts between archive formats by streaming each member from the source
+reader straight into the target writer, so nothing is extracted to disk.
+An ExpansionGuard enforces zip-bomb limits on member count, total
+expanded size and expansion ratio. The limits are checked against the
+sizes the archive declares and against the bytes actually decompressed,
+since headers can lie.
+
+py7zr 0.20 can only hand out 7z members as in-memory buffers, so 7z
+sources are instead extracted to a scratch directory in one sequential
+pass (re-reading would decompress solid blocks again from the start)
+and streamed from there, each file removed once it has been copied.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import posixpath
+import queue
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import py7zr
+import rarfile
+
+# Formats that can be read and written
+ARCHIVE_READ_FORMATS = {'zip', '7z', 'rar', 'tar', 'gz', 'bz2', 'xz', 'lzma'}
+ARCHIVE_WRITE_FORMATS = {'zip', '7z', 'tar', 'gz', 'bz2', 'xz'}
+# Compressed single-stream formats; an archive target of these is a compressed tar
+STREAM_OPENERS = {'gz': gzip.open, 'bz2': bz2.open, 'xz': lzma.open, 'lzma': lzma.open}
+
+COPY_CHUNK_SIZE = 1024 * 1024
+# Zip64 is needed for members of 2 GiB and over
+ZIP64_THRESHOLD = (1 << 31) - 1
+# Small archives cannot do harm however well they compress (e.g. logs)
+RATIO_CHECK_FLOOR = 10 * 1024 * 1024
+
+
+class ArchiveLimitError(Exception):
+    """The archive exceeds the configured expansion limits"""
+
+
+class ExpansionGuard:
+    """Tracks expansion of an archive against zip-bomb limits"""
+
+    def __init__(self, archive_size: int, max_bytes: int, max_members: int, max_ratio: float):
+        self.archive_size = max(1, archive_size)
+        self.max_bytes = max_bytes
+        self.max_members = max_members
+        self.max_ratio = max_ratio
+        self.members = 0
+        self.declared_bytes = 0
+        self.expanded_bytes = 0
+
+    def _check_size(self, total: int, kind: str):
+        if self.max_bytes and total > self.max_bytes:
+            raise ArchiveLimitError(
+                f"{kind} size exceeds {self.max_bytes // (1024 * 1024)} MB"
+            )
+        if (self.max_ratio and total > RATIO_CHECK_FLOOR
+                and total > self.archive_size * self.max_ratio):
+            raise ArchiveLimitError(f"{kind} size is over {self.max_ratio:g}x the archive size")
+
+    def add_member(self, declared_size: int):
+        """Account for a member before it is read"""
+        self.members += 1
+        if self.max_members and self.members > self.max_members:
+            raise ArchiveLimitError(f"Archive has more than {self.max_members} members")
+        self.declared_bytes += declared_size
+        self._check_size(self.declared_bytes, "Declared expanded")
+
+    def consume(self, count: int):
+        """Account for decompressed bytes as they are read"""
+        self.expanded_bytes += count
+        self._check_size(self.expanded_bytes, "Expanded")
+
+
+class GuardedStream(io.BufferedIOBase):
+    """
+    Read-only view of a member stream that counts bytes against the guard
+
+    It also refuses to yield more than the member's declared size, and
+    answers the tell/seek-to-end size probe py7zr's writer makes.
+    """
+
+    def __init__(self, raw, guard: Optional[ExpansionGuard], size: int):
+        self.raw = raw
+        self.guard = guard
+        self.size = size
+        self.position = 0
+        self._probed_end = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = COPY_CHUNK_SIZE
+        data = self.raw.read(size)
+        self.position += len(data)
+        if self.position > self.size:
+            raise ArchiveLimitError("Member is larger than its header declares")
+        if self.guard is not None:
+            self.guard.consume(len(data))
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def tell(self) -> int:
+        return self.size if self._probed_end else self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END and offset == 0:
+            self._probed_end = True
+            return self.size
+        if whence == io.SEEK_SET and offset == self.position:
+            self._probed_end = False
+            return self.position
+        raise io.UnsupportedOperation("Member streams are not seekable")
+
+
+def _safe_name(name: str) -> Optional[str]:
+    """Normalize a member name; None for names that escape the archive root"""
+    name = posixpath.normpath(name.replace('\\', '/')).lstrip('/')
+    if not name or name == '.' or name == '..' or name.startswith('../'):
+        return None
+    return name
+
+
+def _member(name: str, size: int, mtime: float, is_dir: bool = False, stream=None) -> Dict:
+    return {'name': name, 'size': size, 'mtime': mtime, 'is_dir': is_dir, 'stream': stream}
+
+
+def is_tar(path: str) -> bool:
+    """Check whether a (possibly compressed) file is a tar archive"""
+    try:
+        return tarfile.is_tarfile(path)
+    except (OSError, tarfile.TarError, EOFError, lzma.LZMAError):
+        return False
+
+
+def iter_members(path: str, source_format: str, guard: ExpansionGuard,
+                 scratch_dir: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield the members of an archive in order
+
+    Each member's stream is only valid until the next member is requested.
+
+    Args:
+        path: Archive path
+        source_format: Archive format (file extension)
+        guard: Expansion guard to account members against
+        scratch_dir: Where 7z sources are extracted (default: system temp)
+
+    Yields:
+        Member dictionaries with name, size, mtime, is_dir and stream
+    """
+    if source_format == 'zip':
+        yield from _iter_zip(path, guard)
+    elif source_format == 'rar':
+        yield from _iter_rar(path, guard)
+    elif source_format == '7z':
+        yield from _iter_7z(path, guard, scratch_dir)
+    elif source_format == 'tar' or is_tar(path):
+        yield from _iter_tar(path, guard)
+    elif source_format in STREAM_OPENERS:
+        yield from _iter_single_stream(path, source_format, guard)
+    else:
+        raise Exception(f"Cannot read {source_format} archives")
+
+
+def _iter_zip(path: str, guard: ExpansionGuard) -> Iterator[Dict]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = _safe_name(info.filename)
+            if name is None:
+                continue
+            guard.add_member(info.file_size)
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            if info.is_dir():
+                yield _member(name, 0, mtime, is_dir=True)
+                continue
+            with archive.open(info) as stream:
+                yield _member(name, info.file_size, mtime,
+                              stream=GuardedStream(stream, guard, info.file_size))
+
+
+def _iter_rar(path: str, guard: ExpansionGuard) -> Iterator[Dict]:
+    with rarfile.RarFile(path) as archive:
+        for info in archive.infolist():
+            name = _safe_name(info.filename)
+            if name is None:
+                continue
+            guard.add_member(info.file_size)
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            if info.is_dir():
+                yield _member(name, 0, mtime, is_dir=True)
+                continue
+            with archive.open(info) as stream:
+                yield _member(name, info.file_size, mtime,
+                              stream=GuardedStream(stream, guard, info.file_size))
+
+
+def _iter_7z(path: str, guard: ExpansionGuard, scratch_dir: Optional[str]) -> Iterator[Dict]:
+    with py7zr.SevenZipFile(path) as archive:
+        members = []
+        seen = set()
+        for info, entry in zip(archive.list(), archive.files):
+            name = _safe_name(info.filename)
+            if name is None or entry.is_symlink or entry.is_junction or entry.is_socket:
+                # Links are not carried over, as with tar sources
+                continue
+            size = 0 if info.is_directory else info.uncompressed
+            # Every member is declared before anything is extracted, and
+            # py7zr writes no more than the declared size
+            guard.add_member(size)
+            if name in seen:
+                # py7zr extracts later copies of a name beside the first
+                continue
+            seen.add(name)
+            members.append((name, info))
+
+        with tempfile.TemporaryDirectory(prefix='7z-', dir=scratch_dir) as scratch:
+            targets = {info.filename for _, info in members if not info.is_directory}
+            if targets:
+                archive.extract(scratch, targets=targets)
+
+            for name, info in members:
+                mtime = info.creationtime.timestamp() if info.creationtime else time.time()
+                if info.is_directory:
+                    yield _member(name, 0, mtime, is_dir=True)
+                    continue
+                member_path = os.path.join(scratch, name)
+                if not os.path.isfile(member_path):
+                    raise Exception(f"7z member {name} could not be extracted")
+                size = os.path.getsize(member_path)
+                with open(member_path, 'rb') as stream:
+                    yield _member(name, size, mtime, stream=GuardedStream(stream, guard, size))
+                os.remove(member_path)
+
+
+def _iter_tar(path: str, guard: ExpansionGuard) -> Iterator[Dict]:
+    # Stream mode reads the (compressed) tar sequentially
+    with tarfile.open(path, 'r|*') as archive:
+        for info in archive:
+            name = _safe_name(info.name)
+            if name is None or not (info.isreg() or info.isdir()):
+                # Links and device nodes are not carried over
+                continue
+            guard.add_member(info.size if info.isreg() else 0)
+            if info.isdir():
+                yield _member(name, 0, info.mtime, is_dir=True)
+                continue
+            stream = archive.extractfile(info)
+            yield _member(name, info.size, info.mtime,
+                          stream=GuardedStream(stream, guard, info.size))
+
+
+def _iter_single_stream(path: str, source_format: str, guard: ExpansionGuard) -> Iterator[Dict]:
+    # A lone compressed file; tar and 7z writers need its size up front, so
+    # count it with a first decompression pass instead of spooling to disk
+    opener = STREAM_OPENERS[source_format]
+    size = 0
+    counter = ExpansionGuard(guard.archive_size, guard.max_bytes, 0, guard.max_ratio)
+    with opener(path, 'rb') as stream:
+        while True:
+            data = stream.read(COPY_CHUNK_SIZE)
+            if not data:
+                break
+            size += len(data)
+            counter.consume(len(data))
+
+    name = os.path.splitext(os.path.basename(path))[0] or 'data'
+    guard.add_member(size)
+    with opener(path, 'rb') as stream:
+        yield _member(name, size, os.path.getmtime(path),
+                      stream=GuardedStream(stream, guard, size))
+
+
+class _QueueStream:
+    """Reads one member's chunks from a prefetch queue"""
+
+    def __init__(self, prefetcher: '_Prefetcher'):
+        self.prefetcher = prefetcher
+        self.buffer = b''
+        self.finished = False
+
+    def read(self, size: int = -1) -> bytes:
+        """Read exactly size bytes unless the member ends (tarfile relies on it)"""
+        if size is None or size < 0:
+            size = COPY_CHUNK_SIZE
+        while len(self.buffer) < size and not self.finished:
+            kind, data = self.prefetcher.next_item()
+            if kind == 'end':
+                self.finished = True
+            else:
+                self.buffer += data
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def drain(self):
+        while not self.finished:
+            self.read(COPY_CHUNK_SIZE)
+
+
+class _Prefetcher:
+    """Decompresses members on a background thread, ahead of the writer"""
+
+    def __init__(self, members: Iterator[Dict], depth: int = 8):
+        self.members = members
+        self.queue: 'queue.Queue' = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='archive-reader', daemon=True)
+        self.thread.start()
+
+    def _put(self, item) -> bool:
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            for member in self.members:
+                stream = member.pop('stream')
+                if not self._put(('member', member)):
+                    return
+                while stream is not None:
+                    data = stream.read(COPY_CHUNK_SIZE)
+                    if not data:
+                        break
+                    if not self._put(('data', data)):
+                        return
+                if not self._put(('end', None)):
+                    return
+            self._put(('done', None))
+        except BaseException as e:
+            self._put(('error', e))
+
+    def next_item(self):
+        kind, data = self.queue.get()
+        if kind == 'error':
+            raise data
+        return kind, data
+
+    def __iter__(self) -> Iterator[Dict]:
+        while True:
+            kind, member = self.next_item()
+            if kind == 'done':
+                return
+            stream = _QueueStream(self)
+            # Already counted against the guard on the reader thread
+            yield {**member, 'stream': GuardedStream(stream, None, member['size'])}
+            stream.drain()
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+def write_archive(output_path: str, target_format: str, members: Iterator[Dict],
+                  level: int) -> int:
+    """
+    Write members into a new archive
+
+    Args:
+        output_path: Archive to create
+        target_format: zip, 7z, tar, or gz/bz2/xz for a compressed tar
+        members: Members from iter_members (consumed in order)
+        level: Compression level 0-9
+
+    Returns:
+        Number of members written
+    """
+    count = 0
+    if target_format == 'zip':
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=level) as archive:
+            for member in members:
+                # ZIP timestamps cannot predate 1980
+                date_time = datetime.fromtimestamp(max(member['mtime'], 315619200)).timetuple()[:6]
+                if member['is_dir']:
+                    archive.writestr(zipfile.ZipInfo(member['name'].rstrip('/') + '/', date_time), b'')
+                else:
+                    info = zipfile.ZipInfo(member['name'], date_time)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with archive.open(info, 'w', force_zip64=member['size'] >= ZIP64_THRESHOLD) as target:
+                        shutil.copyfileobj(member['stream'], target, COPY_CHUNK_SIZE)
+                count += 1
+
+    elif target_format == '7z':
+        filters = [{'id': py7zr.FILTER_LZMA2, 'preset': level}]
+        with py7zr.SevenZipFile(output_path, 'w', filters=filters) as archive:
+            for member in members:
+                # Directories are implied by their files' paths
+                if not member['is_dir']:
+                    archive.writef(member['stream'], member['name'])
+                    count += 1
+
+    else:
+        mode, options = {
+            'tar': ('w', {}),
+            'gz': ('w:gz', {'compresslevel': max(1, level)}),
+            'bz2': ('w:bz2', {'compresslevel': max(1, level)}),
+            'xz': ('w:xz', {'preset': level}),
+        }[target_format]
+        with tarfile.open(output_path, mode, **options) as archive:
+            for member in members:
+                info = tarfile.TarInfo(member['name'])
+                info.mtime = int(member['mtime'])
+                if member['is_dir']:
+                    info.type = tarfile.DIRTYPE
+                    info.mode = 0o755
+                    archive.addfile(info)
+                else:
+                    info.size = member['size']
+                    info.mode = 0o644
+                    archive.addfile(info, member['stream'])
+                count += 1
+
+    return count
+
+
+def repack_archive(input_path: str, output_path: str, source_format: str, target_format: str,
+                   level: int, limits: Dict, threads: int = 1, scratch_dir: Optional[str] = None) -> Dict:
+    """
+    Repack an archive into another format
+
+    Args:
+        input_path: Source archive
+        output_path: Target archive (gz/bz2/xz targets get a .tar.<ext> name)
+        source_format: Source archive format
+        target_format: Target archive format
+        level: Compression level 0-9
+        limits: max_bytes, max_members and max_ratio
+        threads: 1 reads and writes on the calling thread; more decompress
+            on a separate thread so it overlaps with compression
+        scratch_dir: Where 7z sources are extracted (default: system temp)
+
+    Returns:
+        Dictionary with output_path, members and expanded_size
+    """
+    if target_format in STREAM_OPENERS:
+        stem = os.path.splitext(output_path)[0]
+        if not stem.endswith('.tar'):
+            stem += '.tar'
+        output_path = f"{stem}.{target_format}"
+
+    guard = ExpansionGuard(
+        os.path.getsize(input_path), limits['max_bytes'], limits['max_members'], limits['max_ratio']
+    )
+    members = iter_members(input_path, source_format, guard, scratch_dir)
+    prefetcher = _Prefetcher(members) if threads > 1 else None
+
+    try:
+        count = write_archive(output_path, target_format, prefetcher or members, level)
+    except BaseException:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+        members.close()
+
+    return {
+        'output_path': output_path,
+        'members': count,
+        'expanded_size': guard.expanded_bytes,
+    }
@@ -0,0 +1,232 @@
+"""
+Conversion Planner for FileConverter Pro
+
+The format registry only knows direct conversions: one engine per format
+pair. Many pairs with no engine are still reachable through an
+intermediate format (md -> docx -> odt, pptx -> png -> ico). The planner
+treats every direct conversion as a weighted edge, using the learned
+conversion-time model for the weights, and finds the cheapest path of at
+most max_hops steps. Pairs with a direct engine always use it, so
+multi-step plans only ever open up pairs that used to be rejected.
+
+Search results are cached per source format and size bucket and
+recomputed after replan_interval seconds, so plans follow the estimator
+as it learns.
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from flask import current_app
+
+from app.services.estimator import ConversionEstimator, get_conversion_estimator
+from app.services.format_registry import FormatRegistry, get_format_registry
+
+# Input size used when listing reachable pairs
+REFERENCE_SIZE = 1024 * 1024
+
+
+class ConversionPlanner:
+    """Cheapest multi-step conversion paths over the registry's engines"""
+
+    def __init__(self, registry: FormatRegistry, max_hops: int = 3, hop_penalty: float = 0.25,
+                 replan_interval: float = 60, cache_size: int = 256):
+        self.registry = registry
+        self.max_hops = max(1, max_hops)
+        self.hop_penalty = hop_penalty
+        self.replan_interval = replan_interval
+        self.cache_size = cache_size
+
+        # source -> [(target, engine)], limited to the pairs the API accepts
+        self.edges: Dict[str, List[Tuple[str, type]]] = {}
+        for source, row in registry.conversion_matrix.items():
+            self.edges[source] = [
+                (target, engine) for target, engine in row.items()
+                if engine.CROSS_CATEGORY
+                or registry.get_category(source) == registry.get_category(target)
+            ]
+
+        # (source, size bucket) -> (computed at, {target: plan})
+        self._plans: 'OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Dict]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(self, source_format: str, target_format: str, size: int = REFERENCE_SIZE) -> Optional[Dict]:
+        """
+        Find the cheapest way to convert between two formats
+
+        Args:
+            source_format: Source format extension
+            target_format: Target format extension
+            size: Input size in bytes (edge weights scale with it)
+
+        Returns:
+            Plan dictionary with 'steps' (list of {'from', 'to', 'engine'})
+            and 'estimated_seconds', or None if the target is unreachable
+        """
+        source_format = source_format.lower()
+        target_format = target_format.lower()
+        if source_format == target_format:
+            return None
+        return self.reachable(source_format, size).get(target_format)
+
+    def reachable(self, source_format: str, size: int = REFERENCE_SIZE) -> Dict[str, Dict]:
+        """
+        Get the plans for every format reachable from a source format
+
+        Args:
+            source_format: Source format extension
+            size: Input size in bytes
+
+        Returns:
+            Mapping of target format to plan
+        """
+        source_format = source_format.lower()
+        key = (source_format, ConversionEstimator.size_bucket(size))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._plans.get(key)
+            if cached is not None and now - cached[0] < self.replan_interval:
+                self._plans.move_to_end(key)
+                return cached[1]
+
+        plans = self._search(source_format, size)
+
+        with self._lock:
+            self._plans[key] = (now, plans)
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.cache_size:
+                self._plans.popitem(last=False)
+        return plans
+
+    def _search(self, source_format: str, size: int) -> Dict[str, Dict]:
+        """
+        Hop-limited Dijkstra from one source format
+
+        Labels are (cost, hops); a format is expanded again if it is reached
+        in fewer hops than before, as a costlier but shorter path may still
+        have room to reach formats a longer one cannot.
+        """
+        estimator = get_conversion_estimator()
+        weights: Dict[Tuple[str, str], float] = {}
+
+        def weight(source: str, target: str, engine: type) -> float:
+            pair = (source, target)
+            if pair not in weights:
+                # Intermediates are assumed to be about the size of the input
+                weights[pair], _ = estimator.estimate(engine.__name__, source, target, size)
+            return weights[pair]
+
+        plans: Dict[str, Dict] = {}
+        # Format -> hops at which it was last expanded
+        expanded: Dict[str, int] = {}
+        heap = [(0.0, 0, source_format, ())]
+        while heap:
+            cost, hops, node, path = heapq.heappop(heap)
+            if expanded.get(node, self.max_hops + 1) <= hops:
+                continue
+            expanded[node] = hops
+            # Labels come off the heap cheapest first
+            if path and node not in plans:
+                plans[node] = self._make_plan(path, weights)
+            if hops == self.max_hops:
+                continue
+
+            for target, engine in self.edges.get(node, ()):
+                if target == source_format or expanded.get(target, self.max_hops + 1) <= hops + 1:
+                    continue
+                step_cost = weight(node, target, engine) + self.hop_penalty
+                heapq.heappush(heap, (cost + step_cost, hops + 1, target, path + ((node, target, engine),)))
+
+        # A direct engine wins over any multi-step path
+        for target, engine in self.edges.get(source_format, ()):
+            plans[target] = self._make_plan(((source_format, target, engine),), weights)
+        return plans
+
+    @staticmethod
+    def _make_plan(path, weights: Dict[Tuple[str, str], float]) -> Dict:
+        return {
+            'steps': [{'from': source, 'to': target, 'engine': engine} for source, target, engine in path],
+            'estimated_seconds': round(sum(weights[(source, target)] for source, target, _ in path), 3),
+        }
+
+    def resource_class(self, source_format: str, target_format: str, size: int = REFERENCE_SIZE) -> str:
+        """
+        Executor resource class a conversion will need
+
+        Direct engines are used when there is one, as the conversion
+        service does; a multi-step conversion is heavy if any step is.
+
+        Returns:
+            "heavy" or "light"
+        """
+        engine = self.registry.get_engine(source_format, target_format)
+        if engine is not None:
+            return engine.get_resource_class(source_format, target_format)
+        plan = self.plan(source_format, target_format, size)
+        if plan and any(
+            step['engine'].get_resource_class(step['from'], step['to']) == 'heavy'
+            for step in plan['steps']
+        ):
+            return 'heavy'
+        return 'light'
+
+    def get_supported_conversions(self) -> Dict[str, List[Dict]]:
+        """
+        List every reachable pair with its estimated cost for a 1 MB input
+
+        Returns:
+            Mapping of source category to conversion entries
+        """
+        conversions = {}
+        for category, formats in self.registry.category_formats.items():
+            entries = []
+            for source in formats:
+                if self.registry.get_category(source) != category:
+                    continue
+                for target, plan in sorted(self.reachable(source).items()):
+                    steps = plan['steps']
+                    entries.append({
+                        'from': source,
+                        'to': target,
+                        'engine': ' -> '.join(step['engine'].__name__ for step in steps),
+                        'via': [step['to'] for step in steps[:-1]],
+                        'estimated_seconds': plan['estimated_seconds'],
+                    })
+            if entries:
+                conversions[category] = entries
+        return conversions
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'cached_sources': len(self._plans),
+                'max_hops': self.max_hops,
+                'edges': sum(len(edges) for edges in self.edges.values())
+            }
+
+
+def init_conversion_planner(app) -> ConversionPlanner:
+    """Create the conversion planner and attach it to the application"""
+    config = app.config
+    registry = app.extensions.get('format_registry')
+    if registry is None:
+        with app.app_context():
+            registry = get_format_registry()
+    planner = ConversionPlanner(
+        registry,
+        max_hops=config['PLANNER_MAX_HOPS'],
+        hop_penalty=config['PLANNER_HOP_PENALTY'],
+        replan_interval=config['PLANNER_REPLAN_INTERVAL']
+    )
+    app.extensions['conversion_planner'] = planner
+    return planner
+
+
+def get_conversion_planner() -> ConversionPlanner:
+    """Get the conversion planner of the current application"""
+    planner = current_app.extensions.get('conversion_planner')
+    if planner is None:
+        planner = init_conversion_planner(current_app._get_current_object())
+    return planner
@@ -8,25 +8,64 @@ This service handles file conversions using multiple engines:
 - LibreOffice for office documents
 """
 
+import contextvars
+import csv
+import io
+import math
 import os
-import subprocess
+import shutil
+import sys
 import tempfile
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from flask import current_app
 from PIL import Image, ImageEnhance
+from PyPDF2 import PdfReader
 import ffmpeg
+import openpyxl
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 from wand.image import Image as WandImage
 from wand.exceptions import WandException
 
 from app.services.file_handler import FileHandler
-from app.utils.helpers import get_file_type, format_file_size
+from app.services.format_registry import get_format_registry
+from app.services.process_supervisor import run_supervised, ProcessTimeoutError
+from app.services.progress import FFmpegProgressParser, progress_stage, report_progress
+from app.utils.pdf_pages import page_filename
+from app.services.media_probe import get_media_probe
+from app.services.pandoc_server import PandocServerUnavailable, get_pandoc_server_pool
+from app.services.archive_repack import (
+    ARCHIVE_READ_FORMATS,
+    ARCHIVE_WRITE_FORMATS,
+    ArchiveLimitError,
+    repack_archive,
+)
+from app.services.executor import get_conversion_executor
+from app.services.font_cache import get_font_cache
+from app.services.estimator import get_conversion_estimator
+from app.services.conversion_planner import get_conversion_planner
+from app.utils.helpers import get_file_type, format_file_size, calculate_file_hash
 
 
 class ConversionEngine:
     """Base class for all conversion engines"""
 
+    # Concurrency class used by the conversion executor ("heavy" or "light")
+    RESOURCE_CLASS = "light"
+
+    # Whether the API may route conversions into another category to this engine
+    CROSS_CATEGORY = False
+
+    @classmethod
+    def get_resource_class(cls, source_format: str, target_format: str) -> str:
+        """Get the concurrency class for a conversion"""
+        return cls.RESOURCE_CLASS
+
     @staticmethod
     def can_convert(source_format: str, target_format: str) -> bool:
         """Check if this engine can handle the conversion"""
@@ -233,9 +272,44 @@ class ImageConverter(ConversionEngine):
         return save_options
 
 
+def _probe_duration(input_path: str) -> Optional[float]:
+    """Get the media duration in seconds, or None if it cannot be probed"""
+    media_info = get_media_probe().probe(input_path)
+    return media_info.get("duration") if media_info else None
+
+
+def _run_ffmpeg(output_stream, input_path: str) -> Dict:
+    """
+    Run an ffmpeg-python stream under the supervisor with progress reporting
+
+    ffmpeg writes -progress blocks to stdout; they are reported as
+    intra-file progress and an encode whose position stops advancing for
+    FFMPEG_STALL_TIMEOUT seconds is killed as stalled.
+
+    Args:
+        output_stream: ffmpeg-python output node
+        input_path: Source file, probed for its duration
+
+    Returns:
+        Supervisor result dictionary
+    """
+    parser = FFmpegProgressParser(_probe_duration(input_path))
+    cmd = ffmpeg.compile(
+        output_stream.global_args("-progress", "pipe:1", "-nostats"),
+        overwrite_output=True,
+    )
+    return run_supervised(
+        cmd,
+        line_callback=parser.feed,
+        stall_timeout=current_app.config["FFMPEG_STALL_TIMEOUT"],
+    )
+
+
 class VideoConverter(ConversionEngine):
     """Video conversion using FFmpeg"""
 
+    RESOURCE_CLASS = "heavy"
+
     VIDEO_FORMATS = {
         "mp4",
         "avi",
@@ -310,20 +384,23 @@ class VideoConverter(ConversionEngine):
                 **codec_options,
             )
 
-            # Run conversion
-            ffmpeg.run(output_stream, overwrite_output=True, quiet=True)
+            # Run conversion under the process supervisor
+            process = _run_ffmpeg(output_stream, input_path)
+
+            if process["returncode"] != 0:
+                current_app.logger.error(
+                    f"FFmpeg video conversion failed: {process['stderr']}"
+                )
+                raise Exception(process["stderr"])
 
             return {
                 "success": True,
                 "engine": "ffmpeg",
                 "input_size": os.path.getsize(input_path),
                 "output_size": os.path.getsize(output_path),
+                "resource_usage": process["resource_usage"],
             }
 
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if e.stderr else str(e)
-            current_app.logger.error(f"FFmpeg video conversion failed: {error_message}")
-            raise Exception(f"Video conversion failed: {error_message}")
         except Exception as e:
             current_app.logger.error(f"Video conversion error: {e}")
             raise Exception(f"Video conversion failed: {str(e)}")
@@ -401,18 +478,19 @@ class AudioConverter(ConversionEngine):
 
             # Run conversion
             output_stream = ffmpeg.output(input_stream, output_path, **audio_options)
-            ffmpeg.run(output_stream, overwrite_output=True, quiet=True)
+            process = _run_ffmpeg(output_stream, input_path)
+
+            if process["returncode"] != 0:
+                raise Exception(process["stderr"])
 
             return {
                 "success": True,
                 "engine": "ffmpeg_audio",
                 "input_size": os.path.getsize(input_path),
                 "output_size": os.path.getsize(output_path),
+                "resource_usage": process["resource_usage"],
             }
 
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if e.stderr else str(e)
-            raise Exception(f"Audio conversion failed: {error_message}")
         except Exception as e:
             raise Exception(f"Audio conversion failed: {str(e)}")
 
@@ -447,6 +525,21 @@ class DocumentConverter(ConversionEngine):
             and target_format.lower() in all_formats
         )
 
+    @classmethod
+    def get_resource_class(cls, source_format: str, target_format: str) -> str:
+        """LibreOffice conversions are heavy; Pandoc ones are light"""
+        if cls._uses_pandoc(source_format, target_format):
+            return "light"
+        return "heavy"
+
+    @staticmethod
+    def _uses_pandoc(source_format: str, target_format: str) -> bool:
+        """Check whether Pandoc handles this pair (LibreOffice otherwise)"""
+        return (
+            source_format.lower() in DocumentConverter.PANDOC_FORMATS
+            and target_format.lower() in DocumentConverter.PANDOC_FORMATS
+        )
+
     @staticmethod
     def convert(input_path: str, output_path: str, options: Dict = None) -> Dict:
         """Convert document using appropriate engine"""
@@ -458,10 +551,7 @@ class DocumentConverter(ConversionEngine):
 
         try:
             # Choose conversion method
-            if (
-                source_ext in DocumentConverter.PANDOC_FORMATS
-                and target_ext in DocumentConverter.PANDOC_FORMATS
-            ):
+            if DocumentConverter._uses_pandoc(source_ext, target_ext):
                 return DocumentConverter._convert_with_pandoc(
                     input_path, output_path, options
                 )
@@ -477,6 +567,14 @@ class DocumentConverter(ConversionEngine):
     @staticmethod
     def _convert_with_pandoc(input_path: str, output_path: str, options: Dict) -> Dict:
         """Convert using Pandoc"""
+        # Prefer a warm pandoc-server; templates are paths only the CLI can read
+        pool = get_pandoc_server_pool()
+        if pool is not None and not options.get("template"):
+            try:
+                return pool.convert(input_path, output_path)
+            except PandocServerUnavailable as e:
+                current_app.logger.debug(f"Using pandoc subprocess: {e}")
+
         try:
             cmd = ["pandoc", input_path, "-o", output_path]
 
@@ -484,19 +582,20 @@ class DocumentConverter(ConversionEngine):
             if options.get("template"):
                 cmd.extend(["--template", options["template"]])
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = run_supervised(cmd)
 
-            if result.returncode != 0:
-                raise Exception(f"Pandoc error: {result.stderr}")
+            if result["returncode"] != 0:
+                raise Exception(f"Pandoc error: {result['stderr']}")
 
             return {
                 "success": True,
                 "engine": "pandoc",
                 "input_size": os.path.getsize(input_path),
                 "output_size": os.path.getsize(output_path),
+                "resource_usage": result["resource_usage"],
             }
 
-        except subprocess.TimeoutExpired:
+        except ProcessTimeoutError:
             raise Exception("Pandoc conversion timed out")
         except Exception as e:
             raise Exception(f"Pandoc conversion failed: {str(e)}")
@@ -522,12 +621,10 @@ class DocumentConverter(ConversionEngine):
                     input_path,
                 ]
 
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, timeout=120
-                )
+                result = run_supervised(cmd)
 
-                if result.returncode != 0:
-                    raise Exception(f"LibreOffice error: {result.stderr}")
+                if result["returncode"] != 0:
+                    raise Exception(f"LibreOffice error: {result['stderr']}")
 
                 # Find the converted file and move it to the correct location
                 input_filename = os.path.splitext(os.path.basename(input_path))[0]
@@ -545,31 +642,853 @@ class DocumentConverter(ConversionEngine):
                     "engine": "libreoffice",
                     "input_size": os.path.getsize(input_path),
                     "output_size": os.path.getsize(output_path),
+                    "resource_usage": result["resource_usage"],
                 }
 
             finally:
                 # Cleanup temp directory
-                import shutil
-
                 shutil.rmtree(temp_dir, ignore_errors=True)
 
-        except subprocess.TimeoutExpired:
+        except ProcessTimeoutError:
             raise Exception("LibreOffice conversion timed out")
         except Exception as e:
             raise Exception(f"LibreOffice conversion failed: {str(e)}")
 
+    @staticmethod
+    def convert_many_with_libreoffice(conversions: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """
+        Convert several documents to one target format in a single LibreOffice run
+
+        Args:
+            conversions: (input_path, output_path) pairs sharing a target extension
+
+        Returns:
+            One result per pair, in order. Files LibreOffice could not convert
+            get success False and an error; the others are moved into place.
+            If the run stalled, the document it was stuck on fails and the
+            ones after it are None (not attempted).
+
+        Raises:
+            Exception: If the LibreOffice run itself failed
+        """
+        target_format = os.path.splitext(conversions[0][1])[1][1:]
+        temp_dir = tempfile.mkdtemp()
+
+        try:
+            # Link inputs under their index so outputs map back even when two
+            # inputs share a name stem
+            input_dir = os.path.join(temp_dir, "in")
+            output_dir = os.path.join(temp_dir, "out")
+            os.makedirs(input_dir)
+            inputs = []
+            for i, (input_path, _) in enumerate(conversions):
+                link_path = os.path.join(input_dir, f"{i}{os.path.splitext(input_path)[1]}")
+                os.symlink(os.path.abspath(input_path), link_path)
+                inputs.append(link_path)
+
+            cmd = [
+                "libreoffice",
+                "--headless",
+                "--convert-to",
+                target_format,
+                "--outdir",
+                output_dir,
+                *inputs,
+            ]
+            # LibreOffice prints a "convert ... -> ..." line per document, in
+            # argument order; a document that takes longer than a single
+            # conversion may stops the run instead of holding the batch
+            per_file_timeout = current_app.config["CONVERSION_TIMEOUT"]
+            stalled = False
+            try:
+                result = run_supervised(
+                    cmd,
+                    timeout=per_file_timeout * len(conversions),
+                    line_callback=lambda line: line.startswith("convert "),
+                    stall_timeout=per_file_timeout,
+                )
+            except ProcessTimeoutError as e:
+                result = e.result
+                stalled = True
+            else:
+                if result["returncode"] != 0:
+                    raise Exception(f"LibreOffice error: {result['stderr']}")
+
+            # Apportion the run's CPU time by input size
+            input_sizes = [os.path.getsize(input_path) for input_path, _ in conversions]
+            total_size = sum(input_sizes) or 1
+            usage = result["resource_usage"]
+
+            results = []
+            stuck_on = None
+            for i, (_, output_path) in enumerate(conversions):
+                temp_output = os.path.join(output_dir, f"{i}.{target_format}")
+                if not os.path.exists(temp_output):
+                    if not stalled:
+                        error = "LibreOffice did not create output file"
+                    elif stuck_on is None:
+                        stuck_on = i
+                        error = f"LibreOffice timed out after {per_file_timeout} seconds"
+                    else:
+                        results.append(None)
+                        continue
+                    results.append({"success": False, "error": error})
+                    continue
+
+                shutil.move(temp_output, output_path)
+                share = input_sizes[i] / total_size
+                results.append(
+                    {
+                        "success": True,
+                        "engine": "libreoffice",
+                        "input_size": input_sizes[i],
+                        "output_size": os.path.getsize(output_path),
+                        "batch_size": len(conversions),
+                        "resource_usage": {
+                            **usage,
+                            "wall_time": round(usage["wall_time"] * share, 3),
+                            "user_time": round(usage["user_time"] * share, 3),
+                            "system_time": round(usage["system_time"] * share, 3),
+                        },
+                    }
+                )
+            return results
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class PdfConverter(ConversionEngine):
+    """Page-parallel PDF rasterization and text extraction"""
+
+    RESOURCE_CLASS = "heavy"
+    CROSS_CATEGORY = True
+
+    IMAGE_FORMATS = {"png", "jpg", "jpeg", "webp", "tiff", "gif", "bmp"}
+    TEXT_FORMATS = {"txt"}
+
+    # Accepted range of the "dpi" option
+    MIN_DPI = 36
+    MAX_DPI = 600
+
+    # Project root, so workers can run "python -m app.utils.pdf_pages"
+    PROJECT_ROOT = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+    @staticmethod
+    def can_convert(source_format: str, target_format: str) -> bool:
+        """Check if we can convert a PDF to this format"""
+        return source_format.lower() == "pdf" and target_format.lower() in (
+            PdfConverter.IMAGE_FORMATS | PdfConverter.TEXT_FORMATS
+        )
+
+    @staticmethod
+    def convert(input_path: str, output_path: str, options: Dict = None) -> Dict:
+        """
+        Convert a PDF page by page across worker processes
+
+        Text output is the pages' text separated by form feeds. Image
+        output of a single page is written as is; multi-page documents
+        produce a ZIP of page-NNNN images next to the requested path.
+        """
+        if not options:
+            options = {}
+
+        target_ext = os.path.splitext(output_path)[1][1:].lower()
+
+        try:
+            page_count = len(PdfReader(input_path).pages)
+            if page_count == 0:
+                raise Exception("PDF has no pages")
+
+            work_dir = tempfile.mkdtemp(dir=current_app.config["TEMP_FOLDER"])
+            try:
+                pages, resource_usage = PdfConverter._process_pages(
+                    input_path, work_dir, target_ext, page_count, options
+                )
+
+                if target_ext in PdfConverter.TEXT_FORMATS:
+                    with open(output_path, "w", encoding="utf-8") as output:
+                        for index, page_path in enumerate(pages):
+                            if index:
+                                output.write("\f")
+                            with open(page_path, encoding="utf-8") as page:
+                                shutil.copyfileobj(page, output)
+                elif page_count == 1:
+                    shutil.move(pages[0], output_path)
+                else:
+                    output_path = f"{os.path.splitext(output_path)[0]}.zip"
+                    # Page images are already compressed
+                    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_STORED) as archive:
+                        for page_path in pages:
+                            archive.write(page_path, os.path.basename(page_path))
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+            return {
+                "success": True,
+                "engine": "pypdf2" if target_ext in PdfConverter.TEXT_FORMATS else "imagemagick",
+                "input_size": os.path.getsize(input_path),
+                "output_size": os.path.getsize(output_path),
+                "output_path": output_path,
+                "page_count": page_count,
+                "resource_usage": resource_usage,
+            }
+
+        except Exception as e:
+            current_app.logger.error(f"PDF conversion failed: {e}")
+            raise Exception(f"PDF conversion failed: {str(e)}")
+
+    @staticmethod
+    def _process_pages(
+        input_path: str, work_dir: str, target_ext: str, page_count: int, options: Dict
+    ) -> Tuple[List[str], Dict]:
+        """
+        Split the document into page ranges and process them in parallel
+
+        The caller holds one slot of the PDF resource class; each further
+        worker process needs a free slot of the same class, so concurrent
+        PDF jobs share the adaptive limit instead of each starting
+        PDF_WORKERS processes.
+
+        Returns:
+            Tuple of (per-page output paths in page order, combined resource usage)
+        """
+        config = current_app.config
+        wanted = config["PDF_WORKERS"] or os.cpu_count() or 1
+        wanted = min(wanted, math.ceil(page_count / max(1, config["PDF_MIN_PAGES_PER_TASK"])))
+        with get_conversion_executor().extra_slots(PdfConverter.RESOURCE_CLASS, wanted - 1) as extra:
+            return PdfConverter._run_page_tasks(
+                input_path, work_dir, target_ext, page_count, options, workers=1 + extra
+            )
+
+    @staticmethod
+    def _raster_dpi(options: Dict) -> int:
+        """
+        Rendering resolution from the "dpi" option
+
+        "resolution" is the (width, height) of video output and is not
+        used here. Missing or invalid values fall back to PDF_RASTER_DPI.
+        """
+        dpi = options.get("dpi")
+        if isinstance(dpi, int) and not isinstance(dpi, bool):
+            if PdfConverter.MIN_DPI <= dpi <= PdfConverter.MAX_DPI:
+                return dpi
+            current_app.logger.warning(
+                f"Ignoring dpi {dpi} outside {PdfConverter.MIN_DPI}-{PdfConverter.MAX_DPI}"
+            )
+        elif dpi is not None:
+            current_app.logger.warning(f"Ignoring non-integer dpi {dpi!r}")
+        return current_app.config["PDF_RASTER_DPI"]
+
+    @staticmethod
+    def _run_page_tasks(
+        input_path: str, work_dir: str, target_ext: str, page_count: int, options: Dict,
+        workers: int
+    ) -> Tuple[List[str], Dict]:
+        """Process page ranges on at most `workers` processes; the first failure cancels the rest"""
+        config = current_app.config
+        pages_per_task = max(config["PDF_MIN_PAGES_PER_TASK"], math.ceil(page_count / workers))
+        ranges = [
+            (start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+
+        mode = "text" if target_ext in PdfConverter.TEXT_FORMATS else "render"
+        resolution = PdfConverter._raster_dpi(options)
+        base_cmd = [
+            sys.executable, "-m", "app.utils.pdf_pages", mode, os.path.abspath(input_path)
+        ]
+
+        start_time = time.time()
+        usage = {"user_time": 0.0, "system_time": 0.0, "max_rss_mb": 0.0}
+        pages_done = 0
+        cancel = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="pdf") as pool:
+            # Each worker waits on its own supervised process
+            futures = {
+                pool.submit(
+                    contextvars.copy_context().run,
+                    run_supervised,
+                    base_cmd
+                    + [str(start), str(stop), work_dir]
+                    + ["--format", target_ext, "--resolution", str(resolution)],
+                    cwd=PdfConverter.PROJECT_ROOT,
+                    cancel=cancel,
+                ): (start, stop)
+                for start, stop in ranges
+            }
+            for future in as_completed(futures):
+                start, stop = futures[future]
+                try:
+                    try:
+                        result = future.result()
+                    except ProcessTimeoutError:
+                        raise Exception(f"Pages {start + 1}-{stop} timed out")
+                    if result["returncode"] != 0:
+                        raise Exception(result["stderr"].strip())
+                except Exception:
+                    # Kill the other ranges' processes rather than wait for them
+                    cancel.set()
+                    raise
+
+                process_usage = result["resource_usage"]
+                usage["user_time"] += process_usage["user_time"]
+                usage["system_time"] += process_usage["system_time"]
+                usage["max_rss_mb"] = max(usage["max_rss_mb"], process_usage["max_rss_mb"])
+
+                pages_done += stop - start
+                report_progress(
+                    percentage=round(pages_done / page_count * 100, 1),
+                    pages_done=pages_done,
+                    page_count=page_count,
+                )
+
+        output_ext = "txt" if mode == "text" else target_ext
+        pages = [os.path.join(work_dir, page_filename(index, output_ext)) for index in range(page_count)]
+        return pages, {
+            "wall_time": round(time.time() - start_time, 3),
+            "user_time": round(usage["user_time"], 3),
+            "system_time": round(usage["system_time"], 3),
+            "max_rss_mb": usage["max_rss_mb"],
+            "timed_out": False,
+            "stalled": False,
+        }
+
+
+class SpreadsheetConverter(ConversionEngine):
+    """Streaming spreadsheet conversion using openpyxl and pandas"""
+
+    # Converted row by row without loading the sheet into memory
+    EXCEL_FORMATS = {"xlsx", "xlsm"}
+    DELIMITED_FORMATS = {"csv": ",", "tsv": "\t"}
+    # Handed to LibreOffice
+    LIBREOFFICE_FORMATS = {"ods", "xls"}
+
+    @staticmethod
+    def can_convert(source_format: str, target_format: str) -> bool:
+        """Check if we can convert between these spreadsheet formats"""
+        all_formats = (
+            SpreadsheetConverter.EXCEL_FORMATS
+            | set(SpreadsheetConverter.DELIMITED_FORMATS)
+            | SpreadsheetConverter.LIBREOFFICE_FORMATS
+        )
+        return (
+            source_format.lower() in all_formats
+            and target_format.lower() in all_formats
+        )
+
+    @classmethod
+    def get_resource_class(cls, source_format: str, target_format: str) -> str:
+        """LibreOffice conversions are heavy; streaming ones are light"""
+        if cls._uses_libreoffice(source_format, target_format):
+            return "heavy"
+        return "light"
+
+    @staticmethod
+    def _uses_libreoffice(source_format: str, target_format: str) -> bool:
+        """Check whether LibreOffice handles this pair (streaming otherwise)"""
+        return (
+            source_format.lower() in SpreadsheetConverter.LIBREOFFICE_FORMATS
+            or target_format.lower() in SpreadsheetConverter.LIBREOFFICE_FORMATS
+        )
+
+    @staticmethod
+    def convert(input_path: str, output_path: str, options: Dict = None) -> Dict:
+        """Convert spreadsheet using appropriate engine"""
+        if not options:
+            options = {}
+
+        source_ext = os.path.splitext(input_path)[1][1:].lower()
+        target_ext = os.path.splitext(output_path)[1][1:].lower()
+        delimiters = SpreadsheetConverter.DELIMITED_FORMATS
+
+        try:
+            if SpreadsheetConverter._uses_libreoffice(source_ext, target_ext):
+                return DocumentConverter._convert_with_libreoffice(
+                    input_path, output_path, options
+                )
+
+            if source_ext in SpreadsheetConverter.EXCEL_FORMATS and target_ext in delimiters:
+                rows = SpreadsheetConverter._excel_to_delimited(
+                    input_path, output_path, delimiters[target_ext], options
+                )
+            elif source_ext in delimiters and target_ext in SpreadsheetConverter.EXCEL_FORMATS:
+                rows = SpreadsheetConverter._delimited_to_excel(
+                    input_path, output_path, delimiters[source_ext], options
+                )
+            elif source_ext in delimiters and target_ext in delimiters:
+                rows = SpreadsheetConverter._delimited_to_delimited(
+                    input_path, output_path, delimiters[source_ext], delimiters[target_ext]
+                )
+            else:
+                # xlsx <-> xlsm: re-save as the other container
+                rows = SpreadsheetConverter._excel_to_excel(input_path, output_path, options)
+
+            return {
+                "success": True,
+                "engine": "openpyxl",
+                "input_size": os.path.getsize(input_path),
+                "output_size": os.path.getsize(output_path),
+                "rows": rows,
+            }
+
+        except Exception as e:
+            current_app.logger.error(f"Spreadsheet conversion failed: {e}")
+            raise Exception(f"Spreadsheet conversion failed: {str(e)}")
+
+    @staticmethod
+    def _select_sheet(workbook, options: Dict):
+        """Get the sheet named or indexed by options["sheet"] (active sheet by default)"""
+        sheet = options.get("sheet")
+        if sheet is None:
+            return workbook.active
+        if isinstance(sheet, int):
+            return workbook.worksheets[sheet]
+        return workbook[sheet]
+
+    @staticmethod
+    def _report_rows(rows: int, total_rows: Optional[int]):
+        """Publish row progress once per chunk"""
+        if rows % current_app.config["SPREADSHEET_CHUNK_ROWS"]:
+            return
+        report_progress(
+            percentage=round(min(100.0, rows / total_rows * 100), 1) if total_rows else None,
+            rows=rows,
+        )
+
+    @staticmethod
+    def _excel_to_delimited(
+        input_path: str, output_path: str, delimiter: str, options: Dict
+    ) -> int:
+        """Stream one sheet's cached values out as CSV/TSV"""
+        workbook = openpyxl.load_workbook(input_path, read_only=True, data_only=True)
+        try:
+            sheet = SpreadsheetConverter._select_sheet(workbook, options)
+            total_rows = sheet.max_row
+            rows = 0
+            with open(output_path, "w", newline="", encoding="utf-8") as output:
+                writer = csv.writer(output, delimiter=delimiter)
+                for row in sheet.iter_rows(values_only=True):
+                    writer.writerow(["" if value is None else value for value in row])
+                    rows += 1
+                    SpreadsheetConverter._report_rows(rows, total_rows)
+            return rows
+        finally:
+            # Read-only workbooks keep the archive open until closed
+            workbook.close()
+
+    @staticmethod
+    def _delimited_to_excel(
+        input_path: str, output_path: str, delimiter: str, options: Dict
+    ) -> int:
+        """Read CSV/TSV in chunks, infer column types and append to a write-only sheet"""
+        import pandas as pd
+
+        def as_numeric(column):
+            try:
+                return pd.to_numeric(column)
+            except (ValueError, TypeError):
+                return column
+
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=options.get("sheet_name") or "Sheet1")
+        rows = 0
+
+        chunks = pd.read_csv(
+            input_path,
+            sep=delimiter,
+            header=None,
+            chunksize=current_app.config["SPREADSHEET_CHUNK_ROWS"],
+            keep_default_na=False,
+            na_values=[""],
+            skip_blank_lines=False,
+            encoding_errors="replace",
+        )
+        for chunk in chunks:
+            # The header row is text, so type the data rows separately
+            if rows == 0 and options.get("header", True) and len(chunk):
+                sheet.append([None if pd.isna(value) else str(value) for value in chunk.iloc[0]])
+                rows += 1
+                chunk = chunk.iloc[1:].reset_index(drop=True)
+                chunk = chunk.apply(as_numeric)
+
+            for record in chunk.astype(object).itertuples(index=False, name=None):
+                sheet.append([None if pd.isna(value) else value for value in record])
+                rows += 1
+                SpreadsheetConverter._report_rows(rows, None)
+
+        workbook.save(output_path)
+        return rows
+
+    @staticmethod
+    def _delimited_to_delimited(
+        input_path: str, output_path: str, source_delimiter: str, target_delimiter: str
+    ) -> int:
+        """Re-delimit text rows without interpreting their values"""
+        rows = 0
+        with open(input_path, newline="", encoding="utf-8", errors="replace") as source, open(
+            output_path, "w", newline="", encoding="utf-8"
+        ) as output:
+            writer = csv.writer(output, delimiter=target_delimiter)
+            for row in csv.reader(source, delimiter=source_delimiter):
+                writer.writerow(row)
+                rows += 1
+                SpreadsheetConverter._report_rows(rows, None)
+        return rows
+
+    @staticmethod
+    def _excel_to_excel(input_path: str, output_path: str, options: Dict) -> int:
+        """Stream one sheet's values into a new workbook"""
+        source = openpyxl.load_workbook(input_path, read_only=True, data_only=True)
+        try:
+            source_sheet = SpreadsheetConverter._select_sheet(source, options)
+            workbook = openpyxl.Workbook(write_only=True)
+            sheet = workbook.create_sheet(title=source_sheet.title)
+            rows = 0
+            for row in source_sheet.iter_rows(values_only=True):
+                sheet.append(row)
+                rows += 1
+                SpreadsheetConverter._report_rows(rows, source_sheet.max_row)
+            workbook.save(output_path)
+            return rows
+        finally:
+            source.close()
+
+
+class ArchiveConverter(ConversionEngine):
+    """Archive repacking by streaming members between formats"""
+
+    RESOURCE_CLASS = "heavy"
+
+    @staticmethod
+    def can_convert(source_format: str, target_format: str) -> bool:
+        """Check if we can repack between these archive formats"""
+        return (
+            source_format.lower() in ARCHIVE_READ_FORMATS
+            and target_format.lower() in ARCHIVE_WRITE_FORMATS
+        )
+
+    @staticmethod
+    def convert(input_path: str, output_path: str, options: Dict = None) -> Dict:
+        """
+        Repack an archive without extracting it
+
+        gz, bz2 and xz targets are written as compressed tarballs
+        (.tar.gz etc.); a lone compressed file becomes a one-member archive.
+        """
+        if not options:
+            options = {}
+
+        config = current_app.config
+        source_ext = os.path.splitext(input_path)[1][1:].lower()
+        target_ext = os.path.splitext(output_path)[1][1:].lower()
+        level = options.get("compression_level", config["ARCHIVE_COMPRESSION_LEVEL"])
+
+        try:
+            result = repack_archive(
+                input_path,
+                output_path,
+                source_ext,
+                target_ext,
+                level=min(9, max(0, int(level))),
+                limits={
+                    "max_bytes": config["ARCHIVE_MAX_EXPANDED_MB"] * 1024 * 1024,
+                    "max_members": config["ARCHIVE_MAX_MEMBERS"],
+                    "max_ratio": config["ARCHIVE_MAX_RATIO"],
+                },
+                threads=config["ARCHIVE_THREADS"],
+                scratch_dir=config["TEMP_FOLDER"],
+            )
+
+            return {
+                "success": True,
+                "engine": "archive",
+                "input_size": os.path.getsize(input_path),
+                "output_size": os.path.getsize(result["output_path"]),
+                "output_path": result["output_path"],
+                "members": result["members"],
+                "expanded_size": result["expanded_size"],
+            }
+
+        except ArchiveLimitError as e:
+            current_app.logger.warning(f"Archive rejected: {e}")
+            raise Exception(f"Archive rejected: {str(e)}")
+        except Exception as e:
+            current_app.logger.error(f"Archive conversion failed: {e}")
+            raise Exception(f"Archive conversion failed: {str(e)}")
+
+
+class FontConverter(ConversionEngine):
+    """Font container conversion using fontTools"""
+
+    SFNT_FORMATS = {"ttf", "otf"}
+    WEB_FORMATS = {"woff", "woff2"}
+
+    @staticmethod
+    def can_convert(source_format: str, target_format: str) -> bool:
+        """Check if we can convert between these font formats"""
+        source_format = source_format.lower()
+        target_format = target_format.lower()
+        all_formats = FontConverter.SFNT_FORMATS | FontConverter.WEB_FORMATS
+        # ttf <-> otf would mean converting outlines, not just the container
+        return (
+            source_format in all_formats
+            and target_format in all_formats
+            and not (
+                source_format in FontConverter.SFNT_FORMATS
+                and target_format in FontConverter.SFNT_FORMATS
+            )
+        )
+
+    @staticmethod
+    def convert(input_path: str, output_path: str, options: Dict = None) -> Dict:
+        """
+        Re-wrap a font as ttf/otf, WOFF or WOFF2
+
+        Only the container changes, so tables the target does not transform
+        are copied without being parsed.
+        """
+        target_ext = os.path.splitext(output_path)[1][1:].lower()
+
+        try:
+            font, lock = get_font_cache().get(input_path)
+            with lock:
+                if target_ext == "ttf" and ("CFF " in font or "CFF2" in font):
+                    raise Exception(
+                        "Font has PostScript (CFF) outlines; convert it to otf instead"
+                    )
+
+                # The cached font is shared, so restore its flavor afterwards
+                original_flavor = font.flavor
+                font.flavor = target_ext if target_ext in FontConverter.WEB_FORMATS else None
+                try:
+                    font.save(output_path)
+                finally:
+                    font.flavor = original_flavor
+
+            return {
+                "success": True,
+                "engine": "fonttools",
+                "input_size": os.path.getsize(input_path),
+                "output_size": os.path.getsize(output_path),
+            }
+
+        except Exception as e:
+            current_app.logger.error(f"Font conversion failed: {e}")
+            raise Exception(f"Font conversion failed: {str(e)}")
+
+
+class PresentationConverter(ConversionEngine):
+    """Presentation export using LibreOffice, with an embedded-preview fast path"""
+
+    RESOURCE_CLASS = "heavy"
+    CROSS_CATEGORY = True
+
+    SOURCE_FORMATS = {"pptx", "ppt", "odp", "key"}
+    IMAGE_FORMATS = {"png", "jpg", "jpeg"}
+
+    # Preview images stored inside zip-based presentation packages
+    EMBEDDED_PREVIEWS = {
+        "pptx": ("docProps/thumbnail.jpeg", "docProps/thumbnail.png"),
+        "odp": ("Thumbnails/thumbnail.png",),
+        "key": ("preview.jpg", "QuickLook/Thumbnail.jpg"),
+    }
+    # A picture covering this much of a slide is taken as the slide itself
+    FULL_SLIDE_COVERAGE = 0.8
+
+    @staticmethod
+    def can_convert(source_format: str, target_format: str) -> bool:
+        """Check if we can export this presentation format"""
+        return source_format.lower() in PresentationConverter.SOURCE_FORMATS and (
+            target_format.lower() in PresentationConverter.IMAGE_FORMATS
+            or target_format.lower() == "pdf"
+        )
+
+    @staticmethod
+    def convert(input_path: str, output_path: str, options: Dict = None) -> Dict:
+        """
+        Export a presentation as PDF or per-slide images
+
+        Slides are rendered by LibreOffice to PDF and rasterized page by
+        page (a ZIP for multi-slide decks). With options["previews_only"],
+        image requests are served from previews stored in the file when it
+        has them, without starting LibreOffice. The package thumbnail only
+        shows the first slide, so it stands in for decks of one slide, or
+        (engine "deck_thumbnail") for decks whose slides cannot be counted.
+        """
+        if not options:
+            options = {}
+
+        source_ext = os.path.splitext(input_path)[1][1:].lower()
+        target_ext = os.path.splitext(output_path)[1][1:].lower()
+
+        try:
+            if options.get("previews_only") and target_ext in PresentationConverter.IMAGE_FORMATS:
+                previews, engine = PresentationConverter._collect_previews(input_path, source_ext)
+                if previews:
+                    return PresentationConverter._write_previews(
+                        input_path, output_path, target_ext, previews, options, engine
+                    )
+                current_app.logger.info("No embedded slide previews found; rendering slides")
+
+            return PresentationConverter._render(input_path, output_path, target_ext, options)
+
+        except Exception as e:
+            current_app.logger.error(f"Presentation conversion failed: {e}")
+            raise Exception(f"Presentation conversion failed: {str(e)}")
+
+    @staticmethod
+    def _render(input_path: str, output_path: str, target_ext: str, options: Dict) -> Dict:
+        """Render through LibreOffice (PDF) and the page-parallel PDF engine"""
+        if target_ext == "pdf":
+            return DocumentConverter._convert_with_libreoffice(input_path, output_path, options)
+
+        temp_dir = tempfile.mkdtemp(dir=current_app.config["TEMP_FOLDER"])
+        try:
+            pdf_path = os.path.join(temp_dir, "slides.pdf")
+            pdf_result = DocumentConverter._convert_with_libreoffice(input_path, pdf_path, options)
+            image_result = PdfConverter.convert(pdf_path, output_path, options)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        pdf_usage = pdf_result["resource_usage"]
+        image_usage = image_result["resource_usage"]
+        return {
+            **image_result,
+            "engine": "libreoffice",
+            "input_size": os.path.getsize(input_path),
+            "slide_count": image_result["page_count"],
+            "resource_usage": {
+                "wall_time": round(pdf_usage["wall_time"] + image_usage["wall_time"], 3),
+                "user_time": round(pdf_usage["user_time"] + image_usage["user_time"], 3),
+                "system_time": round(pdf_usage["system_time"] + image_usage["system_time"], 3),
+                "max_rss_mb": max(pdf_usage["max_rss_mb"], image_usage["max_rss_mb"]),
+                "timed_out": False,
+                "stalled": False,
+            },
+        }
+
+    @staticmethod
+    def _collect_previews(
+        input_path: str, source_ext: str
+    ) -> Tuple[List[Tuple[int, bytes]], Optional[str]]:
+        """
+        Find previews stored in the presentation
+
+        Returns:
+            Tuple of (previews, engine). previews are (slide index, image
+            bytes) pairs: one per slide when every slide of a pptx is a
+            full-slide picture, otherwise the package thumbnail of the first
+            slide if the deck has one slide or its slides cannot be counted,
+            and empty when the slides have to be rendered. engine is the
+            engine name to report ("embedded_preview", or "deck_thumbnail"
+            for a thumbnail of an uncounted deck), None with no previews
+        """
+        slide_count = None
+        if source_ext == "pptx":
+            presentation = Presentation(input_path)
+            slide_count = len(presentation.slides)
+            slide_area = (presentation.slide_width or 0) * (presentation.slide_height or 0)
+            slide_previews = []
+            for index, slide in enumerate(presentation.slides):
+                pictures = [
+                    shape for shape in slide.shapes
+                    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE
+                ]
+                largest = max(
+                    pictures, key=lambda shape: (shape.width or 0) * (shape.height or 0), default=None
+                )
+                if (
+                    largest is None
+                    or not slide_area
+                    or (largest.width or 0) * (largest.height or 0)
+                    < slide_area * PresentationConverter.FULL_SLIDE_COVERAGE
+                ):
+                    break
+                slide_previews.append((index, largest.image.blob))
+            else:
+                if slide_previews:
+                    return slide_previews, "embedded_preview"
+
+        names = PresentationConverter.EMBEDDED_PREVIEWS.get(source_ext, ())
+        if names and zipfile.is_zipfile(input_path):
+            with zipfile.ZipFile(input_path) as package:
+                available = set(package.namelist())
+                if source_ext == "odp" and "content.xml" in available:
+                    slide_count = package.read("content.xml").count(b"<draw:page ")
+                if slide_count is not None and slide_count > 1:
+                    # One thumbnail cannot stand in for several slides
+                    return [], None
+                for name in names:
+                    if name in available:
+                        engine = "embedded_preview" if slide_count == 1 else "deck_thumbnail"
+                        return [(0, package.read(name))], engine
+        return [], None
+
+    @staticmethod
+    def _write_previews(
+        input_path: str,
+        output_path: str,
+        target_ext: str,
+        previews: List[Tuple[int, bytes]],
+        options: Dict,
+        engine: str = "embedded_preview",
+    ) -> Dict:
+        """Scale previews down and write one image, or a ZIP for several"""
+        size = options.get("thumbnail_size") or current_app.config["PRESENTATION_THUMBNAIL_SIZE"]
+        pillow_format = "JPEG" if target_ext in ("jpg", "jpeg") else "PNG"
+
+        def save_preview(data: bytes, target) -> None:
+            with Image.open(io.BytesIO(data)) as img:
+                img.thumbnail((size, size), Image.Resampling.LANCZOS)
+                if pillow_format == "JPEG" and img.mode != "RGB":
+                    img = img.convert("RGB")
+                img.save(target, format=pillow_format)
+
+        if len(previews) == 1:
+            save_preview(previews[0][1], output_path)
+        else:
+            output_path = f"{os.path.splitext(output_path)[0]}.zip"
+            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_STORED) as archive:
+                # Named like the pages of a rendered deck
+                for index, data in previews:
+                    buffer = io.BytesIO()
+                    save_preview(data, buffer)
+                    archive.writestr(page_filename(index, target_ext), buffer.getvalue())
+
+        return {
+            "success": True,
+            "engine": engine,
+            "input_size": os.path.getsize(input_path),
+            "output_size": os.path.getsize(output_path),
+            "output_path": output_path,
+            "slide_count": len(previews),
+        }
+
 
 class ConversionService:
     """Main conversion service that coordinates different engines"""
 
+    # Engines in priority order; the first engine that can handle a pair wins
+    ENGINES = (
+        PdfConverter,
+        ImageConverter,
+        VideoConverter,
+        AudioConverter,
+        DocumentConverter,
+        SpreadsheetConverter,
+        ArchiveConverter,
+        FontConverter,
+        PresentationConverter,
+    )
+
     def __init__(self):
         self.file_handler = FileHandler()
-        self.engines = [
-            ImageConverter,
-            VideoConverter,
-            AudioConverter,
-            DocumentConverter,
-        ]
+        self.engines = list(self.ENGINES)
+        self.registry = get_format_registry()
+        self.planner = get_conversion_planner()
 
     def convert_single_file(
         self, file_info: Dict, target_format: str, options: Dict = None
@@ -607,55 +1526,43 @@ class ConversionService:
                 file_info, target_format
             )
 
-            # Find appropriate conversion engine
+            # Find appropriate conversion engine, or a path through
+            # intermediate formats when no engine converts directly
             engine = self._find_conversion_engine(source_format, target_format)
             if not engine:
-                return {
-                    "success": False,
-                    "error": f"No conversion engine available for {source_format} to {target_format}",
-                    "file_info": file_info,
-                }
+                plan = self.planner.plan(
+                    source_format, target_format, file_info.get("size", 0)
+                )
+                if not plan:
+                    return {
+                        "success": False,
+                        "error": f"No conversion engine available for {source_format} to {target_format}",
+                        "file_info": file_info,
+                    }
+                return self._convert_with_plan(
+                    file_info, target_format, output_path, plan, options, start_time
+                )
 
-            # Perform conversion
-            current_app.logger.info(
-                f"Converting {source_format} to {target_format} using {engine.__name__}"
-            )
-            conversion_result = engine.convert(source_path, output_path, options)
-
-            if conversion_result["success"]:
-                # Create file info for converted file
-                converted_file_info = {
-                    "id": file_info["id"],
-                    "original_filename": f"{os.path.splitext(file_info['original_filename'])[0]}.{target_format}",
-                    "filename": os.path.basename(output_path),
-                    "path": output_path,
-                    "size": os.path.getsize(output_path),
-                    "extension": target_format,
-                    "converted_at": datetime.utcnow().isoformat(),
-                    "conversion_time": round(time.time() - start_time, 2),
-                    "engine": conversion_result.get("engine", "unknown"),
-                }
+            # Perform conversion once a slot of the engine's class is free
+            resource_class = engine.get_resource_class(source_format, target_format)
+            with get_conversion_executor().slot(resource_class):
+                current_app.logger.info(
+                    f"Converting {source_format} to {target_format} using {engine.__name__}"
+                )
+                engine_start = time.time()
+                conversion_result = engine.convert(source_path, output_path, options)
+                engine_seconds = time.time() - engine_start
 
-                return {
-                    "success": True,
-                    "file_info": converted_file_info,
-                    "conversion_stats": {
-                        "input_size": conversion_result.get("input_size", 0),
-                        "output_size": conversion_result.get("output_size", 0),
-                        "compression_ratio": self._calculate_compression_ratio(
-                            conversion_result.get("input_size", 0),
-                            conversion_result.get("output_size", 0),
-                        ),
-                        "time_seconds": round(time.time() - start_time, 2),
-                        "engine": conversion_result.get("engine"),
-                    },
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": conversion_result.get("error", "Conversion failed"),
-                    "file_info": file_info,
-                }
+            return self._build_conversion_result(
+                file_info,
+                target_format,
+                output_path,
+                engine.__name__,
+                conversion_result,
+                options,
+                engine_seconds,
+                start_time,
+            )
 
         except Exception as e:
             current_app.logger.error(f"Conversion error: {e}")
@@ -665,12 +1572,294 @@ class ConversionService:
                 "file_info": file_info,
             }
 
+    def _build_conversion_result(
+        self,
+        file_info: Dict,
+        target_format: str,
+        output_path: str,
+        engine_name: Optional[str],
+        conversion_result: Dict,
+        options: Dict,
+        engine_seconds: float,
+        start_time: float,
+    ) -> Dict:
+        """Record an engine result with the estimator and shape it for callers"""
+        if not conversion_result["success"]:
+            return {
+                "success": False,
+                "error": conversion_result.get("error", "Conversion failed"),
+                "file_info": file_info,
+            }
+
+        # Learn from the time spent in the engine, not waiting for a slot;
+        # multi-step plans record each step themselves
+        if engine_name:
+            get_conversion_estimator().record(
+                engine_name,
+                file_info["extension"],
+                target_format,
+                conversion_result.get("input_size", 0),
+                options,
+                engine_seconds,
+            )
+
+        # Engines may change the container, e.g. multi-page output as a ZIP
+        output_path = conversion_result.get("output_path", output_path)
+        output_format = os.path.splitext(output_path)[1][1:].lower() or target_format
+
+        # Create file info for converted file
+        converted_file_info = {
+            "id": file_info["id"],
+            "original_filename": f"{os.path.splitext(file_info['original_filename'])[0]}.{output_format}",
+            "filename": os.path.basename(output_path),
+            "path": output_path,
+            "size": os.path.getsize(output_path),
+            "extension": output_format,
+            "converted_at": datetime.utcnow().isoformat(),
+            "conversion_time": round(time.time() - start_time, 2),
+            "engine": conversion_result.get("engine", "unknown"),
+            # Stored checksum doubles as the strong ETag for downloads
+            "checksum": calculate_file_hash(output_path),
+        }
+
+        return {
+            "success": True,
+            "file_info": converted_file_info,
+            "conversion_stats": {
+                "input_size": conversion_result.get("input_size", 0),
+                "output_size": conversion_result.get("output_size", 0),
+                "compression_ratio": self._calculate_compression_ratio(
+                    conversion_result.get("input_size", 0),
+                    conversion_result.get("output_size", 0),
+                ),
+                "time_seconds": round(time.time() - start_time, 2),
+                "engine": conversion_result.get("engine"),
+                # Only set for engines that run a supervised subprocess
+                "resource_usage": conversion_result.get("resource_usage"),
+            },
+        }
+
+    def _convert_with_plan(
+        self,
+        file_info: Dict,
+        target_format: str,
+        output_path: str,
+        plan: Dict,
+        options: Dict,
+        start_time: float,
+    ) -> Dict:
+        """
+        Convert a file through the intermediate formats of a conversion plan
+
+        Args:
+            file_info: Information about the source file
+            target_format: Final target format
+            output_path: Destination of the last step
+            plan: Plan from the conversion planner
+            options: Conversion options, passed to every step
+            start_time: When the conversion was requested
+
+        Returns:
+            Dictionary with conversion result
+        """
+        steps = plan["steps"]
+        work_dir = tempfile.mkdtemp(prefix="plan-", dir=current_app.config["TEMP_FOLDER"])
+        resource_usage = {"user_time": 0.0, "system_time": 0.0, "max_rss_mb": 0.0}
+        step_engines = []
+        engine_seconds = 0.0
+        current_path = file_info["path"]
+
+        current_app.logger.info(
+            f"Converting {file_info['extension']} to {target_format} via "
+            f"{', '.join(step['to'] for step in steps[:-1])}"
+        )
+
+        try:
+            for index, step in enumerate(steps):
+                engine = step["engine"]
+                last = index == len(steps) - 1
+                step_output = (
+                    output_path
+                    if last
+                    else os.path.join(work_dir, f"step-{index + 1}.{step['to']}")
+                )
+
+                # Each step holds a slot of its own engine's class only
+                resource_class = engine.get_resource_class(step["from"], step["to"])
+                with get_conversion_executor().slot(resource_class), progress_stage(
+                    index, len(steps)
+                ):
+                    step_start = time.time()
+                    result = engine.convert(current_path, step_output, options)
+                    step_seconds = time.time() - step_start
+
+                if not result["success"]:
+                    return {
+                        "success": False,
+                        "error": f"{step['from']} to {step['to']} step failed: {result.get('error', 'Conversion failed')}",
+                        "file_info": file_info,
+                    }
+
+                produced = result.get("output_path", step_output)
+                if not last and produced != step_output:
+                    # e.g. a multi-page PDF rasterized to a ZIP of pages
+                    return {
+                        "success": False,
+                        "error": f"{step['from']} to {step['to']} step produced {os.path.basename(produced)}, "
+                        f"which cannot be converted further",
+                        "file_info": file_info,
+                    }
+
+                get_conversion_estimator().record(
+                    engine.__name__,
+                    step["from"],
+                    step["to"],
+                    result.get("input_size", 0),
+                    options,
+                    step_seconds,
+                )
+                self._accumulate_resource_usage(resource_usage, result.get("resource_usage"))
+                step_engines.append(result.get("engine", engine.__name__))
+                engine_seconds += step_seconds
+                current_path = produced
+
+            conversion_result = {
+                "success": True,
+                "engine": " -> ".join(step_engines),
+                "input_size": file_info.get("size") or os.path.getsize(file_info["path"]),
+                "output_size": os.path.getsize(current_path),
+                "output_path": current_path,
+                "resource_usage": resource_usage if resource_usage["max_rss_mb"] else None,
+            }
+            return self._build_conversion_result(
+                file_info,
+                target_format,
+                output_path,
+                None,
+                conversion_result,
+                options,
+                engine_seconds,
+                start_time,
+            )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _group_libreoffice_files(
+        self, files: List[Dict], target_format: Optional[str]
+    ) -> Dict[int, List[Tuple[int, Dict]]]:
+        """
+        Group files that LibreOffice converts to the same target
+
+        Args:
+            files: Batch file information dictionaries
+            target_format: Batch target for files without their own
+
+        Returns:
+            Mapping of each group's first file index to its (index, file_info)
+            pairs; only groups of two or more files are returned
+        """
+        batch_size = current_app.config["LIBREOFFICE_BATCH_SIZE"]
+        by_target: Dict[str, List[Tuple[int, Dict]]] = {}
+        for i, file_info in enumerate(files):
+            source_format = file_info.get("extension", "")
+            per_target = file_info.get("target_format", target_format)
+            if not source_format or not per_target:
+                continue
+            engine = self._find_conversion_engine(source_format, per_target)
+            if engine is DocumentConverter and not DocumentConverter._uses_pandoc(
+                source_format, per_target
+            ):
+                by_target.setdefault(per_target.lower(), []).append((i, file_info))
+
+        groups = {}
+        for members in by_target.values():
+            for start in range(0, len(members), max(1, batch_size)):
+                chunk = members[start : start + batch_size]
+                if len(chunk) > 1:
+                    groups[chunk[0][0]] = chunk
+        return groups
+
+    def _convert_document_group(
+        self, group: List[Tuple[int, Dict]], target_format: str, options: Dict
+    ) -> Dict[int, Dict]:
+        """
+        Convert a group of office documents in one LibreOffice run
+
+        Args:
+            group: (index, file_info) pairs from _group_libreoffice_files
+            target_format: Shared target format
+            options: Conversion options
+
+        Returns:
+            Mapping of file index to a convert_single_file style result. Files
+            missing from the mapping (e.g. because the whole run failed) are
+            left for the caller to convert individually.
+        """
+        start_time = time.time()
+        results = {}
+        conversions = []
+        for index, file_info in group:
+            if not os.path.exists(file_info["path"]):
+                results[index] = {
+                    "success": False,
+                    "error": "Source file not found",
+                    "file_info": file_info,
+                }
+                continue
+            output_path = self.file_handler.create_conversion_path(file_info, target_format)
+            conversions.append((index, file_info, output_path))
+
+        if len(conversions) < 2:
+            return results
+
+        try:
+            resource_class = DocumentConverter.get_resource_class(
+                conversions[0][1]["extension"], target_format
+            )
+            with get_conversion_executor().slot(resource_class):
+                current_app.logger.info(
+                    f"Converting {len(conversions)} documents to {target_format} in one LibreOffice run"
+                )
+                engine_start = time.time()
+                batch_results = DocumentConverter.convert_many_with_libreoffice(
+                    [(file_info["path"], output_path) for _, file_info, output_path in conversions]
+                )
+                engine_seconds = time.time() - engine_start
+        except Exception as e:
+            # One bad document can take down the whole run; isolate it by
+            # converting the group's files one at a time instead
+            current_app.logger.warning(
+                f"Batched LibreOffice run failed, converting files individually: {e}"
+            )
+            return results
+
+        input_sizes = [file_info.get("size", 0) for _, file_info, _ in conversions]
+        total_size = sum(input_sizes) or 1
+        for (index, file_info, output_path), input_size, conversion_result in zip(
+            conversions, input_sizes, batch_results
+        ):
+            if conversion_result is None:
+                # Queued behind a document the run got stuck on
+                continue
+            results[index] = self._build_conversion_result(
+                file_info,
+                target_format,
+                output_path,
+                DocumentConverter.__name__,
+                conversion_result,
+                options,
+                engine_seconds * input_size / total_size,
+                start_time,
+            )
+        return results
+
     def convert_batch(
         self,
         job_id: str,
         files: List[Dict],
         target_format: str | None,
         options: Dict = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> Dict:
         """
         Convert multiple files in batch
@@ -680,6 +1869,7 @@ class ConversionService:
             files: List of file information dictionaries
             target_format: Target format for all files
             options: Conversion options
+            progress_callback: Called with (processed, succeeded) after each file
 
         Returns:
             Dictionary with batch conversion results
@@ -690,23 +1880,39 @@ class ConversionService:
         start_time = time.time()
         converted_files = []
         errors = []
+        resource_usage = {"user_time": 0.0, "system_time": 0.0, "max_rss_mb": 0.0}
 
         current_app.logger.info(
             f"Starting batch conversion job {job_id}: {len(files)} files to {target_format or 'mixed'}"
         )
 
+        # Office documents sharing a target are converted by one LibreOffice
+        # run when the first of them comes up
+        document_groups = self._group_libreoffice_files(files, target_format)
+        grouped_results = {}
+
         for i, file_info in enumerate(files):
             try:
-                # Update progress (this would typically update Redis/database)
                 progress = int(((i + 1) / len(files)) * 100)
                 current_app.logger.debug(f"Job {job_id} progress: {progress}%")
 
-                # Convert single file
                 per_target = file_info.get("target_format", target_format)
-                result = self.convert_single_file(file_info, per_target, options)
+                group = document_groups.pop(i, None)
+                if group:
+                    grouped_results.update(
+                        self._convert_document_group(group, per_target, options)
+                    )
+
+                # Convert single file unless its group already did
+                result = grouped_results.pop(i, None) or self.convert_single_file(
+                    file_info, per_target, options
+                )
 
                 if result["success"]:
                     converted_files.append(result["file_info"])
+                    self._accumulate_resource_usage(
+                        resource_usage, result["conversion_stats"].get("resource_usage")
+                    )
                     current_app.logger.info(
                         f"Converted: {file_info['original_filename']}"
                     )
@@ -731,6 +1937,9 @@ class ConversionService:
                 )
                 current_app.logger.error(error_msg)
 
+            if progress_callback:
+                progress_callback(i + 1, len(converted_files))
+
         # Calculate final results
         total_time = time.time() - start_time
         success_count = len(converted_files)
@@ -746,6 +1955,7 @@ class ConversionService:
             "errors": errors,
             "total_time_seconds": round(total_time, 2),
             "average_time_per_file": round(total_time / len(files), 2) if files else 0,
+            "resource_usage": resource_usage,
         }
 
         current_app.logger.info(
@@ -755,12 +1965,17 @@ class ConversionService:
 
         return result
 
+    def _accumulate_resource_usage(self, totals: Dict, usage: Optional[Dict]):
+        """Add one subprocess's rusage to the batch totals"""
+        if not usage:
+            return
+        totals["user_time"] = round(totals["user_time"] + usage["user_time"], 3)
+        totals["system_time"] = round(totals["system_time"] + usage["system_time"], 3)
+        totals["max_rss_mb"] = max(totals["max_rss_mb"], usage["max_rss_mb"])
+
     def _find_conversion_engine(self, source_format: str, target_format: str):
         """Find appropriate conversion engine for format pair"""
-        for engine in self.engines:
-            if engine.can_convert(source_format, target_format):
-                return engine
-        return None
+        return self.registry.get_engine(source_format, target_format)
 
     def _calculate_compression_ratio(self, input_size: int, output_size: int) -> float:
         """Calculate compression ratio"""
@@ -769,31 +1984,5 @@ class ConversionService:
         return round((1 - output_size / input_size) * 100, 2)
 
     def get_supported_conversions(self) -> Dict:
-        """Get all supported conversion combinations"""
-        conversions = {}
-
-        # Get all supported formats from config
-        supported_formats = current_app.config["ALLOWED_EXTENSIONS"]
-
-        for category, formats in supported_formats.items():
-            category_conversions = []
-
-            for source_format in formats:
-                for target_format in formats:
-                    if source_format != target_format:
-                        engine = self._find_conversion_engine(
-                            source_format, target_format
-                        )
-                        if engine:
-                            category_conversions.append(
-                                {
-                                    "from": source_format,
-                                    "to": target_format,
-                                    "engine": engine.__name__,
-                                }
-                            )
-
-            if category_conversions:
-                conversions[category] = category_conversions
-
-        return conversions
+        """Get every reachable conversion, direct or multi-step, with its estimated cost"""
+        return self.planner.get_supported_conversions()
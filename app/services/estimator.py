@@ -0,0 +1,217 @@
+"""
+Conversion Time Estimator for FileConverter Pro
+
+Learns how long conversions actually take from completed conversions,
+keyed by (engine, source, target, size bucket, options class). Each key
+keeps exponentially weighted averages of duration and input size, so an
+estimate scales the learned duration to the file at hand. Keys without
+enough samples fall back to coarser keys, and finally to the static
+rates in estimate_conversion_time. The model is persisted as JSON so
+estimates survive restarts.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from flask import current_app
+
+from app.services.format_registry import get_format_registry
+from app.utils.helpers import estimate_conversion_time, get_file_type
+
+
+class ConversionEstimator:
+    """Online per-conversion-kind duration model"""
+
+    def __init__(self, model_path: str, alpha: float = 0.2, min_samples: int = 3,
+                 save_interval: float = 60):
+        self.model_path = model_path
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.save_interval = save_interval
+
+        # key string -> {'count', 'seconds', 'bytes'}
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self._last_save = time.time()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def size_bucket(size: int) -> int:
+        """Power-of-two size bucket (0 for empty files)"""
+        return max(0, int(size)).bit_length()
+
+    @staticmethod
+    def options_class(options: Optional[Dict]) -> str:
+        """Name the set of options that were actually set"""
+        keys = sorted(key for key, value in (options or {}).items() if value not in (None, '', False))
+        return '+'.join(keys) if keys else 'default'
+
+    def _keys(self, engine: str, source: str, target: str, size: int,
+              options: Optional[Dict]) -> List[str]:
+        """Keys from most to least specific"""
+        source = source.lower()
+        target = target.lower()
+        bucket = self.size_bucket(size)
+        return [
+            f"{engine}|{source}|{target}|{bucket}|{self.options_class(options)}",
+            f"{engine}|{source}|{target}|{bucket}|*",
+            f"{engine}|{source}|{target}|*|*",
+            f"{engine}|*|*|*|*",
+        ]
+
+    def record(self, engine: str, source: str, target: str, size: int,
+               options: Optional[Dict], seconds: float):
+        """
+        Add an observed conversion duration to the model
+
+        Args:
+            engine: Engine class name
+            source: Source format
+            target: Target format
+            size: Input size in bytes
+            options: Conversion options used
+            seconds: Time spent in the engine
+        """
+        with self._lock:
+            for key in self._keys(engine, source, target, size, options):
+                entry = self.entries.get(key)
+                if entry is None:
+                    self.entries[key] = {'count': 1, 'seconds': seconds, 'bytes': float(size)}
+                    continue
+                entry['count'] += 1
+                entry['seconds'] += self.alpha * (seconds - entry['seconds'])
+                entry['bytes'] += self.alpha * (size - entry['bytes'])
+            self._dirty = True
+
+        self.maybe_save()
+
+    def estimate(self, engine: Optional[str], source: str, target: str, size: int,
+                 options: Optional[Dict] = None) -> Tuple[float, str]:
+        """
+        Estimate a conversion's duration
+
+        Returns:
+            Tuple of (seconds, basis) where basis is the key level used or
+            'static' for the fallback rates
+        """
+        if engine:
+            with self._lock:
+                for level, key in zip(('exact', 'bucket', 'pair', 'engine'),
+                                      self._keys(engine, source, target, size, options)):
+                    entry = self.entries.get(key)
+                    if entry and entry['count'] >= self.min_samples:
+                        return self._scale(entry, size), level
+
+        file_type = get_file_type(source) or 'unknown'
+        return estimate_conversion_time(size, file_type, target.lower()), 'static'
+
+    @staticmethod
+    def _scale(entry: Dict, size: int) -> float:
+        """Scale the learned duration linearly to the requested size"""
+        if entry['bytes'] <= 0:
+            return entry['seconds']
+        return max(0.01, entry['seconds'] * size / entry['bytes'])
+
+    def load(self):
+        """Load the persisted model if one exists"""
+        try:
+            with open(self.model_path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            current_app.logger.warning(f"Could not load estimator model: {e}")
+            return
+
+        with self._lock:
+            self.entries = data.get('entries', {})
+
+    def maybe_save(self, force: bool = False):
+        """Persist the model at most once per save interval"""
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._last_save < self.save_interval):
+                return
+            snapshot = {'version': 1, 'entries': {key: dict(entry) for key, entry in self.entries.items()}}
+            self._dirty = False
+            self._last_save = time.time()
+
+        try:
+            os.makedirs(os.path.dirname(self.model_path) or '.', exist_ok=True)
+            temp_path = f"{self.model_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.model_path)
+        except OSError as e:
+            current_app.logger.warning(f"Could not save estimator model: {e}")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'keys': len(self.entries),
+                'samples': sum(entry['count'] for key, entry in self.entries.items()
+                               if key.endswith('|*|*|*|*')),
+                'model_path': self.model_path
+            }
+
+
+def estimate_file_time(file_info: Dict, target_format: Optional[str] = None,
+                       options: Optional[Dict] = None) -> float:
+    """
+    Estimate one file's conversion time with the learned model
+
+    Args:
+        file_info: File information (extension, size, optional target_format)
+        target_format: Target used when the file has none
+        options: Conversion options
+
+    Returns:
+        Estimated seconds
+    """
+    from app.services.conversion_planner import get_conversion_planner
+
+    source = file_info.get('extension', '')
+    target = file_info.get('target_format') or target_format or ''
+    size = file_info.get('size', 0)
+    engine = get_format_registry().get_engine(source, target) if source and target else None
+    if engine is None and source and target:
+        # Multi-step conversions cost the sum of their steps
+        plan = get_conversion_planner().plan(source, target, size)
+        if plan:
+            return plan['estimated_seconds']
+    seconds, _ = get_conversion_estimator().estimate(
+        engine.__name__ if engine else None, source, target, size, options
+    )
+    return seconds
+
+
+def init_conversion_estimator(app) -> ConversionEstimator:
+    """Create the estimator, load its persisted model and attach it to the app"""
+    config = app.config
+    estimator = ConversionEstimator(
+        config['ESTIMATOR_MODEL_PATH'],
+        alpha=config['ESTIMATOR_ALPHA'],
+        min_samples=config['ESTIMATOR_MIN_SAMPLES'],
+        save_interval=config['ESTIMATOR_SAVE_INTERVAL']
+    )
+    with app.app_context():
+        estimator.load()
+    app.extensions['conversion_estimator'] = estimator
+
+    # Flush samples gathered since the last periodic save
+    def save_on_exit():
+        with app.app_context():
+            estimator.maybe_save(force=True)
+
+    atexit.register(save_on_exit)
+    return estimator
+
+
+def get_conversion_estimator() -> ConversionEstimator:
+    """Get the conversion estimator of the current application"""
+    estimator = current_app.extensions.get('conversion_estimator')
+    if estimator is None:
+        estimator = init_conversion_estimator(current_app._get_current_object())
+    return estimator
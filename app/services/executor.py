@@ -0,0 +1,264 @@
+"""
+Conversion Executor for FileConverter Pro
+
+Conversion jobs run on a background thread pool. Each conversion holds a
+slot of its engine's resource class while it runs: "heavy" for FFmpeg
+video and LibreOffice, "light" for Pillow, Pandoc and audio. A controller
+thread samples CPU and memory pressure with psutil and resizes the slot
+limits of each class, backing off when memory is tight and ramping up
+when there is CPU headroom and work waiting.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from flask import current_app
+
+RESOURCE_CLASSES = ('heavy', 'light')
+
+
+class AdaptiveLimit:
+    """Counting semaphore whose limit can be resized while in use"""
+
+    def __init__(self, name: str, minimum: int, maximum: int, initial: Optional[int] = None):
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        # Start midway so the controller can move either way
+        self.limit = self._clamp(initial if initial is not None else (self.minimum + self.maximum + 1) // 2)
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def _clamp(self, value: int) -> int:
+        return max(self.minimum, min(self.maximum, value))
+
+    def acquire(self):
+        """Block until a slot is free under the current limit"""
+        with self._condition:
+            self.waiting += 1
+            try:
+                while self.active >= self.limit:
+                    self._condition.wait()
+            finally:
+                self.waiting -= 1
+            self.active += 1
+
+    def try_acquire(self, count: int = 1) -> int:
+        """
+        Take up to count free slots without waiting
+
+        Threads already waiting go first, so nothing is taken while any wait.
+
+        Returns:
+            Number of slots taken
+        """
+        with self._condition:
+            if self.waiting:
+                return 0
+            taken = max(0, min(count, self.limit - self.active))
+            self.active += taken
+            return taken
+
+    def release(self, count: int = 1):
+        """Return slots"""
+        with self._condition:
+            self.active -= count
+            self._condition.notify(count)
+
+    def resize(self, new_limit: int) -> int:
+        """
+        Change the limit; running holders above a lowered limit finish normally
+
+        Returns:
+            The limit actually applied after clamping
+        """
+        with self._condition:
+            self.limit = self._clamp(new_limit)
+            self._condition.notify_all()
+            return self.limit
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict:
+        with self._condition:
+            return {
+                'limit': self.limit,
+                'active': self.active,
+                'waiting': self.waiting,
+                'min': self.minimum,
+                'max': self.maximum
+            }
+
+
+class ConversionExecutor:
+    """Background executor with pressure-driven concurrency per resource class"""
+
+    def __init__(self, app):
+        config = app.config
+        self.app = app
+        self.sample_interval = config['CONCURRENCY_SAMPLE_INTERVAL']
+        self.memory_high = config['CONCURRENCY_MEMORY_HIGH']
+        self.cpu_low = config['CONCURRENCY_CPU_LOW']
+
+        self.limits = {
+            'heavy': AdaptiveLimit('heavy', config['CONCURRENCY_HEAVY_MIN'], config['CONCURRENCY_HEAVY_MAX']),
+            'light': AdaptiveLimit('light', config['CONCURRENCY_LIGHT_MIN'], config['CONCURRENCY_LIGHT_MAX']),
+        }
+
+        # Enough threads that the slot limits, not the pool, are the throttle
+        self.max_workers = sum(limit.maximum for limit in self.limits.values())
+        self.last_sample: Dict = {}
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._controller: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the worker pool and the controller thread (idempotent)"""
+        with self._start_lock:
+            if self._pool is not None:
+                return
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='conversion')
+            self._controller = threading.Thread(target=self._control_loop,
+                                                name='concurrency-controller', daemon=True)
+            self._controller.start()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the controller and the worker pool"""
+        self._stopped.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Run a callable on a worker thread inside an application context
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future for the callable's result
+        """
+        self.start()
+
+        def run_in_context():
+            with self.app.app_context():
+                return fn(*args, **kwargs)
+
+        return self._pool.submit(run_in_context)
+
+    def slot(self, resource_class: str):
+        """Context manager holding a slot of the given resource class"""
+        return self.limits.get(resource_class, self.limits['light']).slot()
+
+    @contextmanager
+    def extra_slots(self, resource_class: str, count: int):
+        """
+        Hold up to count more slots of a class, for work that fans out
+
+        Only free slots are taken, never waited for; yields the number held.
+        """
+        limit = self.limits.get(resource_class, self.limits['light'])
+        taken = limit.try_acquire(count) if count > 0 else 0
+        try:
+            yield taken
+        finally:
+            if taken:
+                limit.release(taken)
+
+    def adjust(self, cpu_percent: float, memory_percent: float) -> Dict[str, int]:
+        """
+        Resize the slot limits for one pressure sample
+
+        Memory pressure halves the heavy limit and trims the light one,
+        since heavy conversions are what exhaust memory. With memory below
+        the threshold and CPU headroom, classes with queued work grow by one.
+
+        Args:
+            cpu_percent: System-wide CPU utilisation
+            memory_percent: System memory utilisation
+
+        Returns:
+            New limit per resource class
+        """
+        heavy = self.limits['heavy']
+        light = self.limits['light']
+
+        if memory_percent >= self.memory_high:
+            heavy.resize(heavy.limit // 2)
+            light.resize(light.limit - 1)
+        elif cpu_percent < self.cpu_low:
+            for limit in (heavy, light):
+                if limit.waiting:
+                    limit.resize(limit.limit + 1)
+
+        return {name: limit.limit for name, limit in self.limits.items()}
+
+    def _control_loop(self):
+        """Sample system pressure and adjust limits until shut down"""
+        try:
+            import psutil
+        except ImportError:
+            self.app.logger.warning('psutil not installed - concurrency limits stay fixed')
+            return
+
+        # Prime cpu_percent; the first call always returns 0.0
+        psutil.cpu_percent(interval=None)
+
+        while not self._stopped.wait(self.sample_interval):
+            try:
+                cpu_percent = psutil.cpu_percent(interval=None)
+                memory_percent = psutil.virtual_memory().percent
+                before = {name: limit.limit for name, limit in self.limits.items()}
+                after = self.adjust(cpu_percent, memory_percent)
+
+                self.last_sample = {'cpu_percent': cpu_percent, 'memory_percent': memory_percent}
+                if after != before:
+                    self.app.logger.info(
+                        f"Concurrency limits {before} -> {after} "
+                        f"(cpu {cpu_percent:.0f}%, memory {memory_percent:.0f}%)"
+                    )
+            except Exception as e:
+                self.app.logger.warning(f"Concurrency controller sample failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """Current limits, occupancy and last pressure sample"""
+        return {
+            'running': self._pool is not None and not self._stopped.is_set(),
+            'max_workers': self.max_workers,
+            'classes': {name: limit.get_stats() for name, limit in self.limits.items()},
+            'last_sample': dict(self.last_sample)
+        }
+
+
+def init_conversion_executor(app) -> ConversionExecutor:
+    """
+    Create the conversion executor and attach it to the application
+
+    Threads are started on first submit, so CLI commands and tests that
+    never convert anything do not spawn workers.
+    """
+    executor = ConversionExecutor(app)
+    app.extensions['conversion_executor'] = executor
+    return executor
+
+
+def get_conversion_executor() -> ConversionExecutor:
+    """Get the conversion executor of the current application"""
+    executor = current_app.extensions.get('conversion_executor')
+    if executor is None:
+        executor = init_conversion_executor(current_app._get_current_object())
+    return executor
@@ -15,8 +15,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from werkzeug.utils import secure_filename
 from flask import current_app
-import magic
-import filetype
+
+from app.utils.sniffer import content_sniffer, extension_from_sniff
 
 class FileHandler:
     """Handles all file operations for the conversion service"""
@@ -34,12 +34,14 @@ class FileHandler:
         for folder in [self.upload_folder, self.converted_folder, self.temp_folder]:
             os.makedirs(folder, exist_ok=True)
     
-    def save_uploaded_file(self, file) -> Dict:
+    def save_uploaded_file(self, file, content_info: Optional[Dict] = None) -> Dict:
         """
         Save an uploaded file to the upload directory
         
         Args:
             file: Werkzeug FileStorage object
+            content_info: Sniff result from validation (mime_type, detected_type).
+                The file is sniffed here only when this is not provided.
             
         Returns:
             Dictionary with file information
@@ -48,42 +50,23 @@ class FileHandler:
             Exception: If file save fails
         """
         try:
-            # Generate unique filename
-            original_filename = secure_filename(file.filename)
-            file_id = str(uuid.uuid4())
-            timestamp = int(time.time())
-            
-            # Get file extension
-            filename_parts = original_filename.rsplit('.', 1)
-            if len(filename_parts) == 2:
-                name, extension = filename_parts
-                extension = extension.lower()
-            else:
-                name = original_filename
-                extension = self._detect_extension_from_content(file)
+            # Sniff content once unless validation already did
+            if content_info is None:
+                content_info = content_sniffer.sniff_file(file)
             
-            # Create unique filename
-            unique_filename = f"{file_id}_{timestamp}_{name}.{extension}"
-            file_path = os.path.join(self.upload_folder, unique_filename)
+            original_filename, file_id, extension, file_path = self._allocate_upload_path(
+                file.filename, content_info
+            )
             
             # Save file
             file.save(file_path)
             
-            # Get file information
-            file_stats = os.stat(file_path)
-            file_info = {
-                'id': file_id,
-                'original_filename': original_filename,
-                'filename': unique_filename,
-                'path': file_path,
-                'size': file_stats.st_size,
-                'extension': extension,
-                'mime_type': self._get_mime_type(file_path),
-                'uploaded_at': datetime.utcnow().isoformat(),
-                'checksum': self._calculate_checksum(file_path)
-            }
+            file_info = self._build_upload_info(
+                file_id, original_filename, file_path, extension, content_info,
+                self._calculate_checksum(file_path)
+            )
             
-            current_app.logger.info(f"File saved successfully: {original_filename} -> {unique_filename}")
+            current_app.logger.info(f"File saved successfully: {original_filename} -> {file_info['filename']}")
             return file_info
             
         except Exception as e:
@@ -96,47 +79,87 @@ class FileHandler:
                     pass
             raise Exception(f"File save failed: {str(e)}")
     
-    def _detect_extension_from_content(self, file) -> str:
+    def save_completed_upload(self, part_path: str, filename: str, content_info: Dict,
+                              checksum: str) -> Dict:
         """
-        Detect file extension from content when not provided in filename
+        Move a fully received resumable upload into the upload directory
         
         Args:
-            file: File object
+            part_path: Path of the assembled upload in the temp directory
+            filename: Client-supplied original filename
+            content_info: Sniff result for the assembled file
+            checksum: MD5 checksum computed while the chunks arrived
             
         Returns:
-            Detected extension or 'bin' as fallback
+            Dictionary with file information (same shape as save_uploaded_file)
+            
+        Raises:
+            Exception: If the move fails
         """
         try:
-            # Reset file pointer
-            file.seek(0)
-            file_content = file.read(1024)  # Read first 1KB
-            file.seek(0)  # Reset for actual save
-            
-            # Try filetype library first
-            kind = filetype.guess(file_content)
-            if kind:
-                return kind.extension
-            
-            # Fallback to python-magic
-            mime_type = magic.from_buffer(file_content, mime=True)
-            extension_map = {
-                'image/jpeg': 'jpg',
-                'image/png': 'png',
-                'image/gif': 'gif',
-                'image/webp': 'webp',
-                'video/mp4': 'mp4',
-                'video/avi': 'avi',
-                'audio/mpeg': 'mp3',
-                'audio/wav': 'wav',
-                'application/pdf': 'pdf',
-                'text/plain': 'txt'
-            }
+            original_filename, file_id, extension, file_path = self._allocate_upload_path(
+                filename, content_info
+            )
             
-            return extension_map.get(mime_type, 'bin')
+            shutil.move(part_path, file_path)
+            
+            file_info = self._build_upload_info(
+                file_id, original_filename, file_path, extension, content_info, checksum
+            )
+            
+            current_app.logger.info(f"Resumable upload completed: {original_filename} -> {file_info['filename']}")
+            return file_info
             
         except Exception as e:
-            current_app.logger.warning(f"Could not detect file extension: {e}")
-            return 'bin'
+            current_app.logger.error(f"Failed to store completed upload {filename}: {e}")
+            raise Exception(f"File save failed: {str(e)}")
+    
+    def _allocate_upload_path(self, filename: str, content_info: Optional[Dict]) -> Tuple[str, str, str, str]:
+        """
+        Generate the unique stored filename for an upload
+        
+        Args:
+            filename: Client-supplied filename
+            content_info: Sniff result used when the name has no extension
+            
+        Returns:
+            Tuple of (original_filename, file_id, extension, file_path)
+        """
+        # Generate unique filename
+        original_filename = secure_filename(filename)
+        file_id = str(uuid.uuid4())
+        timestamp = int(time.time())
+        
+        # Get file extension
+        filename_parts = original_filename.rsplit('.', 1)
+        if len(filename_parts) == 2:
+            name, extension = filename_parts
+            extension = extension.lower()
+        else:
+            name = original_filename
+            extension = extension_from_sniff(content_info)
+        
+        # Create unique filename
+        unique_filename = f"{file_id}_{timestamp}_{name}.{extension}"
+        file_path = os.path.join(self.upload_folder, unique_filename)
+        
+        return original_filename, file_id, extension, file_path
+    
+    def _build_upload_info(self, file_id: str, original_filename: str, file_path: str,
+                           extension: str, content_info: Optional[Dict], checksum: str) -> Dict:
+        """Build the file information dictionary for a stored upload"""
+        file_stats = os.stat(file_path)
+        return {
+            'id': file_id,
+            'original_filename': original_filename,
+            'filename': os.path.basename(file_path),
+            'path': file_path,
+            'size': file_stats.st_size,
+            'extension': extension,
+            'mime_type': (content_info or {}).get('mime_type') or 'application/octet-stream',
+            'uploaded_at': datetime.utcnow().isoformat(),
+            'checksum': checksum
+        }
     
     def _get_mime_type(self, file_path: str) -> str:
         """
@@ -149,7 +172,7 @@ class FileHandler:
             MIME type string
         """
         try:
-            return magic.from_file(file_path, mime=True)
+            return content_sniffer.sniff_path(file_path)['mime_type']
         except Exception as e:
             current_app.logger.warning(f"Could not determine MIME type for {file_path}: {e}")
             return 'application/octet-stream'
@@ -480,6 +503,41 @@ class FileHandler:
             current_app.logger.error(f"Failed to delete file {file_path}: {e}")
             return False
     
+    def release_job_files(self, paths: List[str]) -> Dict:
+        """
+        Delete the files of an expired job
+        
+        Only files inside the upload, converted and temp folders are
+        removed; job records carry client-supplied paths.
+        
+        Args:
+            paths: Input, output and archive paths of the job
+            
+        Returns:
+            Dictionary with the number of files removed and bytes freed
+        """
+        managed = [os.path.realpath(folder) + os.sep
+                   for folder in (self.upload_folder, self.converted_folder, self.temp_folder)]
+        released = {'files_removed': 0, 'space_freed_bytes': 0}
+        
+        for path in set(filter(None, paths)):
+            real_path = os.path.realpath(path)
+            if not any(real_path.startswith(folder) for folder in managed):
+                current_app.logger.warning(f"Not releasing {path}: outside the managed folders")
+                continue
+            try:
+                size = os.path.getsize(real_path)
+                os.remove(real_path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                current_app.logger.error(f"Failed to release file {path}: {e}")
+                continue
+            released['files_removed'] += 1
+            released['space_freed_bytes'] += size
+        
+        return released
+    
     def get_directory_size(self, directory: str) -> int:
         """
         Get total size of all files in a directory
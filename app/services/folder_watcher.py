@@ -0,0 +1,322 @@
+"""
+Folder Watcher for FileConverter Pro
+
+Producers drop files into shared directories and expect converted copies
+next to them. The watcher subscribes to those directories with inotify
+(through ctypes, so no extra dependency) instead of listing them on a
+timer, and hands each file to a callback once it has settled: no events
+for settle_seconds and the same size and mtime on two consecutive checks,
+so files still being written in several passes are not picked up half
+way.
+
+inotify only sees changes made through the local kernel. On NFS that
+covers writes from this host but not from other clients; for shares
+written elsewhere, or where inotify is unavailable, the watcher falls
+back to polling with a (size, mtime) snapshot per file.
+
+Watch rules come from a JSON file holding a list of objects:
+    {"path": "/mnt/share/invoices", "target": "pdf",
+     "patterns": ["*.docx", "*.odt"], "recursive": true, "options": {}}
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import json
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from flask import current_app
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class Inotify:
+    """Minimal ctypes binding for the Linux inotify API"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        try:
+            self._libc = ctypes.CDLL(libc_name or 'libc.so.6', use_errno=True)
+            init = self._libc.inotify_init1
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, f"inotify is not available: {e}")
+
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"Cannot watch {path}: {os.strerror(error)}")
+        return wd
+
+    def read(self, timeout: float) -> List[Tuple[int, int, str]]:
+        """
+        Wait for events
+
+        Args:
+            timeout: Seconds to wait for the first event
+
+        Returns:
+            List of (watch descriptor, mask, name) tuples
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def load_watch_rules(path: str) -> List[Dict]:
+    """
+    Load and normalize watch rules
+
+    Args:
+        path: JSON file with a list of rule objects
+
+    Returns:
+        Rules with absolute paths and defaults filled in
+
+    Raises:
+        Exception: If the file is not a valid rule list
+    """
+    with open(path) as f:
+        raw_rules = json.load(f)
+    if not isinstance(raw_rules, list):
+        raise Exception(f"Watch rules in {path} must be a JSON list")
+
+    rules = []
+    seen = set()
+    for raw in raw_rules:
+        if not isinstance(raw, dict) or not raw.get('path') or not raw.get('target'):
+            raise Exception(f"Watch rule needs a path and a target: {raw}")
+        rule_path = os.path.abspath(raw['path'])
+        if rule_path in seen:
+            raise Exception(f"Directory {rule_path} has more than one watch rule")
+        if not os.path.isdir(rule_path):
+            raise Exception(f"Watched directory {rule_path} does not exist")
+        seen.add(rule_path)
+        rules.append({
+            'path': rule_path,
+            'target': raw['target'].lower().lstrip('.'),
+            'patterns': list(raw.get('patterns') or ['*']),
+            'recursive': bool(raw.get('recursive', False)),
+            'options': dict(raw.get('options') or {}),
+        })
+    return rules
+
+
+class FolderWatcher:
+    """Calls back with each file that settles in a watched directory"""
+
+    def __init__(self, rules: List[Dict], callback: Callable[[str, Dict], None],
+                 settle_seconds: float = 5, poll_interval: float = 60, use_inotify: bool = True):
+        self.rules = rules
+        self.callback = callback
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+
+        # path -> (rule, time of last event, stat key at the last settle check)
+        self._pending: Dict[str, Tuple[Dict, float, Optional[Tuple[int, int]]]] = {}
+        # Polling snapshot: path -> (size, mtime)
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        # inotify watch descriptor -> (directory, rule)
+        self._watches: Dict[int, Tuple[str, Dict]] = {}
+
+        self.inotify = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except OSError as e:
+                current_app.logger.warning(f"Falling back to polling watched folders: {e}")
+
+    @property
+    def mode(self) -> str:
+        return 'inotify' if self.inotify else 'polling'
+
+    def run(self, stop: threading.Event):
+        """
+        Watch until stop is set
+
+        Files already in the directories are picked up first, so files
+        dropped while the watcher was down are not missed.
+        """
+        for rule in self.rules:
+            if self.inotify:
+                self._watch_tree(rule['path'], rule)
+            self._scan(rule['path'], rule)
+
+        next_poll = time.monotonic() + self.poll_interval
+        try:
+            while not stop.is_set():
+                timeout = self._next_timeout()
+                if self.inotify:
+                    for wd, mask, name in self.inotify.read(timeout):
+                        self._handle_event(wd, mask, name)
+                else:
+                    stop.wait(min(timeout, max(0.0, next_poll - time.monotonic())))
+                    if time.monotonic() >= next_poll:
+                        for rule in self.rules:
+                            self._scan(rule['path'], rule)
+                        next_poll = time.monotonic() + self.poll_interval
+                self._release_settled()
+        finally:
+            if self.inotify:
+                self.inotify.close()
+
+    def _next_timeout(self) -> float:
+        """Sleep until the oldest pending file is due for a settle check"""
+        if not self._pending:
+            return 1.0
+        oldest = min(last_event for _, last_event, _ in self._pending.values())
+        return min(1.0, max(0.05, oldest + self.settle_seconds - time.monotonic()))
+
+    def _watch_tree(self, directory: str, rule: Dict):
+        """Add watches for a directory (and its subdirectories for recursive rules)"""
+        try:
+            wd = self.inotify.add_watch(directory)
+        except OSError as e:
+            current_app.logger.warning(str(e))
+            return
+        self._watches.setdefault(wd, (directory, rule))
+
+        if rule['recursive']:
+            for entry in self._scandir(directory):
+                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                    self._watch_tree(entry.path, rule)
+
+    def _handle_event(self, wd: int, mask: int, name: str):
+        if mask & IN_Q_OVERFLOW:
+            # Events were dropped; rescan everything once
+            current_app.logger.warning("inotify queue overflowed, rescanning watched folders")
+            for rule in self.rules:
+                self._scan(rule['path'], rule)
+            return
+
+        watch = self._watches.get(wd)
+        if watch is None:
+            return
+        directory, rule = watch
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF) or not name:
+            return
+
+        path = os.path.join(directory, name)
+        if mask & IN_ISDIR:
+            if rule['recursive'] and mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith('.'):
+                self._watch_tree(path, rule)
+                # Files may have landed before the watch was in place
+                self._scan(path, rule)
+            return
+        self._mark(path, rule)
+
+    def _scan(self, directory: str, rule: Dict):
+        """Queue new or changed files under a directory"""
+        for entry in self._scandir(directory):
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if rule['recursive']:
+                    self._scan(entry.path, rule)
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            key = (stat.st_size, stat.st_mtime_ns)
+            if self._snapshot.get(entry.path) != key:
+                self._snapshot[entry.path] = key
+                self._mark(entry.path, rule)
+
+    @staticmethod
+    def _scandir(directory: str):
+        try:
+            with os.scandir(directory) as entries:
+                return list(entries)
+        except OSError:
+            return []
+
+    def _mark(self, path: str, rule: Dict):
+        """Record activity on a file that may need converting"""
+        name = os.path.basename(path)
+        # Hidden names include the temporary files outputs are written to
+        if name.startswith('.') or os.path.splitext(name)[1][1:].lower() == rule['target']:
+            return
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in rule['patterns']):
+            return
+        previous = self._pending.get(path)
+        self._pending[path] = (rule, time.monotonic(), previous[2] if previous else None)
+
+    def _release_settled(self):
+        """Hand over files that stopped changing"""
+        now = time.monotonic()
+        for path, (rule, last_event, last_key) in list(self._pending.items()):
+            if now - last_event < self.settle_seconds:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Deleted or renamed away before it settled
+                del self._pending[path]
+                continue
+
+            key = (stat.st_size, stat.st_mtime_ns)
+            if key != last_key:
+                # Still growing (or first check); look again after another settle period
+                self._pending[path] = (rule, now, key)
+                continue
+
+            del self._pending[path]
+            self._snapshot[path] = key
+            try:
+                self.callback(path, rule)
+            except Exception as e:
+                current_app.logger.error(f"Could not queue {path}: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'rules': len(self.rules),
+            'watches': len(self._watches),
+            'pending': len(self._pending)
+        }
@@ -0,0 +1,92 @@
+"""
+Font Cache for FileConverter Pro
+
+Web font pipelines convert the same family to several formats (woff and
+woff2, often in the same batch) and resubmit it regularly. Fonts are
+opened with fontTools' lazy loading, so only the tables a conversion
+touches are parsed, and kept in a small LRU keyed by content checksum so
+repeat conversions skip reading and parsing entirely. Fonts are loaded
+from memory rather than the uploaded file, so cleanup of the upload does
+not affect cached entries.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+from flask import current_app
+from fontTools.ttLib import TTFont
+
+from app.utils.helpers import calculate_file_hash
+
+
+class FontCache:
+    """LRU of lazily parsed fonts keyed by content checksum"""
+
+    def __init__(self, max_fonts: int = 16):
+        self.max_fonts = max_fonts
+        self._fonts: 'OrderedDict[str, Tuple[TTFont, threading.Lock]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> Tuple[TTFont, threading.Lock]:
+        """
+        Get the parsed font for a file
+
+        Args:
+            path: Font file (ttf, otf, woff or woff2)
+
+        Returns:
+            Tuple of (font, lock); hold the lock while using the font, as
+            lazy table loading is not thread-safe
+        """
+        checksum = calculate_file_hash(path)
+        with self._lock:
+            entry = self._fonts.get(checksum)
+            if entry is not None:
+                self._fonts.move_to_end(checksum)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        with open(path, 'rb') as f:
+            buffer = io.BytesIO(f.read())
+        # Lazy fonts compare their source name with the save target
+        buffer.name = path
+        entry = (TTFont(buffer, lazy=True), threading.Lock())
+
+        with self._lock:
+            # Another thread may have loaded the same font meanwhile
+            existing = self._fonts.get(checksum)
+            if existing is not None:
+                return existing
+            self._fonts[checksum] = entry
+            # Evicted fonts are not closed; a conversion may still be using one
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+        return entry
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'fonts': len(self._fonts),
+                'max_fonts': self.max_fonts,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def init_font_cache(app) -> FontCache:
+    """Create the font cache and attach it to the application"""
+    cache = FontCache(app.config['FONT_CACHE_SIZE'])
+    app.extensions['font_cache'] = cache
+    return cache
+
+
+def get_font_cache() -> FontCache:
+    """Get the font cache of the current application"""
+    cache = current_app.extensions.get('font_cache')
+    if cache is None:
+        cache = init_font_cache(current_app._get_current_object())
+    return cache
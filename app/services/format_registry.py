@@ -0,0 +1,198 @@
+"""
+Format Registry for FileConverter Pro
+
+This module builds an immutable index of supported formats and conversion
+engines once at application startup. Validation, conversion routing and
+the formats endpoints read from it instead of rescanning configuration.
+"""
+
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from flask import current_app
+
+from app.utils.http_cache import PreparedResponse
+
+
+class FormatRegistry:
+    """Immutable lookup tables for formats, categories and conversions"""
+
+    def __init__(self, allowed_extensions: Mapping[str, Iterable[str]],
+                 conversion_engines: Mapping[str, Iterable[str]],
+                 engines: Iterable[type]):
+        self.built_at = datetime.utcnow().isoformat()
+        self.engines: Tuple[type, ...] = tuple(engines)
+
+        # Category -> formats, preserving configuration order
+        self.category_formats: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            category: tuple(ext.lower() for ext in formats)
+            for category, formats in allowed_extensions.items()
+        })
+        self.categories: Tuple[str, ...] = tuple(self.category_formats)
+        self.total_formats = sum(len(formats) for formats in self.category_formats.values())
+        self.category_engines: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            category: tuple(conversion_engines.get(category, []))
+            for category in self.category_formats
+        })
+
+        # Extension -> category (first category wins, as in the old linear scan)
+        extension_category = {}
+        for category, formats in self.category_formats.items():
+            for ext in formats:
+                extension_category.setdefault(ext, category)
+        self.extension_category: Mapping[str, str] = MappingProxyType(extension_category)
+
+        # One bit per known format for capability sets
+        self._format_bits: Dict[str, int] = {
+            ext: 1 << index for index, ext in enumerate(extension_category)
+        }
+
+        self._build_conversion_matrix()
+
+    def _build_conversion_matrix(self):
+        """Resolve the engine for every format pair once"""
+        matrix = {}
+        target_masks = {}
+        engine_capabilities = {}
+
+        for engine in self.engines:
+            engine_capabilities[engine.__name__] = {'sources': 0, 'targets': 0}
+
+        for source in self.extension_category:
+            row = {}
+            mask = 0
+            for target in self.extension_category:
+                if source == target:
+                    continue
+                for engine in self.engines:
+                    if engine.can_convert(source, target):
+                        row[target] = engine
+                        mask |= self._format_bits[target]
+                        capability = engine_capabilities[engine.__name__]
+                        capability['sources'] |= self._format_bits[source]
+                        capability['targets'] |= self._format_bits[target]
+                        break
+            matrix[source] = MappingProxyType(row)
+            target_masks[source] = mask
+
+        self.conversion_matrix: Mapping[str, Mapping[str, type]] = MappingProxyType(matrix)
+        self._target_masks = target_masks
+        self.engine_capabilities: Mapping[str, Mapping[str, int]] = MappingProxyType({
+            name: MappingProxyType(bits) for name, bits in engine_capabilities.items()
+        })
+
+    @classmethod
+    def from_config(cls, config: Mapping, engines: Iterable[type]) -> 'FormatRegistry':
+        """Build a registry from a Flask config mapping"""
+        return cls(
+            config['ALLOWED_EXTENSIONS'],
+            config.get('CONVERSION_ENGINES', {}),
+            engines
+        )
+
+    def is_supported(self, format_name: str) -> bool:
+        """Check if a format is known to any category"""
+        return format_name.lower().strip() in self.extension_category
+
+    def get_category(self, format_name: str) -> Optional[str]:
+        """Get the category for a format"""
+        return self.extension_category.get(format_name.lower().strip())
+
+    def get_engine(self, source_format: str, target_format: str) -> Optional[type]:
+        """Get the engine that handles a direct conversion"""
+        row = self.conversion_matrix.get(source_format.lower())
+        if row is None:
+            return None
+        return row.get(target_format.lower())
+
+    def can_convert(self, source_format: str, target_format: str) -> bool:
+        """Check whether a direct conversion exists"""
+        bit = self._format_bits.get(target_format.lower())
+        if bit is None:
+            return False
+        return bool(self._target_masks.get(source_format.lower(), 0) & bit)
+
+    def get_conversion_targets(self, source_format: str) -> List[str]:
+        """Get all formats a source format converts to directly"""
+        return sorted(self.conversion_matrix.get(source_format.lower(), {}))
+
+    def get_formats_summary(self) -> Dict:
+        """Per-category format listing used by the formats endpoints"""
+        return {
+            category: {
+                'formats': sorted(formats),
+                'count': len(formats),
+                'engines': list(self.category_engines[category])
+            }
+            for category, formats in self.category_formats.items()
+        }
+
+
+def init_format_registry(app) -> FormatRegistry:
+    """
+    Build the format registry and attach it to the application
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        The registry stored in app.extensions
+    """
+    from app.services.converter import ConversionService
+
+    registry = FormatRegistry.from_config(app.config, ConversionService.ENGINES)
+    app.extensions['format_registry'] = registry
+    init_format_responses(app, registry)
+    return registry
+
+
+def init_format_responses(app, registry: FormatRegistry) -> Dict[str, PreparedResponse]:
+    """
+    Pre-serialize the formats endpoint payloads
+
+    The format set only changes on deploy, so the JSON bodies and their
+    ETags are computed once and served as-is.
+
+    Args:
+        app: Flask application instance
+        registry: Registry to serialize
+
+    Returns:
+        Mapping of response name to PreparedResponse
+    """
+    responses = {
+        'api_formats': PreparedResponse.from_json(app, {
+            'supported_formats': registry.get_formats_summary(),
+            'total_formats': registry.total_formats,
+            'categories': list(registry.categories),
+            'last_updated': registry.built_at
+        }, volatile_keys=('last_updated',)),
+        'formats_page': PreparedResponse.from_json(app, {
+            'supported_formats': {
+                category: list(formats)
+                for category, formats in registry.category_formats.items()
+            },
+            'total_formats': registry.total_formats,
+            'categories': list(registry.categories)
+        })
+    }
+    app.extensions['format_responses'] = responses
+    return responses
+
+
+def get_format_response(name: str) -> PreparedResponse:
+    """Get a pre-serialized formats response without touching the registry"""
+    responses = current_app.extensions.get('format_responses')
+    if responses is None:
+        get_format_registry()
+        responses = current_app.extensions['format_responses']
+    return responses[name]
+
+
+def get_format_registry() -> FormatRegistry:
+    """Get the format registry of the current application"""
+    registry = current_app.extensions.get('format_registry')
+    if registry is None:
+        registry = init_format_registry(current_app._get_current_object())
+    return registry
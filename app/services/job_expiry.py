@@ -0,0 +1,227 @@
+"""
+Job Expiry for FileConverter Pro
+
+Conversion jobs and their files are kept for a fixed time to live after
+they are created. Instead of scanning the whole job store for old
+entries, each job is scheduled on a hierarchical timing wheel when it is
+created: scheduling and cancelling are O(1), and a background thread
+advances the wheel once per tick, handing the jobs whose time has come
+to an expiry handler. Entries far in the future sit in coarser levels
+and move down a level at a time as their deadline approaches, so each
+job costs a bounded number of moves however long its TTL is.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from flask import current_app
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel over a monotonic clock
+
+    Level 0 has one slot per tick; each level above covers `slots` times
+    the span of the one below. Deadlines beyond the top level are parked
+    in its farthest slot and re-filed when that slot comes round.
+    """
+
+    def __init__(self, resolution: float = 1.0, slot_bits: int = 6, levels: int = 4,
+                 now: Optional[float] = None):
+        self.resolution = resolution
+        self.slot_bits = slot_bits
+        self.slots = 1 << slot_bits
+        self.levels = levels
+        self._mask = self.slots - 1
+        # Next tick to be processed
+        self.current = self._tick(time.monotonic() if now is None else now)
+        # One dict per slot: key -> deadline tick
+        self._wheel: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(self.slots)] for _ in range(levels)
+        ]
+        # key -> (level, slot) it is filed under
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp / self.resolution)
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        File a key under a monotonic deadline, replacing any earlier one
+
+        Args:
+            key: Key to hand back once the deadline has passed
+            deadline: time.monotonic() value
+        """
+        self.cancel(key)
+        self._file(key, max(self.current, math.ceil(deadline / self.resolution)))
+
+    def _file(self, key: Hashable, tick: int):
+        delta = tick - self.current
+        level = 0
+        while level < self.levels - 1 and delta >= 1 << (self.slot_bits * (level + 1)):
+            level += 1
+        if delta >= 1 << (self.slot_bits * self.levels):
+            # Out of range: wait in the top level's farthest slot
+            slot = ((self.current >> (self.slot_bits * level)) - 1) & self._mask
+        else:
+            slot = (tick >> (self.slot_bits * level)) & self._mask
+        self._wheel[level][slot][key] = tick
+        self._where[key] = (level, slot)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove a key; returns False if it was not scheduled"""
+        position = self._where.pop(key, None)
+        if position is None:
+            return False
+        level, slot = position
+        del self._wheel[level][slot][key]
+        return True
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Move the wheel up to a point in time
+
+        Args:
+            now: time.monotonic() value (defaults to the current time)
+
+        Returns:
+            Keys whose deadline has passed, in deadline order
+        """
+        target = self._tick(time.monotonic() if now is None else now)
+        expired = []
+        if not self._where:
+            # Nothing filed; skip the idle ticks
+            self.current = max(self.current, target + 1)
+            return expired
+        while self.current <= target:
+            # At the start of each level-0 round, move the next block of
+            # every coarser level whose own round also starts here down
+            level = 1
+            while level < self.levels and (self.current >> (self.slot_bits * (level - 1))) & self._mask == 0:
+                self._cascade(level, (self.current >> (self.slot_bits * level)) & self._mask)
+                level += 1
+
+            due = self._wheel[0][self.current & self._mask]
+            if due:
+                for key in due:
+                    del self._where[key]
+                expired.extend(due)
+                self._wheel[0][self.current & self._mask] = {}
+            self.current += 1
+        return expired
+
+    def _cascade(self, level: int, slot: int):
+        entries = self._wheel[level][slot]
+        if not entries:
+            return
+        self._wheel[level][slot] = {}
+        for key, tick in entries.items():
+            self._file(key, tick)
+
+
+class JobExpiry:
+    """Expires jobs after a TTL from a background thread"""
+
+    def __init__(self, app, ttl: float, resolution: float = 60):
+        self.app = app
+        self.ttl = ttl
+        self.resolution = resolution
+        self.handler: Optional[Callable[[str], None]] = None
+        self.expired = 0
+
+        self._wheel = TimingWheel(resolution)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start the expiry thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='job-expiry', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def schedule(self, job_id: str, ttl: Optional[float] = None):
+        """
+        Expire a job after its TTL (rescheduling replaces the old deadline)
+
+        Args:
+            job_id: Conversion job ID
+            ttl: Seconds from now, defaults to the configured job TTL
+        """
+        with self._lock:
+            self._wheel.schedule(job_id, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self.start()
+
+    def cancel(self, job_id: str):
+        """Forget a job removed by other means"""
+        with self._lock:
+            self._wheel.cancel(job_id)
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """
+        Expire the jobs that are due
+
+        Returns:
+            Number of jobs handed to the handler
+        """
+        with self._lock:
+            due = self._wheel.advance(now)
+        for job_id in due:
+            try:
+                self.handler(job_id)
+            except Exception as e:
+                current_app.logger.error(f"Failed to expire job {job_id}: {e}")
+        self.expired += len(due)
+        return len(due)
+
+    def _run(self):
+        while not self._stopped.wait(self.resolution):
+            if self.handler is None:
+                continue
+            with self.app.app_context():
+                self.run_once()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            scheduled = len(self._wheel)
+        return {
+            'running': self._thread is not None and not self._stopped.is_set(),
+            'scheduled': scheduled,
+            'expired': self.expired,
+            'ttl_hours': round(self.ttl / 3600, 2),
+            'resolution': self.resolution
+        }
+
+
+def init_job_expiry(app) -> JobExpiry:
+    """
+    Create the job expiry service and attach it to the application
+
+    The thread starts when the first job is scheduled; the job store
+    registers the handler.
+    """
+    config = app.config
+    expiry = JobExpiry(app, config['JOB_TTL_HOURS'] * 3600, resolution=config['JOB_EXPIRY_RESOLUTION'])
+    app.extensions['job_expiry'] = expiry
+    return expiry
+
+
+def get_job_expiry() -> JobExpiry:
+    """Get the job expiry service of the current application"""
+    expiry = current_app.extensions.get('job_expiry')
+    if expiry is None:
+        expiry = init_job_expiry(current_app._get_current_object())
+    return expiry
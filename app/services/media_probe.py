@@ -0,0 +1,248 @@
+"""
+Media Probe Service for FileConverter Pro
+
+Container and codec metadata for audio/video files comes from ffprobe.
+Results are cached by file checksum in memory (LRU) and on disk, so the
+scheduler, the engines and validation share a single probe per file.
+The checksum is always computed here, never taken from a caller (job
+file records come from clients); repeat probes of a file are matched to
+its checksum by (path, size, mtime) before the file is hashed again.
+"""
+
+import contextvars
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from flask import current_app
+
+from app.services.process_supervisor import run_supervised, ProcessTimeoutError
+from app.utils.helpers import calculate_file_hash
+
+# Categories worth probing
+PROBED_CATEGORIES = ('video', 'audio')
+
+# Hex digests the disk cache accepts as file names
+CHECKSUM_PATTERN = re.compile(r'^[0-9a-f]{32,64}$')
+
+
+class MediaProbe:
+    """ffprobe wrapper with memory and disk caches keyed by checksum"""
+
+    def __init__(self, cache_folder: str, cache_size: int = 1024, timeout: int = 30,
+                 batch_workers: int = 4):
+        self.cache_folder = cache_folder
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.batch_workers = batch_workers
+
+        self._memory: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._path_index: Dict[Tuple[str, int, int], str] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def probe(self, path: str) -> Optional[Dict]:
+        """
+        Get media metadata for a file
+
+        Args:
+            path: File to probe
+
+        Returns:
+            Normalized metadata dictionary, or None if ffprobe could not read it
+        """
+        try:
+            stat_key = self._stat_key(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            checksum = self._path_index.get(stat_key)
+        if not checksum:
+            checksum = calculate_file_hash(path)
+            if not checksum or not CHECKSUM_PATTERN.match(checksum):
+                return None
+
+        with self._lock:
+            self._path_index[stat_key] = checksum
+
+        while True:
+            with self._lock:
+                cached = self._memory.get(checksum)
+                if cached is not None:
+                    self._memory.move_to_end(checksum)
+                    return cached
+                # Only one thread probes a given file; the others wait for it
+                waiter = self._inflight.get(checksum)
+                if waiter is None:
+                    self._inflight[checksum] = threading.Event()
+                    break
+            waiter.wait(self.timeout)
+
+        try:
+            info = self._load_from_disk(checksum)
+            if info is None:
+                info = self._run_ffprobe(path)
+                if info is not None:
+                    self._save_to_disk(checksum, info)
+            if info is not None:
+                self._remember(checksum, info)
+            return info
+        finally:
+            with self._lock:
+                self._inflight.pop(checksum).set()
+
+    def probe_many(self, paths: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Probe several files concurrently
+
+        Args:
+            paths: Files to probe
+
+        Returns:
+            Mapping of path to metadata (None for unreadable files)
+        """
+        paths = list(dict.fromkeys(paths))
+        if len(paths) <= 1:
+            return {path: self.probe(path) for path in paths}
+
+        with ThreadPoolExecutor(max_workers=min(self.batch_workers, len(paths)),
+                                thread_name_prefix='probe') as pool:
+            # Each task runs in a copy of this context so it sees the app context
+            futures = {
+                path: pool.submit(contextvars.copy_context().run, self.probe, path)
+                for path in paths
+            }
+            return {path: future.result() for path, future in futures.items()}
+
+    def _run_ffprobe(self, path: str) -> Optional[Dict]:
+        """Run ffprobe and normalize its JSON output"""
+        cmd = [
+            'ffprobe', '-v', 'error', '-print_format', 'json',
+            '-show_format', '-show_streams', path
+        ]
+        try:
+            result = run_supervised(cmd, timeout=self.timeout)
+        except (OSError, ProcessTimeoutError) as e:
+            current_app.logger.warning(f"ffprobe failed for {path}: {e}")
+            return None
+
+        if result['returncode'] != 0:
+            current_app.logger.info(f"ffprobe could not read {path}: {result['stderr'].strip()}")
+            return None
+
+        try:
+            return self._normalize(json.loads(result['stdout']))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _normalize(raw: Dict) -> Dict:
+        """Reduce ffprobe output to the fields the application uses"""
+        def number(value, cast=float):
+            try:
+                return cast(value)
+            except (TypeError, ValueError):
+                return None
+
+        def frame_rate(value):
+            numerator, _, denominator = (value or '').partition('/')
+            num, den = number(numerator), number(denominator)
+            return round(num / den, 3) if num and den else None
+
+        fmt = raw.get('format', {})
+        streams = []
+        for stream in raw.get('streams', []):
+            streams.append({
+                'index': stream.get('index'),
+                'codec_type': stream.get('codec_type'),
+                'codec_name': stream.get('codec_name'),
+                'width': stream.get('width'),
+                'height': stream.get('height'),
+                'fps': frame_rate(stream.get('avg_frame_rate')),
+                'sample_rate': number(stream.get('sample_rate'), int),
+                'channels': stream.get('channels'),
+                'bit_rate': number(stream.get('bit_rate'), int),
+            })
+
+        def first_codec(codec_type):
+            return next((s['codec_name'] for s in streams if s['codec_type'] == codec_type), None)
+
+        return {
+            'format_name': fmt.get('format_name'),
+            'duration': number(fmt.get('duration')),
+            'bit_rate': number(fmt.get('bit_rate'), int),
+            'size': number(fmt.get('size'), int),
+            'video_codec': first_codec('video'),
+            'audio_codec': first_codec('audio'),
+            'streams': streams,
+        }
+
+    def _remember(self, checksum: str, info: Dict):
+        with self._lock:
+            self._memory[checksum] = info
+            self._memory.move_to_end(checksum)
+            while len(self._memory) > self.cache_size:
+                self._memory.popitem(last=False)
+            # The path index only needs to cover recently probed files
+            while len(self._path_index) > self.cache_size * 4:
+                self._path_index.pop(next(iter(self._path_index)))
+
+    def _cache_path(self, checksum: str) -> str:
+        if not CHECKSUM_PATTERN.match(checksum):
+            raise ValueError(f"Invalid probe cache key: {checksum!r}")
+        return os.path.join(self.cache_folder, f"{checksum}.json")
+
+    def _load_from_disk(self, checksum: str) -> Optional[Dict]:
+        try:
+            with open(self._cache_path(checksum)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_to_disk(self, checksum: str, info: Dict):
+        try:
+            path = self._cache_path(checksum)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            os.makedirs(self.cache_folder, exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump(info, f)
+            os.replace(temp_path, path)
+        except (OSError, ValueError) as e:
+            current_app.logger.warning(f"Could not cache probe result: {e}")
+
+    @staticmethod
+    def _stat_key(path: str) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return os.path.realpath(path), stat.st_size, stat.st_mtime_ns
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'memory_entries': len(self._memory),
+                'cache_folder': self.cache_folder
+            }
+
+
+def init_media_probe(app) -> MediaProbe:
+    """Create the media probe service and attach it to the application"""
+    config = app.config
+    probe = MediaProbe(
+        config['PROBE_CACHE_FOLDER'],
+        cache_size=config['PROBE_CACHE_SIZE'],
+        timeout=config['PROBE_TIMEOUT'],
+        batch_workers=config['PROBE_BATCH_WORKERS']
+    )
+    app.extensions['media_probe'] = probe
+    return probe
+
+
+def get_media_probe() -> MediaProbe:
+    """Get the media probe service of the current application"""
+    probe = current_app.extensions.get('media_probe')
+    if probe is None:
+        probe = init_media_probe(current_app._get_current_object())
+    return probe
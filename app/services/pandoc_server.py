@@ -0,0 +1,325 @@
+"""
+Pandoc Server Pool for FileConverter Pro
+
+Most Pandoc conversions are small and their cost is dominated by starting
+the Haskell runtime and loading data files. When enabled, a pool of
+long-lived pandoc-server processes listens on local ports and
+conversions are posted to them as JSON. Servers are started on first use
+and restarted if they die.
+
+Every worker process has its own pool, so ports are claimed from a shared
+range with an flock'd lock file per port, held for the life of the
+process; a server only counts as started once the child just spawned is
+the one listening on its port. Anything the server cannot do (PDF output
+needs a LaTeX engine, custom templates are file paths) or any server
+outage raises PandocServerUnavailable so the caller can fall back to
+running pandoc as a subprocess.
+"""
+
+import atexit
+import base64
+import errno
+import fcntl
+import os
+import queue
+import shlex
+import socket
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+import requests
+from flask import current_app
+
+# File extension -> pandoc format; .txt is read and written as Markdown,
+# as the pandoc CLI does
+PANDOC_SERVER_FORMATS = {
+    'md': 'markdown',
+    'txt': 'markdown',
+    'html': 'html',
+    'docx': 'docx',
+    'epub': 'epub',
+}
+# Formats exchanged base64-encoded
+BINARY_FORMATS = {'docx', 'epub'}
+
+
+class PandocServerUnavailable(Exception):
+    """The conversion has to go through the pandoc subprocess instead"""
+
+
+class PandocServerPool:
+    """Pool of local pandoc-server processes"""
+
+    # Seconds to stop using the pool after a server fails to start
+    RETRY_DELAY = 60
+
+    def __init__(self, command: str, lock_folder: str, size: int = 2, base_port: int = 3030,
+                 port_range: int = 100, timeout: int = 30, startup_timeout: float = 10):
+        self.command = shlex.split(command)
+        self.lock_folder = lock_folder
+        self.size = max(1, size)
+        self.base_port = base_port
+        self.port_range = max(self.size, port_range)
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+
+        # Ports are claimed on first start: port -> None until then
+        self._servers: List[Dict] = [
+            {'port': None, 'lock_fd': None, 'process': None} for _ in range(self.size)
+        ]
+        self._idle: 'queue.Queue[Dict]' = queue.Queue()
+        for server in self._servers:
+            self._idle.put(server)
+        self._disabled_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'fallbacks': 0, 'restarts': 0}
+
+    @staticmethod
+    def supports(source_format: str, target_format: str) -> bool:
+        """Check whether the server can handle a format pair"""
+        return (
+            source_format.lower() in PANDOC_SERVER_FORMATS
+            and target_format.lower() in PANDOC_SERVER_FORMATS
+        )
+
+    def convert(self, input_path: str, output_path: str) -> Dict:
+        """
+        Convert a document through a pooled pandoc-server
+
+        Args:
+            input_path: Source document (format taken from the extension)
+            output_path: Destination (format taken from the extension)
+
+        Returns:
+            Dictionary with conversion result
+
+        Raises:
+            PandocServerUnavailable: If the pair is unsupported or no server
+                could take the request
+            Exception: If pandoc rejected the document
+        """
+        source_ext = os.path.splitext(input_path)[1][1:].lower()
+        target_ext = os.path.splitext(output_path)[1][1:].lower()
+        if not self.supports(source_ext, target_ext):
+            raise PandocServerUnavailable(f"pandoc-server cannot convert {source_ext} to {target_ext}")
+        if time.monotonic() < self._disabled_until:
+            self._count('fallbacks')
+            raise PandocServerUnavailable("pandoc-server pool is backing off after a startup failure")
+
+        with open(input_path, 'rb') as f:
+            data = f.read()
+        payload = {
+            'text': (base64.b64encode(data).decode('ascii') if source_ext in BINARY_FORMATS
+                     else data.decode('utf-8', errors='replace')),
+            'from': PANDOC_SERVER_FORMATS[source_ext],
+            'to': PANDOC_SERVER_FORMATS[target_ext],
+        }
+
+        try:
+            server = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            self._count('fallbacks')
+            raise PandocServerUnavailable("No pandoc-server became free")
+
+        try:
+            self._ensure_running(server)
+            response = requests.post(
+                f"http://127.0.0.1:{server['port']}/",
+                json=payload,
+                headers={'Accept': 'application/json'},
+                timeout=self.timeout + 5,
+            )
+            result = response.json()
+        except (OSError, requests.RequestException, ValueError) as e:
+            # A dead or wedged server is restarted on its next use
+            self._stop(server)
+            self._count('fallbacks')
+            raise PandocServerUnavailable(f"pandoc-server request failed: {e}")
+        finally:
+            self._idle.put(server)
+
+        if 'error' in result:
+            raise Exception(f"Pandoc error: {result['error']}")
+
+        output = result.get('output', '')
+        with open(output_path, 'wb') as f:
+            f.write(base64.b64decode(output) if result.get('base64') else output.encode('utf-8'))
+
+        self._count('requests')
+        return {
+            'success': True,
+            'engine': 'pandoc-server',
+            'input_size': len(data),
+            'output_size': os.path.getsize(output_path),
+        }
+
+    def _ensure_running(self, server: Dict):
+        """Start a server if it is not running and wait for it to listen"""
+        process = server['process']
+        if process is not None and process.poll() is None:
+            return
+
+        if server['port'] is None:
+            self._claim_port(server)
+
+        cmd = self.command + ['--port', str(server['port']), '--timeout', str(self.timeout)]
+        try:
+            server['process'] = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError as e:
+            self._disable(f"could not start {cmd[0]}: {e}")
+        self._count('restarts')
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if server['process'].poll() is not None:
+                break
+            # Only our own child counts: something else answering on the
+            # port means it failed to bind
+            listening = self._listening(server['process'].pid, server['port'])
+            if listening is None:
+                # No /proc: fall back to probing the port
+                try:
+                    with socket.create_connection(('127.0.0.1', server['port']), timeout=0.5):
+                        listening = server['process'].poll() is None
+                except OSError:
+                    listening = False
+            if listening:
+                return
+            time.sleep(0.1)
+
+        port = server['port']
+        self._stop(server)
+        # Try another port next time, in case something else holds this one
+        self._release_port(server)
+        self._disable(f"pandoc-server on port {port} did not start")
+
+    def _claim_port(self, server: Dict):
+        """Claim a free port in the shared range for a server"""
+        os.makedirs(self.lock_folder, exist_ok=True)
+        for port in range(self.base_port, self.base_port + self.port_range):
+            fd = os.open(os.path.join(self.lock_folder, f"port-{port}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                # Conflicts with other processes and with this pool's other servers
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            if not self._port_free(port):
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+                continue
+            server['port'], server['lock_fd'] = port, fd
+            return
+        self._disable(f"no free port in {self.base_port}-{self.base_port + self.port_range - 1}")
+
+    @staticmethod
+    def _release_port(server: Dict):
+        if server['lock_fd'] is not None:
+            os.close(server['lock_fd'])
+        server['port'], server['lock_fd'] = None, None
+
+    @staticmethod
+    def _port_free(port: int) -> bool:
+        with socket.socket() as probe:
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                probe.bind(('127.0.0.1', port))
+            except OSError as e:
+                if e.errno == errno.EADDRINUSE:
+                    return False
+                raise
+        return True
+
+    @staticmethod
+    def _listening(pid: int, port: int) -> Optional[bool]:
+        """
+        Check whether a process has a listening TCP socket on a port
+
+        Returns:
+            True or False, or None where /proc is not available
+        """
+        if not os.path.exists('/proc/net/tcp'):
+            return None
+        try:
+            sockets = {os.readlink(f"/proc/{pid}/fd/{fd}") for fd in os.listdir(f"/proc/{pid}/fd")}
+        except OSError:
+            return False
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table) as f:
+                    next(f)
+                    for line in f:
+                        fields = line.split()
+                        # local address is HEXIP:HEXPORT; state 0A is LISTEN
+                        if (fields[3] == '0A' and int(fields[1].rsplit(':', 1)[1], 16) == port
+                                and f"socket:[{fields[9]}]" in sockets):
+                            return True
+            except OSError:
+                continue
+        return False
+
+    def _disable(self, reason: str):
+        self._disabled_until = time.monotonic() + self.RETRY_DELAY
+        self._count('fallbacks')
+        current_app.logger.warning(f"pandoc-server unavailable, using pandoc subprocess: {reason}")
+        raise PandocServerUnavailable(reason)
+
+    @staticmethod
+    def _stop(server: Dict):
+        process = server['process']
+        server['process'] = None
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def shutdown(self):
+        """Stop all server processes"""
+        for server in self._servers:
+            self._stop(server)
+            self._release_port(server)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'ports': [server['port'] for server in self._servers if server['port'] is not None],
+                'running': sum(1 for server in self._servers
+                               if server['process'] is not None and server['process'].poll() is None),
+                **self.stats
+            }
+
+
+def init_pandoc_server_pool(app) -> Optional[PandocServerPool]:
+    """Create the pandoc-server pool if enabled and attach it to the application"""
+    config = app.config
+    pool = None
+    if config['PANDOC_SERVER_ENABLED']:
+        pool = PandocServerPool(
+            config['PANDOC_SERVER_COMMAND'],
+            os.path.join(config['TEMP_FOLDER'], 'pandoc-server'),
+            size=config['PANDOC_SERVER_POOL_SIZE'],
+            base_port=config['PANDOC_SERVER_BASE_PORT'],
+            port_range=config['PANDOC_SERVER_PORT_RANGE'],
+            timeout=config['PANDOC_SERVER_TIMEOUT']
+        )
+        atexit.register(pool.shutdown)
+    app.extensions['pandoc_server_pool'] = pool
+    return pool
+
+
+def get_pandoc_server_pool() -> Optional[PandocServerPool]:
+    """Get the pandoc-server pool of the current application (None if disabled)"""
+    if 'pandoc_server_pool' not in current_app.extensions:
+        return init_pandoc_server_pool(current_app._get_current_object())
+    return current_app.extensions['pandoc_server_pool']
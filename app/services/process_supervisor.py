@@ -0,0 +1,307 @@
+"""
+Process Supervisor for FileConverter Pro
+
+Every external conversion tool (FFmpeg, Pandoc, LibreOffice) is started
+through this module. Each child runs in its own process group with
+address-space, file-size and (optionally) CPU-time rlimits and a lower
+scheduling priority. preexec_fn is unsafe in a process with threads, so
+the limits are set by the util-linux prlimit and nice wrappers, which
+exec the tool; without prlimit they are applied from the parent right
+after the spawn. When the wall-clock timeout expires, or a tool that reports
+progress stops advancing, the whole group is killed, so helpers spawned
+by the tool (e.g. soffice.bin) die with it. The child's resource usage
+is collected with wait4 for conversion stats.
+"""
+
+import os
+import errno
+import shutil
+import signal
+import resource
+import threading
+import contextvars
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+from flask import current_app
+
+# How long to wait for output pipes to drain after the child exits
+PIPE_DRAIN_TIMEOUT = 5
+
+# How often the watchdog checks the timeout and stall deadlines
+WATCHDOG_INTERVAL = 1.0
+
+
+class ProcessTimeoutError(Exception):
+    """Raised when a supervised process exceeds its wall-clock timeout"""
+
+    def __init__(self, message: str, result: Dict):
+        super().__init__(message)
+        self.result = result
+
+
+class ProcessStalledError(ProcessTimeoutError):
+    """Raised when a supervised process stops reporting progress"""
+
+
+class ProcessCancelledError(ProcessTimeoutError):
+    """Raised when a supervised process was killed because the caller cancelled it"""
+
+
+def get_process_limits(timeout: Optional[int] = None) -> Dict:
+    """
+    Read the supervisor limits from the application config
+
+    Args:
+        timeout: Wall-clock timeout override in seconds
+
+    Returns:
+        Dictionary of limits; a value of 0 disables that limit
+    """
+    config = current_app.config
+    return {
+        'timeout': timeout if timeout is not None else config['CONVERSION_TIMEOUT'],
+        'cpu_seconds': config['PROCESS_CPU_TIME_LIMIT'],
+        'memory_bytes': config['PROCESS_MEMORY_LIMIT_MB'] * 1024 * 1024,
+        'file_size_bytes': config['PROCESS_FILE_SIZE_LIMIT_MB'] * 1024 * 1024,
+        'nice': config['PROCESS_NICE'],
+    }
+
+
+def run_supervised(cmd: List[str], timeout: Optional[int] = None,
+                   cwd: Optional[str] = None, env: Optional[Dict] = None,
+                   line_callback: Optional[Callable[[str], bool]] = None,
+                   stall_timeout: Optional[float] = None,
+                   cancel: Optional[threading.Event] = None) -> Dict:
+    """
+    Run a command under the configured timeout and resource limits
+
+    Args:
+        cmd: Command and arguments
+        timeout: Wall-clock timeout in seconds (defaults to CONVERSION_TIMEOUT)
+        cwd: Working directory for the child
+        env: Environment for the child
+        line_callback: Called with each stdout line instead of collecting
+            stdout; returns True when the line shows forward progress. It
+            runs on a reader thread in a copy of the caller's context.
+        stall_timeout: Kill the process if line_callback reports no
+            progress for this many seconds
+        cancel: Kill the process once this event is set
+
+    Returns:
+        Dictionary with returncode, stdout, stderr (text) and resource_usage
+
+    Raises:
+        ProcessCancelledError: If the process group was killed on cancel
+        ProcessStalledError: If the process group was killed for not progressing
+        ProcessTimeoutError: If the process group had to be killed on timeout
+        OSError: If the command cannot be started
+    """
+    limits = get_process_limits(timeout)
+    start_time = time.monotonic()
+
+    wrapped = _wrap_with_limits(cmd, limits, env)
+
+    process = subprocess.Popen(
+        wrapped or cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+        start_new_session=True
+    )
+    if wrapped is None:
+        _apply_limits(process.pid, limits)
+
+    watchdog = _Watchdog(process.pid, limits['timeout'], stall_timeout if line_callback else None, cancel)
+
+    output = {'stdout': [], 'stderr': []}
+    if line_callback:
+        stdout_reader = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(_follow, process.stdout, line_callback, watchdog),
+            daemon=True
+        )
+    else:
+        stdout_reader = threading.Thread(target=_drain, args=(process.stdout, output['stdout']), daemon=True)
+    readers = [
+        stdout_reader,
+        threading.Thread(target=_drain, args=(process.stderr, output['stderr']), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    watchdog.start()
+    try:
+        # wait4 instead of Popen.wait so the child's rusage is not lost
+        _, status, rusage = os.wait4(process.pid, 0)
+    except BaseException:
+        _kill_group(process.pid)
+        process.wait()
+        raise
+    finally:
+        watchdog.stop()
+
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # Stray members of the group may still hold the pipes open
+    _kill_group(process.pid)
+    for reader in readers:
+        reader.join(PIPE_DRAIN_TIMEOUT)
+    process.stdout.close()
+    process.stderr.close()
+
+    result = {
+        'returncode': process.returncode,
+        'stdout': b''.join(output['stdout']).decode('utf-8', errors='replace'),
+        'stderr': b''.join(output['stderr']).decode('utf-8', errors='replace'),
+        'resource_usage': {
+            'wall_time': round(time.monotonic() - start_time, 3),
+            'user_time': round(rusage.ru_utime, 3),
+            'system_time': round(rusage.ru_stime, 3),
+            'max_rss_mb': round(rusage.ru_maxrss / 1024, 1),
+            'timed_out': watchdog.reason == 'timeout',
+            'stalled': watchdog.reason == 'stalled',
+        }
+    }
+
+    if watchdog.reason == 'cancelled':
+        raise ProcessCancelledError(f"{cmd[0]} was cancelled", result)
+
+    if watchdog.reason == 'stalled':
+        current_app.logger.warning(f"Killed {cmd[0]}: no progress for {stall_timeout}s")
+        raise ProcessStalledError(f"{cmd[0]} stalled: no progress for {stall_timeout} seconds", result)
+
+    if watchdog.reason == 'timeout':
+        current_app.logger.warning(f"Killed {cmd[0]} after {limits['timeout']}s timeout")
+        raise ProcessTimeoutError(f"{cmd[0]} timed out after {limits['timeout']} seconds", result)
+
+    if process.returncode < 0:
+        signal_name = signal.Signals(-process.returncode).name
+        current_app.logger.warning(f"{cmd[0]} terminated by {signal_name}")
+
+    return result
+
+
+def _wrap_with_limits(cmd: List[str], limits: Dict, env: Optional[Dict]) -> Optional[List[str]]:
+    """
+    Prefix a command with prlimit/nice so limits are in place before exec
+
+    Returns:
+        The wrapped command, or None if prlimit is not installed
+
+    Raises:
+        FileNotFoundError: If the tool itself does not exist (as Popen would)
+    """
+    prlimit = shutil.which('prlimit')
+    if prlimit is None:
+        return None
+
+    path = (env or os.environ).get('PATH')
+    executable = shutil.which(cmd[0], path=path)
+    if executable is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), cmd[0])
+
+    wrapped = [prlimit]
+    if limits['cpu_seconds']:
+        # Soft limit delivers SIGXCPU first; the hard limit is the backstop
+        wrapped.append(f"--cpu={limits['cpu_seconds']}:{limits['cpu_seconds'] + 5}")
+    if limits['memory_bytes']:
+        wrapped.append(f"--as={limits['memory_bytes']}")
+    if limits['file_size_bytes']:
+        wrapped.append(f"--fsize={limits['file_size_bytes']}")
+    wrapped.append('--')
+    if limits['nice']:
+        wrapped += [shutil.which('nice') or 'nice', '-n', str(limits['nice'])]
+    return wrapped + [executable] + list(cmd[1:])
+
+
+def _apply_limits(pid: int, limits: Dict):
+    """
+    Apply rlimits and niceness to a freshly spawned child
+
+    Helpers the child starts afterwards inherit them. A child that exits
+    before this runs needs no limits, so a vanished PID is ignored.
+    """
+    try:
+        if limits['nice']:
+            os.setpriority(os.PRIO_PROCESS, pid, limits['nice'])
+
+        if limits['cpu_seconds']:
+            # Soft limit delivers SIGXCPU first; the hard limit is the backstop
+            resource.prlimit(pid, resource.RLIMIT_CPU, (limits['cpu_seconds'], limits['cpu_seconds'] + 5))
+
+        if limits['memory_bytes']:
+            resource.prlimit(pid, resource.RLIMIT_AS, (limits['memory_bytes'], limits['memory_bytes']))
+
+        if limits['file_size_bytes']:
+            resource.prlimit(pid, resource.RLIMIT_FSIZE, (limits['file_size_bytes'], limits['file_size_bytes']))
+    except ProcessLookupError:
+        pass
+
+
+class _Watchdog:
+    """Kills a process group on wall-clock timeout, when progress stalls or on cancel"""
+
+    def __init__(self, pgid: int, timeout: Optional[float], stall_timeout: Optional[float],
+                 cancel: Optional[threading.Event] = None):
+        self.pgid = pgid
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        self.cancel = cancel
+        self.reason: Optional[str] = None
+        self.last_progress = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        if self.timeout or self.stall_timeout or self.cancel:
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def progressed(self):
+        """Record forward progress reported by the child"""
+        self.last_progress = time.monotonic()
+
+    def _run(self):
+        started = time.monotonic()
+        while not self._stopped.wait(WATCHDOG_INTERVAL):
+            now = time.monotonic()
+            if self.cancel is not None and self.cancel.is_set():
+                self.reason = 'cancelled'
+            elif self.timeout and now - started >= self.timeout:
+                self.reason = 'timeout'
+            elif self.stall_timeout and now - self.last_progress >= self.stall_timeout:
+                self.reason = 'stalled'
+            else:
+                continue
+            _kill_group(self.pgid)
+            return
+
+
+def _kill_group(pgid: int):
+    """Kill every process in the child's process group"""
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _drain(pipe, chunks: List[bytes]):
+    """Read a pipe to EOF so the child never blocks on a full buffer"""
+    for chunk in iter(lambda: pipe.read(65536), b''):
+        chunks.append(chunk)
+
+
+def _follow(pipe, line_callback: Callable[[str], bool], watchdog: _Watchdog):
+    """Feed stdout lines to a callback, keeping the pipe drained if it fails"""
+    for raw_line in iter(pipe.readline, b''):
+        try:
+            if line_callback(raw_line.decode('utf-8', errors='replace').rstrip('\n')):
+                watchdog.progressed()
+        except Exception:
+            # A broken progress consumer must not block the child on a full pipe
+            line_callback = lambda line: False
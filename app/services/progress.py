@@ -0,0 +1,122 @@
+"""
+Conversion Progress Reporting for FileConverter Pro
+
+Engines are static methods that know nothing about jobs. The job runner
+installs a reporter in a context variable and engines publish intra-file
+progress through report_progress; the reporter decides where it goes
+(job state, status streams, scheduler). Context variables follow the
+conversion into the supervisor's output reader threads.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+_reporter: ContextVar[Optional[Callable[[Dict], None]]] = ContextVar(
+    'conversion_progress_reporter', default=None
+)
+
+
+@contextmanager
+def progress_reporter(callback: Callable[[Dict], None]):
+    """
+    Route progress reported by engines in this context to a callback
+
+    Args:
+        callback: Called with a progress dictionary for each update
+    """
+    token = _reporter.set(callback)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+@contextmanager
+def progress_stage(index: int, count: int):
+    """
+    Map progress reported in this context onto one of several equal stages
+
+    Args:
+        index: Zero-based stage number
+        count: Number of stages the overall conversion is made of
+    """
+    parent = _reporter.get()
+    if parent is None or count <= 1:
+        yield
+        return
+
+    def scaled(progress: Dict):
+        if progress.get('percentage') is not None:
+            progress = dict(progress, percentage=round((index * 100 + progress['percentage']) / count, 1))
+        parent(dict(progress, stage=index + 1, stages=count))
+
+    with progress_reporter(scaled):
+        yield
+
+
+def report_progress(**progress):
+    """Publish intra-file progress to the current reporter, if any"""
+    callback = _reporter.get()
+    if callback is not None:
+        callback(progress)
+
+
+class FFmpegProgressParser:
+    """Turns ffmpeg -progress key=value blocks into progress reports"""
+
+    def __init__(self, duration: Optional[float]):
+        self.duration = duration
+        self.block: Dict[str, str] = {}
+        self.out_time = 0.0
+
+    def feed(self, line: str) -> bool:
+        """
+        Consume one line of ffmpeg progress output
+
+        Args:
+            line: A "key=value" line from -progress pipe:1
+
+        Returns:
+            True when a completed block moved the output position forward
+        """
+        key, separator, value = line.partition('=')
+        if not separator:
+            return False
+
+        key = key.strip()
+        self.block[key] = value.strip()
+        if key != 'progress':
+            return False
+
+        block, self.block = self.block, {}
+        # out_time_ms is microseconds as well; older builds only emit it
+        out_time = self._number(block.get('out_time_us') or block.get('out_time_ms'), 0) / 1_000_000
+        speed = self._number(block.get('speed', '').rstrip('x'), None)
+        advanced = out_time > self.out_time
+        self.out_time = max(self.out_time, out_time)
+
+        percentage = None
+        eta_seconds = None
+        if self.duration:
+            percentage = round(min(100.0, self.out_time / self.duration * 100), 1)
+            if speed:
+                eta_seconds = round(max(0.0, self.duration - self.out_time) / speed, 1)
+
+        report_progress(
+            percentage=100.0 if block['progress'] == 'end' else percentage,
+            out_time=round(self.out_time, 2),
+            duration=self.duration,
+            fps=self._number(block.get('fps'), None),
+            speed=speed,
+            eta_seconds=0.0 if block['progress'] == 'end' else eta_seconds
+        )
+        return advanced
+
+    @staticmethod
+    def _number(value: Optional[str], default):
+        """Parse a numeric field, tolerating "N/A" and empty values"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
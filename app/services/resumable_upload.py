@@ -0,0 +1,405 @@
+"""
+Resumable Upload Service for FileConverter Pro
+
+This service implements a tus-like resumable upload protocol: an upload
+is created with its total length, chunks are appended at explicit
+offsets, the current offset can be queried after a dropped connection,
+and the completed file is finalized into the same file information that
+FileHandler.save_uploaded_file returns.
+"""
+
+import os
+import json
+import uuid
+import time
+import fcntl
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Tuple
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+from werkzeug.utils import secure_filename
+
+from app.services.file_handler import FileHandler
+from app.utils.validators import FileValidator
+
+# Read size used when streaming a chunk body to disk
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# Incremental checksum state per upload: upload_id -> (offset, md5 object).
+# MD5 state cannot be saved, so it only lives in the process that received
+# the chunks so far. Once a chunk lands on another worker (or after a
+# restart) the upload stops hashing incrementally and finalize hashes the
+# file in one pass, instead of every chunk re-reading the whole prefix.
+_hash_states: Dict[str, Tuple[int, object]] = {}
+_hash_states_lock = threading.Lock()
+
+# Last time abandoned uploads were swept (per process)
+_last_sweep = 0.0
+
+
+class UploadSessionError(Exception):
+    """Resumable upload error carrying the HTTP status to report"""
+
+    def __init__(self, message: str, status_code: int = 400, error: str = 'Upload error'):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.error = error
+
+
+class ResumableUploadManager:
+    """Manages resumable upload sessions stored under the temp directory"""
+
+    def __init__(self):
+        self.sessions_folder = os.path.join(current_app.config['TEMP_FOLDER'], 'resumable')
+        self.max_file_size = current_app.config['RESUMABLE_MAX_FILE_SIZE_MB'] * 1024 * 1024
+        self.expiry_seconds = current_app.config['RESUMABLE_UPLOAD_EXPIRY']
+
+        os.makedirs(self.sessions_folder, exist_ok=True)
+
+    def create_upload(self, filename: str, length: int) -> Dict:
+        """
+        Create a new upload session
+
+        Args:
+            filename: Original filename of the file being uploaded
+            length: Total size of the file in bytes
+
+        Returns:
+            Session dictionary
+
+        Raises:
+            UploadSessionError: If the filename or length is not acceptable
+        """
+        self._maybe_sweep()
+
+        if not filename or not secure_filename(filename):
+            raise UploadSessionError('A filename is required', 400, 'Invalid upload')
+
+        if length <= 0:
+            raise UploadSessionError('Upload length must be positive', 400, 'Invalid upload')
+
+        if length > self.max_file_size:
+            raise UploadSessionError(
+                f'Upload length exceeds the maximum of {self.max_file_size // (1024 * 1024)}MB',
+                413, 'File too large'
+            )
+
+        upload_id = str(uuid.uuid4())
+        now = time.time()
+        session = {
+            'id': upload_id,
+            'filename': filename,
+            'length': length,
+            'offset': 0,
+            'created_at': datetime.utcfromtimestamp(now).isoformat(),
+            'expires_at': datetime.utcfromtimestamp(now + self.expiry_seconds).isoformat()
+        }
+
+        # Create the empty part file before publishing the session
+        open(self._part_path(upload_id), 'wb').close()
+        self._write_session(session)
+
+        with _hash_states_lock:
+            _hash_states[upload_id] = (0, hashlib.md5())
+
+        current_app.logger.info(f"Resumable upload created: {upload_id} ({filename}, {length} bytes)")
+        return session
+
+    def get_upload(self, upload_id: str) -> Dict:
+        """
+        Get an upload session with its current offset
+
+        Raises:
+            UploadSessionError: If the session does not exist or has expired
+        """
+        session = self._read_session(upload_id)
+        try:
+            session['offset'] = os.path.getsize(self._part_path(upload_id))
+        except FileNotFoundError:
+            raise UploadSessionError(f'Upload {upload_id} does not exist', 404, 'Upload not found')
+        return session
+
+    def append_chunk(self, upload_id: str, offset: int, stream) -> Dict:
+        """
+        Append a chunk at the given offset
+
+        Args:
+            upload_id: Upload session ID
+            offset: Offset the client believes the upload is at
+            stream: Readable stream with the chunk body
+
+        Returns:
+            Updated session dictionary
+
+        Raises:
+            UploadSessionError: On offset mismatch, overflow or missing session
+        """
+        session = self._read_session(upload_id)
+        part = self._open_part(upload_id, 'r+b')
+
+        with part:
+            # Serialize writers (and finalize) across threads and worker processes
+            fcntl.flock(part, fcntl.LOCK_EX)
+            try:
+                # Finalized or deleted while we waited for the lock
+                if not os.path.exists(self._session_path(upload_id)):
+                    raise UploadSessionError(f'Upload {upload_id} does not exist', 404, 'Upload not found')
+
+                part.seek(0, os.SEEK_END)
+                current_offset = part.tell()
+
+                if offset != current_offset:
+                    raise UploadSessionError(
+                        f'Upload is at offset {current_offset}, not {offset}',
+                        409, 'Offset mismatch'
+                    )
+
+                hasher = self._get_hasher(upload_id, current_offset)
+                remaining = session['length'] - current_offset
+                written = 0
+
+                try:
+                    while True:
+                        block = stream.read(STREAM_BLOCK_SIZE)
+                        if not block:
+                            break
+                        if written + len(block) > remaining:
+                            raise UploadSessionError(
+                                'Chunk exceeds the declared upload length', 413, 'Upload too large'
+                            )
+                        part.write(block)
+                        if hasher is not None:
+                            hasher.update(block)
+                        written += len(block)
+                    part.flush()
+                except UploadSessionError:
+                    # Reject the whole chunk so the offset stays where it was
+                    part.truncate(current_offset)
+                    with _hash_states_lock:
+                        _hash_states.pop(upload_id, None)
+                    raise
+                except Exception:
+                    # Connection dropped mid-chunk: keep what arrived so the
+                    # client resumes from the last byte actually received
+                    part.flush()
+                    self._set_hasher(upload_id, current_offset + written, hasher)
+                    self._touch(session)
+                    raise
+
+                new_offset = current_offset + written
+                # Still under the lock, so finalize cannot have removed the session
+                self._set_hasher(upload_id, new_offset, hasher)
+                self._touch(session)
+            finally:
+                fcntl.flock(part, fcntl.LOCK_UN)
+
+        session['offset'] = new_offset
+        return session
+
+    def finalize_upload(self, upload_id: str) -> Dict:
+        """
+        Validate a fully received upload and move it into the upload folder
+
+        Returns:
+            File information dictionary (same shape as FileHandler.save_uploaded_file)
+
+        Raises:
+            UploadSessionError: If the upload is incomplete or fails validation
+        """
+        part_path = self._part_path(upload_id)
+        part = self._open_part(upload_id, 'rb')
+
+        with part:
+            # Hold the writers' lock throughout so no chunk lands while the
+            # file is validated and moved, and a second finalize waits
+            fcntl.flock(part, fcntl.LOCK_EX)
+            try:
+                # Read under the lock: a finalize that got here first removed it
+                session = self.get_upload(upload_id)
+
+                if session['offset'] != session['length']:
+                    raise UploadSessionError(
+                        f"Upload incomplete: {session['offset']} of {session['length']} bytes received",
+                        409, 'Upload incomplete'
+                    )
+
+                hasher = self._get_hasher(upload_id, session['length'])
+                if hasher is None:
+                    hasher = self._hash_part(part, session['length'])
+                checksum = hasher.hexdigest()
+
+                # Validate exactly like a multipart upload, with the resumable size limit
+                part.seek(0)
+                storage = FileStorage(stream=part, filename=session['filename'])
+                validation_result = FileValidator().validate_file(storage, max_file_size=self.max_file_size)
+
+                if not validation_result['valid']:
+                    self._remove_session(upload_id)
+                    raise UploadSessionError(validation_result['error'], 400, 'Validation failed')
+
+                file_info = FileHandler().save_completed_upload(
+                    part_path, session['filename'], validation_result['file_info'], checksum
+                )
+
+                self._remove_session(upload_id, remove_part=False)
+            finally:
+                fcntl.flock(part, fcntl.LOCK_UN)
+
+        return file_info
+
+    def delete_upload(self, upload_id: str) -> bool:
+        """Terminate an upload and remove its data"""
+        if not os.path.exists(self._session_path(upload_id)):
+            return False
+        self._remove_session(upload_id)
+        return True
+
+    def expire_stale_uploads(self) -> int:
+        """
+        Remove upload sessions that passed their expiry time
+
+        Returns:
+            Number of sessions removed
+        """
+        now = datetime.utcnow().isoformat()
+        removed = 0
+
+        for entry in os.scandir(self.sessions_folder):
+            if not entry.name.endswith('.json'):
+                continue
+
+            upload_id = entry.name[:-len('.json')]
+            try:
+                with open(entry.path) as f:
+                    expires_at = json.load(f).get('expires_at', '')
+            except (OSError, ValueError):
+                expires_at = ''
+
+            if expires_at < now:
+                self._remove_session(upload_id)
+                removed += 1
+
+        if removed:
+            current_app.logger.info(f"Expired {removed} abandoned resumable upload(s)")
+        return removed
+
+    def _maybe_sweep(self):
+        """Expire abandoned uploads at most once per sweep interval"""
+        global _last_sweep
+
+        interval = current_app.config['RESUMABLE_UPLOAD_SWEEP_INTERVAL']
+        if time.time() - _last_sweep < interval:
+            return
+
+        _last_sweep = time.time()
+        try:
+            self.expire_stale_uploads()
+        except Exception as e:
+            current_app.logger.warning(f"Resumable upload sweep failed: {e}")
+
+    def _get_hasher(self, upload_id: str, offset: int):
+        """
+        Get the running MD5 for an upload at an offset
+
+        Returns:
+            A copy of the hasher, or None if this process has not hashed
+            every byte up to the offset (finalize then hashes the file once)
+        """
+        with _hash_states_lock:
+            state = _hash_states.get(upload_id)
+
+        if state and state[0] == offset and state[1] is not None:
+            return state[1].copy()
+        return None
+
+    def _set_hasher(self, upload_id: str, offset: int, hasher):
+        with _hash_states_lock:
+            if hasher is None:
+                _hash_states.pop(upload_id, None)
+            else:
+                _hash_states[upload_id] = (offset, hasher)
+
+    @staticmethod
+    def _hash_part(part, offset: int):
+        """Hash the first offset bytes of a part file"""
+        hasher = hashlib.md5()
+        part.seek(0)
+        remaining = offset
+        while remaining > 0:
+            block = part.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+        part.seek(offset)
+        return hasher
+
+    def _touch(self, session: Dict):
+        """Activity keeps the session alive; only abandoned uploads expire"""
+        session['expires_at'] = datetime.utcfromtimestamp(time.time() + self.expiry_seconds).isoformat()
+        self._write_session(session)
+
+    def _open_part(self, upload_id: str, mode: str):
+        try:
+            return open(self._part_path(upload_id), mode)
+        except FileNotFoundError:
+            raise UploadSessionError(f'Upload {upload_id} does not exist', 404, 'Upload not found')
+
+    def _session_path(self, upload_id: str) -> str:
+        return os.path.join(self.sessions_folder, f"{self._safe_id(upload_id)}.json")
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.sessions_folder, f"{self._safe_id(upload_id)}.part")
+
+    def _safe_id(self, upload_id: str) -> str:
+        """Reject IDs that are not UUIDs so they cannot escape the sessions folder"""
+        try:
+            return str(uuid.UUID(upload_id))
+        except (ValueError, TypeError):
+            raise UploadSessionError('Upload not found', 404, 'Upload not found')
+
+    def _read_session(self, upload_id: str) -> Dict:
+        try:
+            with open(self._session_path(upload_id)) as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            raise UploadSessionError(f'Upload {upload_id} does not exist', 404, 'Upload not found')
+
+        if session['expires_at'] < datetime.utcnow().isoformat():
+            self._remove_session(upload_id)
+            raise UploadSessionError(f'Upload {upload_id} has expired', 410, 'Upload expired')
+
+        return session
+
+    def _write_session(self, session: Dict):
+        path = self._session_path(session['id'])
+        # A temp file per writer, so concurrent writers never share one
+        fd, temp_path = tempfile.mkstemp(dir=self.sessions_folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(session, f)
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _remove_session(self, upload_id: str, remove_part: bool = True):
+        paths = [self._session_path(upload_id)]
+        if remove_part:
+            paths.append(self._part_path(upload_id))
+
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        with _hash_states_lock:
+            _hash_states.pop(upload_id, None)
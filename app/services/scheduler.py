@@ -0,0 +1,340 @@
+"""
+Job Scheduler for FileConverter Pro
+
+Conversion jobs are queued here before they reach the conversion
+executor. Each client (API key or IP address) is a flow in a weighted
+fair queue: a job's virtual finish tag is its start tag plus its
+estimated cost divided by the weight of its priority class, and the
+job with the smallest tag is dispatched next. Small interactive jobs
+therefore overtake large batches without starving them, and one client's
+backlog cannot push other clients' jobs to the back of the line.
+
+Jobs are also queued by the executor resource class they need. Heavy
+jobs only start while running heavy jobs stay under the executor's heavy
+limit, so a burst of video or document jobs never holds every running
+slot while waiting for heavy capacity, and light jobs behind them keep
+being dispatched.
+"""
+
+import hashlib
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from flask import current_app, request
+
+from app.services.estimator import estimate_file_time
+from app.services.executor import RESOURCE_CLASSES
+
+PRIORITY_CLASSES = ('interactive', 'normal', 'bulk')
+
+
+class JobScheduler:
+    """Weighted fair queue of conversion jobs in front of the executor"""
+
+    def __init__(self, app, executor):
+        config = app.config
+        self.app = app
+        self.executor = executor
+        self.weights: Dict[str, float] = dict(config['SCHEDULER_PRIORITY_WEIGHTS'])
+        self.interactive_max_cost = config['SCHEDULER_INTERACTIVE_MAX_COST']
+        self.max_running = config['SCHEDULER_MAX_RUNNING_JOBS'] or executor.max_workers
+        self.max_backlog = config['ADMISSION_MAX_BACKLOG_SECONDS']
+
+        # One heap per resource class, ordered by finish tag
+        self._queues: Dict[str, List] = {resource_class: [] for resource_class in RESOURCE_CLASSES}
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._queued: Dict[str, Dict] = {}
+        self._running: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, requested: Optional[str], cost: float) -> str:
+        """
+        Resolve the priority class of a job
+
+        Bulk is always honoured. Interactive is only granted to jobs whose
+        estimated cost stays under SCHEDULER_INTERACTIVE_MAX_COST, so a
+        large batch cannot jump the queue by asking for it. Without a
+        request, cheap jobs are interactive and everything else normal.
+
+        Args:
+            requested: Priority class asked for by the client, if any
+            cost: Estimated job cost in seconds
+
+        Returns:
+            Priority class name
+        """
+        if requested == 'bulk':
+            return 'bulk'
+        if cost <= self.interactive_max_cost and requested in (None, 'interactive'):
+            return 'interactive'
+        return 'normal'
+
+    def backlog_seconds(self) -> float:
+        """Estimated seconds of queued and unfinished running work per slot"""
+        with self._lock:
+            return self._backlog_locked()
+
+    def _backlog_locked(self) -> float:
+        queued = sum(entry['cost'] for entry in self._queued.values())
+        running = sum(entry['remaining'] for entry in self._running.values())
+        return (queued + running) / self.max_running
+
+    def update_remaining(self, job_id: str, seconds: float):
+        """Record the remaining work of a running job from its progress"""
+        with self._lock:
+            entry = self._running.get(job_id)
+            if entry is not None:
+                entry['remaining'] = max(0.0, seconds)
+
+    def admit(self, cost: float) -> Tuple[bool, int]:
+        """
+        Decide whether a new job fits in the backlog limit
+
+        A job is always admitted when nothing is queued, so a single large
+        job is never refused outright.
+
+        Args:
+            cost: Estimated job cost in seconds
+
+        Returns:
+            Tuple of (admitted, suggested Retry-After seconds)
+        """
+        if not self.max_backlog:
+            return True, 0
+
+        with self._lock:
+            if not self._queued:
+                return True, 0
+            backlog = self._backlog_locked()
+
+        if backlog + cost / self.max_running <= self.max_backlog:
+            return True, 0
+
+        return False, int(backlog - self.max_backlog + cost / self.max_running) + 1
+
+    def submit(self, job_id: str, fn: Callable, client_id: str, cost: float,
+               priority: str = 'normal', resource_class: str = 'light') -> Dict:
+        """
+        Queue a job for execution
+
+        Args:
+            job_id: Conversion job ID
+            fn: Callable run on an executor worker with job_id as argument
+            client_id: Flow the job is accounted to
+            cost: Estimated job cost in seconds
+            priority: Priority class name
+            resource_class: Executor resource class the job needs
+
+        Returns:
+            Scheduling information for the job
+        """
+        weight = self.weights.get(priority, 1.0)
+        cost = max(cost, 0.001)
+        if resource_class not in self._queues:
+            resource_class = 'light'
+
+        with self._lock:
+            start = max(self._virtual_time, self._last_finish.get(client_id, 0.0))
+            finish = start + cost / weight
+            self._last_finish[client_id] = finish
+
+            sort_key = (finish, next(self._sequence))
+            entry = {
+                'job_id': job_id,
+                'fn': fn,
+                'client_id': client_id,
+                'priority': priority,
+                'resource_class': resource_class,
+                'cost': cost,
+                'start_tag': start,
+                'finish_tag': finish,
+                'sort_key': sort_key,
+                'remaining': cost
+            }
+            heapq.heappush(self._queues[resource_class], (sort_key, entry))
+            self._queued[job_id] = entry
+
+        self._dispatch()
+        return self.get_job_info(job_id)
+
+    def _class_limit(self, resource_class: str) -> int:
+        """
+        Running jobs allowed for a resource class
+
+        Heavy jobs are held to the executor's current heavy limit and
+        always leave a running slot for light jobs.
+        """
+        if resource_class == 'heavy':
+            heavy = self.executor.limits['heavy'].limit
+            return max(1, min(heavy, self.max_running - 1))
+        return self.max_running
+
+    def _dispatch(self):
+        """Start queued jobs while running capacity is available"""
+        while True:
+            with self._lock:
+                if len(self._running) >= self.max_running:
+                    return
+                running = {resource_class: 0 for resource_class in self._queues}
+                for other in self._running.values():
+                    running[other['resource_class']] += 1
+                # Earliest finish tag among the classes with room to run
+                ready = [
+                    queue for resource_class, queue in self._queues.items()
+                    if queue and running[resource_class] < self._class_limit(resource_class)
+                ]
+                if not ready:
+                    return
+                _, entry = heapq.heappop(min(ready, key=lambda queue: queue[0][0]))
+                del self._queued[entry['job_id']]
+                self._running[entry['job_id']] = entry
+                self._virtual_time = max(self._virtual_time, entry['start_tag'])
+                self._forget_idle_flows()
+
+            future = self.executor.submit(entry['fn'], entry['job_id'])
+            future.add_done_callback(lambda _, job_id=entry['job_id']: self._job_done(job_id))
+
+    def _job_done(self, job_id: str):
+        """Release the job's running slot and dispatch the next one"""
+        with self._lock:
+            self._running.pop(job_id, None)
+        self._dispatch()
+
+    def _forget_idle_flows(self):
+        """Drop finish tags that no longer affect ordering (lock held)"""
+        active = {entry['client_id'] for entry in self._queued.values()}
+        for client_id, finish in list(self._last_finish.items()):
+            if client_id not in active and finish <= self._virtual_time:
+                del self._last_finish[client_id]
+
+    def get_job_info(self, job_id: str) -> Optional[Dict]:
+        """
+        Get the scheduling state of a job
+
+        Returns:
+            Dictionary with state, priority, cost, expected wait and queue
+            position, or None once the job has finished
+        """
+        with self._lock:
+            if job_id in self._running:
+                entry = self._running[job_id]
+                position = 0
+                state = 'running'
+                wait = 0.0
+            elif job_id in self._queued:
+                entry = self._queued[job_id]
+                ahead = [
+                    other['cost'] for queue in self._queues.values()
+                    for key, other in queue if key < entry['sort_key']
+                ]
+                running = sum(other['remaining'] for other in self._running.values())
+                position = 1 + len(ahead)
+                wait = (sum(ahead) + running) / self.max_running
+                state = 'queued'
+            else:
+                return None
+
+            return {
+                'state': state,
+                'priority': entry['priority'],
+                'estimated_cost': round(entry['cost'], 2),
+                'estimated_wait': round(wait, 2),
+                'queue_position': position
+            }
+
+    def get_stats(self) -> Dict:
+        """Queue depth per priority class and running jobs"""
+        with self._lock:
+            queued = {priority: 0 for priority in PRIORITY_CLASSES}
+            for entry in self._queued.values():
+                queued[entry['priority']] = queued.get(entry['priority'], 0) + 1
+            running = {resource_class: 0 for resource_class in self._queues}
+            for entry in self._running.values():
+                running[entry['resource_class']] += 1
+            return {
+                'running': len(self._running),
+                'max_running': self.max_running,
+                'running_by_class': running,
+                'max_running_by_class': {
+                    resource_class: self._class_limit(resource_class) for resource_class in self._queues
+                },
+                'queued': queued,
+                'queued_by_class': {
+                    resource_class: len(queue) for resource_class, queue in self._queues.items()
+                },
+                'backlog_seconds': round(self._backlog_locked(), 1),
+                'active_clients': len({entry['client_id'] for entry in self._queued.values()})
+            }
+
+
+def estimate_file_times(files: List[Dict], target_format: Optional[str] = None,
+                        options: Optional[Dict] = None) -> List[float]:
+    """
+    Estimate the conversion time of each of a job's files
+
+    Args:
+        files: File information dictionaries (with size, extension and target_format)
+        target_format: Job-wide target format used when a file has none
+        options: Conversion options
+
+    Returns:
+        Estimated seconds per file, in order; the job cost is their sum
+    """
+    return [estimate_file_time(file_info, target_format, options) for file_info in files]
+
+
+def job_resource_class(files: List[Dict], target_format: Optional[str] = None) -> str:
+    """
+    Executor resource class of a job: heavy if any of its files needs it
+
+    Args:
+        files: File information dictionaries (with extension, size and target_format)
+        target_format: Job-wide target format used when a file has none
+
+    Returns:
+        "heavy" or "light"
+    """
+    from app.services.conversion_planner import get_conversion_planner
+
+    planner = get_conversion_planner()
+    for file_info in files:
+        source = file_info.get('extension', '')
+        target = file_info.get('target_format') or target_format or ''
+        if source and target and planner.resource_class(source, target, file_info.get('size', 0)) == 'heavy':
+            return 'heavy'
+    return 'light'
+
+
+def get_client_id() -> str:
+    """
+    Identify the client of the current request for fair queuing
+
+    API keys are hashed so they never sit in memory in clear text.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key:
+        return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    return 'ip:' + (request.remote_addr or 'unknown')
+
+
+def init_job_scheduler(app) -> JobScheduler:
+    """Create the job scheduler and attach it to the application"""
+    executor = app.extensions.get('conversion_executor')
+    if executor is None:
+        from app.services.executor import init_conversion_executor
+        executor = init_conversion_executor(app)
+
+    scheduler = JobScheduler(app, executor)
+    app.extensions['job_scheduler'] = scheduler
+    return scheduler
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Get the job scheduler of the current application"""
+    scheduler = current_app.extensions.get('job_scheduler')
+    if scheduler is None:
+        scheduler = init_job_scheduler(current_app._get_current_object())
+    return scheduler
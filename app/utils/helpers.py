@@ -71,14 +71,9 @@ def get_file_type(extension: str) -> Optional[str]:
     Returns:
         File type category or None if not found
     """
-    extension_lower = extension.lower().strip()
-    allowed_extensions = current_app.config['ALLOWED_EXTENSIONS']
-    
-    for file_type, extensions in allowed_extensions.items():
-        if extension_lower in extensions:
-            return file_type
+    from app.services.format_registry import get_format_registry
     
-    return None
+    return get_format_registry().get_category(extension)
 
 
 def get_mime_type(filename: str) -> str:
@@ -551,6 +546,9 @@ def get_available_formats_for_type(file_type: str) -> List[str]:
 def estimate_conversion_time(file_size: int, file_type: str, target_format: str) -> float:
     """
     Estimate conversion time based on file size and type
+
+    Static prior used by the learned ConversionEstimator until it has
+    enough samples for a conversion.
     
     Args:
         file_size: File size in bytes
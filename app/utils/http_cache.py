@@ -0,0 +1,200 @@
+"""
+HTTP Caching Utilities for FileConverter Pro
+
+This module provides pre-serialized responses with content-hash ETags,
+helpers for answering conditional requests, and file downloads with
+Range support.
+"""
+
+import hashlib
+import os
+from typing import Iterable, Optional
+
+from flask import Response, request, send_file
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+
+# Read size handed to wsgi.file_wrapper for download bodies
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+
+
+class PreparedResponse:
+    """Response body serialized once, with an ETag over its content"""
+
+    def __init__(self, body: bytes, mimetype: str = 'application/json',
+                 etag_source: Optional[bytes] = None):
+        self.body = body
+        self.mimetype = mimetype
+        # Hashing a stable subset (etag_source) keeps the tag identical across
+        # workers when the body carries per-process values such as timestamps
+        self.etag = hashlib.sha256(etag_source or body).hexdigest()[:32]
+        self.weak = etag_source is not None
+
+    @classmethod
+    def from_json(cls, app, data, volatile_keys=()) -> 'PreparedResponse':
+        """
+        Serialize data with the application's JSON provider
+
+        Args:
+            app: Flask application instance
+            data: JSON-serializable payload
+            volatile_keys: Top-level keys left out of the ETag hash
+
+        Returns:
+            PreparedResponse holding the encoded body
+        """
+        body = app.json.dumps(data).encode('utf-8')
+        etag_source = None
+        if volatile_keys:
+            stable = {key: value for key, value in data.items() if key not in volatile_keys}
+            etag_source = app.json.dumps(stable).encode('utf-8')
+        return cls(body, etag_source=etag_source)
+
+
+def is_not_modified(etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag: str, max_age: int, weak: bool = False) -> Response:
+    """Build an empty 304 response carrying the validators"""
+    response = Response(status=304)
+    apply_cache_headers(response, etag, max_age, weak=weak)
+    return response
+
+
+def apply_cache_headers(response: Response, etag: str, max_age: int,
+                        vary: Optional[str] = None, weak: bool = False) -> Response:
+    """Attach ETag and Cache-Control headers to a response"""
+    response.set_etag(etag, weak=weak)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if vary:
+        response.vary.add(vary)
+    return response
+
+
+def prepared_json_response(prepared: PreparedResponse, max_age: int) -> Response:
+    """
+    Serve a pre-serialized body, answering If-None-Match with 304
+
+    Args:
+        prepared: PreparedResponse to serve
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        Flask Response (200 with body, or 304)
+    """
+    if is_not_modified(prepared.etag):
+        return not_modified_response(prepared.etag, max_age, weak=prepared.weak)
+
+    response = Response(prepared.body, status=200, mimetype=prepared.mimetype)
+    return apply_cache_headers(response, prepared.etag, max_age, weak=prepared.weak)
+
+
+def combined_etag(checksums: Iterable[str]) -> str:
+    """Derive one strong ETag from the checksums of several files"""
+    digest = hashlib.sha256()
+    for checksum in checksums:
+        digest.update(checksum.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def deploy_fingerprint(app) -> str:
+    """
+    Hash of the app version, templates and static assets
+
+    Rendered pages depend on these as well as on their data, so their
+    ETags include it; a deploy that changes any of them changes the tag.
+    Computed once per process.
+    """
+    fingerprint = app.extensions.get('deploy_fingerprint')
+    if fingerprint is not None:
+        return fingerprint
+
+    from app.routes import __version__
+    digest = hashlib.sha256(__version__.encode('utf-8'))
+    for folder in (app.template_folder, app.static_folder):
+        if not folder:
+            continue
+        root = os.path.join(app.root_path, folder)
+        for directory, subdirectories, filenames in os.walk(root):
+            subdirectories.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(directory, filename)
+                digest.update(os.path.relpath(path, root).encode('utf-8'))
+                digest.update(b'\0')
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+
+    fingerprint = digest.hexdigest()[:16]
+    app.extensions['deploy_fingerprint'] = fingerprint
+    return fingerprint
+
+
+def send_download(file_path: str, download_name: str, etag: Optional[str] = None,
+                  mimetype: Optional[str] = None, max_age: int = 0) -> Response:
+    """
+    Send a file as an attachment with conditional and Range support
+
+    Full bodies go through the server's wsgi.file_wrapper (os.sendfile under
+    gunicorn), or to the front-end server when USE_X_SENDFILE is enabled.
+    Range and If-Range requests are answered with 206/416.
+
+    Args:
+        file_path: Path of the file to send
+        download_name: Filename offered to the client
+        etag: Strong ETag (e.g. the stored checksum); derived from mtime/size if None
+        mimetype: Content type; guessed from download_name if None
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        Flask Response (200, 206, 304 or 416)
+    """
+    try:
+        response = send_file(
+            file_path,
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=download_name,
+            conditional=True,
+            etag=etag or True,
+            max_age=max_age
+        )
+    except RequestedRangeNotSatisfiable as e:
+        # Carries "Content-Range: bytes */<length>" for the client to recover
+        return e.get_response()
+
+    if response.status_code == 206 and _server_bounds_body():
+        _passthrough_range(response, file_path)
+
+    # Advertise ranges on full responses so players know they can seek
+    response.headers.setdefault('Accept-Ranges', 'bytes')
+
+    return response
+
+
+def _server_bounds_body() -> bool:
+    """
+    Check whether the WSGI server stops writing at Content-Length
+
+    gunicorn truncates bodies to Content-Length and only uses sendfile for its
+    own file wrapper, so a seeked file can be handed over as-is. Other servers
+    keep Werkzeug's range wrapper, which copies just the requested slice.
+    """
+    return (
+        'wsgi.file_wrapper' in request.environ
+        and request.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+    )
+
+
+def _passthrough_range(response: Response, file_path: str):
+    """Replace Werkzeug's range wrapper with a seeked file for sendfile"""
+    start = response.content_range.start
+
+    body = open(file_path, 'rb')
+    body.seek(start)
+
+    response.response.close()
+    response.response = request.environ['wsgi.file_wrapper'](body, DOWNLOAD_BLOCK_SIZE)
+    response.direct_passthrough = True
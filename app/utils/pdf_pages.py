@@ -0,0 +1,104 @@
+"""
+PDF Page Workers for FileConverter Pro
+
+Run as `python -m app.utils.pdf_pages` to process one range of pages
+of a PDF. PdfConverter starts several of these under the process
+supervisor so long documents are rendered or extracted on all cores;
+PyPDF2's text extraction is pure Python, so threads alone would not help.
+Each page is written to the output directory as page-NNNN.<ext>, numbered
+from 1 across the whole document.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import List
+
+from PyPDF2 import PdfReader, PdfWriter
+
+
+def page_filename(page_index: int, extension: str) -> str:
+    """Name of a page's output file (page_index is 0-based)"""
+    return f"page-{page_index + 1:04d}.{extension}"
+
+
+def extract_text(input_path: str, start: int, stop: int, output_dir: str) -> List[str]:
+    """
+    Extract the text of pages [start, stop)
+
+    Returns:
+        Paths of the written text files
+    """
+    reader = PdfReader(input_path)
+    written = []
+    for index in range(start, stop):
+        path = os.path.join(output_dir, page_filename(index, 'txt'))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(reader.pages[index].extract_text() or '')
+        written.append(path)
+    return written
+
+
+def render_pages(input_path: str, start: int, stop: int, output_dir: str,
+                 target_format: str, resolution: int) -> List[str]:
+    """
+    Rasterize pages [start, stop) with ImageMagick
+
+    The range is first split into its own PDF so ImageMagick's delegate
+    only sees the pages this worker renders.
+
+    Returns:
+        Paths of the written images
+    """
+    from wand.color import Color
+    from wand.image import Image as WandImage
+
+    reader = PdfReader(input_path)
+    writer = PdfWriter()
+    for index in range(start, stop):
+        writer.add_page(reader.pages[index])
+
+    written = []
+    with tempfile.NamedTemporaryFile(suffix='.pdf', dir=output_dir) as chunk:
+        writer.write(chunk)
+        chunk.flush()
+
+        with WandImage(filename=chunk.name, resolution=resolution) as document:
+            for offset, frame in enumerate(document.sequence):
+                with WandImage(image=frame) as page:
+                    # Flatten onto white; JPEG and friends have no alpha
+                    page.background_color = Color('white')
+                    page.alpha_channel = 'remove'
+                    page.format = target_format.upper()
+                    path = os.path.join(output_dir, page_filename(start + offset, target_format))
+                    page.save(filename=path)
+                    written.append(path)
+    return written
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Process a range of PDF pages')
+    parser.add_argument('mode', choices=('text', 'render'))
+    parser.add_argument('input_path')
+    parser.add_argument('start', type=int)
+    parser.add_argument('stop', type=int)
+    parser.add_argument('output_dir')
+    parser.add_argument('--format', default='png')
+    parser.add_argument('--resolution', type=int, default=150)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == 'text':
+            extract_text(args.input_path, args.start, args.stop, args.output_dir)
+        else:
+            render_pages(args.input_path, args.start, args.stop, args.output_dir,
+                         args.format, args.resolution)
+    except Exception as e:
+        print(f"Pages {args.start + 1}-{args.stop} failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
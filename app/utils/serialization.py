@@ -0,0 +1,90 @@
+"""
+Serialization Utilities for FileConverter Pro
+
+JSON goes through orjson and binary persistence through msgpack when they
+are installed; both are optional and fall back to the standard library
+json module. Values neither format knows natively are stringified, as
+json.dumps(default=str) did before.
+"""
+
+import json
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON produced by dumps_json (or any JSON)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack(data: Any) -> bytes:
+    """
+    Serialize for storage (job persistence, caches)
+
+    Uses msgpack when installed and JSON otherwise; unpack tells the two
+    apart, so data stays readable if msgpack is added or removed later.
+    """
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True, default=str)
+    return dumps_json(data)
+
+
+def unpack(data: bytes) -> Any:
+    """Deserialize data written by pack"""
+    # Packed values are objects or arrays: JSON starts with "{" or "[",
+    # msgpack with a map or array type byte
+    if data[:1] in (b'{', b'['):
+        return loads_json(data)
+    if msgpack is None:
+        raise Exception("Data was packed with msgpack, which is not installed")
+    return msgpack.unpackb(data, raw=False)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+
+    Output matches the default provider: sorted keys, HTTP dates for
+    datetimes and the default provider's handling of other types. Without
+    orjson it is the default provider.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+        except TypeError:
+            # e.g. integers beyond 64 bits, which json handles
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -0,0 +1,138 @@
+"""
+Content Sniffing Utilities for FileConverter Pro
+
+This module detects file types from magic bytes. Detection runs once per
+upload and the result is passed along with the file, so validation and
+storage never sniff the same bytes twice.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import magic
+import filetype
+
+
+# Number of leading bytes inspected for content detection
+SNIFF_SAMPLE_SIZE = 2048
+
+# Fallback extensions for MIME types that filetype cannot identify
+MIME_EXTENSION_MAP = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'video/mp4': 'mp4',
+    'video/avi': 'avi',
+    'audio/mpeg': 'mp3',
+    'audio/wav': 'wav',
+    'application/pdf': 'pdf',
+    'text/plain': 'txt'
+}
+
+
+class ContentSniffer:
+    """Thread-safe content sniffer keeping one libmagic handle per thread"""
+
+    def __init__(self, sample_size: int = SNIFF_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._local = threading.local()
+
+    def _get_magic(self) -> magic.Magic:
+        """Get the libmagic handle owned by the current thread"""
+        handle = getattr(self._local, 'magic', None)
+        if handle is None:
+            handle = magic.Magic(mime=True)
+            self._local.magic = handle
+        return handle
+
+    def read_sample(self, file) -> bytes:
+        """
+        Read the leading bytes of a file object without moving its pointer
+
+        Args:
+            file: File-like object (e.g. Werkzeug FileStorage)
+
+        Returns:
+            Sample bytes used for detection
+        """
+        file.seek(0)
+        sample = file.read(self.sample_size)
+        file.seek(0)
+        return sample
+
+    def sniff_buffer(self, content: bytes) -> Dict:
+        """
+        Detect MIME type and file type from a content sample
+
+        Args:
+            content: Leading bytes of the file
+
+        Returns:
+            Dictionary with mime_type and detected_type
+        """
+        try:
+            mime_type = self._get_magic().from_buffer(content)
+        except Exception:
+            mime_type = 'application/octet-stream'
+
+        detected_type = None
+        try:
+            kind = filetype.guess(content)
+            if kind:
+                detected_type = kind.extension
+        except Exception:
+            pass
+
+        return {
+            'mime_type': mime_type,
+            'detected_type': detected_type
+        }
+
+    def sniff_file(self, file) -> Dict:
+        """
+        Detect MIME type and file type of a file object
+
+        Args:
+            file: File-like object (e.g. Werkzeug FileStorage)
+
+        Returns:
+            Dictionary with mime_type and detected_type
+        """
+        return self.sniff_buffer(self.read_sample(file))
+
+    def sniff_path(self, file_path: str) -> Dict:
+        """
+        Detect MIME type and file type of a file on disk
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Dictionary with mime_type and detected_type
+        """
+        with open(file_path, 'rb') as f:
+            return self.sniff_buffer(f.read(self.sample_size))
+
+
+def extension_from_sniff(content_info: Optional[Dict]) -> str:
+    """
+    Pick a file extension from a sniff result
+
+    Args:
+        content_info: Result of ContentSniffer.sniff_buffer
+
+    Returns:
+        Detected extension or 'bin' as fallback
+    """
+    if not content_info:
+        return 'bin'
+
+    if content_info.get('detected_type'):
+        return content_info['detected_type']
+
+    return MIME_EXTENSION_MAP.get(content_info.get('mime_type'), 'bin')
+
+
+# Shared sniffer instance (handles are per thread, so sharing is safe)
+content_sniffer = ContentSniffer()
@@ -9,67 +9,71 @@ This module provides comprehensive file validation including:
 """
 
 import os
-import magic
-import filetype
 from typing import Dict, List, Optional, Tuple
 from flask import current_app
 from werkzeug.datastructures import FileStorage
 
+from app.services.format_registry import get_format_registry
+from app.utils.sniffer import content_sniffer
+
 
 class FileValidator:
     """Comprehensive file validation service"""
     
+    # Security: Define dangerous file extensions
+    dangerous_extensions = frozenset({
+        'exe', 'bat', 'cmd', 'com', 'pif', 'scr', 'vbs', 'js', 'jar',
+        'msi', 'dll', 'sys', 'sh', 'bash', 'php', 'jsp', 'asp', 'aspx'
+    })
+    
+    # MIME type mappings for additional validation
+    safe_mime_types = frozenset({
+        # Images
+        'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/bmp',
+        'image/tiff', 'image/svg+xml', 'image/x-icon', 'image/heic', 'image/heif',
+        
+        # Videos
+        'video/mp4', 'video/avi', 'video/quicktime', 'video/x-msvideo',
+        'video/x-ms-wmv', 'video/webm', 'video/x-flv', 'video/3gpp',
+        
+        # Audio
+        'audio/mpeg', 'audio/wav', 'audio/flac', 'audio/aac', 'audio/ogg',
+        'audio/x-ms-wma', 'audio/mp4', 'audio/opus',
+        
+        # Documents
+        'application/pdf', 'application/msword', 'text/plain', 'text/rtf',
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        'application/vnd.oasis.opendocument.text',
+        
+        # Spreadsheets
+        'application/vnd.ms-excel', 'text/csv',
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'application/vnd.oasis.opendocument.spreadsheet',
+        
+        # Presentations
+        'application/vnd.ms-powerpoint',
+        'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+        'application/vnd.oasis.opendocument.presentation',
+        
+        # Archives
+        'application/zip', 'application/x-rar-compressed', 'application/x-7z-compressed',
+        'application/x-tar', 'application/gzip'
+    })
+    
     def __init__(self):
-        self.allowed_extensions = current_app.config['ALLOWED_EXTENSIONS']
+        self.registry = get_format_registry()
+        self.allowed_extensions = self.registry.category_formats
         self.max_file_size = current_app.config['MAX_FILE_SIZE_MB'] * 1024 * 1024  # Convert to bytes
         self.max_files_per_batch = current_app.config['MAX_FILES_PER_BATCH']
-        
-        # Security: Define dangerous file extensions
-        self.dangerous_extensions = {
-            'exe', 'bat', 'cmd', 'com', 'pif', 'scr', 'vbs', 'js', 'jar',
-            'msi', 'dll', 'sys', 'sh', 'bash', 'php', 'jsp', 'asp', 'aspx'
-        }
-        
-        # MIME type mappings for additional validation
-        self.safe_mime_types = {
-            # Images
-            'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/bmp',
-            'image/tiff', 'image/svg+xml', 'image/x-icon', 'image/heic', 'image/heif',
-            
-            # Videos
-            'video/mp4', 'video/avi', 'video/quicktime', 'video/x-msvideo',
-            'video/x-ms-wmv', 'video/webm', 'video/x-flv', 'video/3gpp',
-            
-            # Audio
-            'audio/mpeg', 'audio/wav', 'audio/flac', 'audio/aac', 'audio/ogg',
-            'audio/x-ms-wma', 'audio/mp4', 'audio/opus',
-            
-            # Documents
-            'application/pdf', 'application/msword', 'text/plain', 'text/rtf',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'application/vnd.oasis.opendocument.text',
-            
-            # Spreadsheets
-            'application/vnd.ms-excel', 'text/csv',
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'application/vnd.oasis.opendocument.spreadsheet',
-            
-            # Presentations
-            'application/vnd.ms-powerpoint',
-            'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-            'application/vnd.oasis.opendocument.presentation',
-            
-            # Archives
-            'application/zip', 'application/x-rar-compressed', 'application/x-7z-compressed',
-            'application/x-tar', 'application/gzip'
-        }
     
-    def validate_file(self, file: FileStorage) -> Dict:
+    def validate_file(self, file: FileStorage, max_file_size: Optional[int] = None) -> Dict:
         """
         Comprehensive file validation
         
         Args:
             file: Werkzeug FileStorage object
+            max_file_size: Size limit in bytes overriding MAX_FILE_SIZE_MB
+                (used for resumable uploads)
             
         Returns:
             Dictionary with validation result and details
@@ -88,7 +92,7 @@ class FileValidator:
                 return filename_check
             
             # Check file size
-            size_check = self._validate_file_size(file)
+            size_check = self._validate_file_size(file, max_file_size)
             if not size_check['valid']:
                 return size_check
             
@@ -237,10 +241,11 @@ class FileValidator:
         
         return {'valid': True}
     
-    def _validate_file_size(self, file: FileStorage) -> Dict:
+    def _validate_file_size(self, file: FileStorage, max_file_size: Optional[int] = None) -> Dict:
         """Validate file size"""
         try:
             file_size = self._get_file_size(file)
+            max_file_size = max_file_size or self.max_file_size
             
             if file_size == 0:
                 return {
@@ -249,10 +254,10 @@ class FileValidator:
                     'error_code': 'EMPTY_FILE'
                 }
             
-            if file_size > self.max_file_size:
+            if file_size > max_file_size:
                 return {
                     'valid': False,
-                    'error': f'File too large: {self._format_size(file_size)} exceeds {self._format_size(self.max_file_size)} limit',
+                    'error': f'File too large: {self._format_size(file_size)} exceeds {self._format_size(max_file_size)} limit',
                     'error_code': 'FILE_TOO_LARGE'
                 }
             
@@ -285,11 +290,7 @@ class FileValidator:
             }
         
         # Find which category this extension belongs to
-        file_type = None
-        for category, extensions in self.allowed_extensions.items():
-            if extension in extensions:
-                file_type = category
-                break
+        file_type = self.registry.get_category(extension)
         
         if not file_type:
             return {
@@ -309,9 +310,7 @@ class FileValidator:
         """Validate file content using magic bytes"""
         try:
             # Read first chunk for analysis
-            file.seek(0)
-            file_content = file.read(2048)  # Read first 2KB
-            file.seek(0)  # Reset for later use
+            file_content = content_sniffer.read_sample(file)
             
             if not file_content:
                 return {
@@ -320,20 +319,10 @@ class FileValidator:
                     'error_code': 'CONTENT_READ_FAILED'
                 }
             
-            # Detect MIME type
-            try:
-                mime_type = magic.from_buffer(file_content, mime=True)
-            except Exception:
-                mime_type = 'application/octet-stream'
-            
-            # Detect file type using filetype library
-            detected_type = None
-            try:
-                kind = filetype.guess(file_content)
-                if kind:
-                    detected_type = kind.extension
-            except Exception:
-                pass
+            # Detect MIME type and file type in a single pass
+            content_info = content_sniffer.sniff_buffer(file_content)
+            mime_type = content_info['mime_type']
+            detected_type = content_info['detected_type']
             
             # Check if MIME type is in our safe list
             if mime_type not in self.safe_mime_types and not mime_type.startswith('text/'):
@@ -457,13 +446,7 @@ class FileValidator:
         Returns:
             True if format is supported
         """
-        format_lower = format_name.lower().strip()
-        
-        for extensions in self.allowed_extensions.values():
-            if format_lower in extensions:
-                return True
-        
-        return False
+        return self.registry.is_supported(format_name)
     
     def get_format_category(self, format_name: str) -> Optional[str]:
         """
@@ -475,13 +458,7 @@ class FileValidator:
         Returns:
             Category name or None if not found
         """
-        format_lower = format_name.lower().strip()
-        
-        for category, extensions in self.allowed_extensions.items():
-            if format_lower in extensions:
-                return category
-        
-        return None
+        return self.registry.get_category(format_name)
     
     def get_conversion_targets(self, source_format: str) -> List[str]:
         """
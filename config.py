@@ -14,6 +14,11 @@ class Config:
     MAX_FILES_PER_BATCH = int(os.environ.get('MAX_FILES_PER_BATCH', 50))
     MAX_FILE_SIZE_MB = int(os.environ.get('MAX_FILE_SIZE_MB', 100))
     
+    # Resumable (chunked) upload Configuration
+    RESUMABLE_MAX_FILE_SIZE_MB = int(os.environ.get('RESUMABLE_MAX_FILE_SIZE_MB', 4096))
+    RESUMABLE_UPLOAD_EXPIRY = int(os.environ.get('RESUMABLE_UPLOAD_EXPIRY', 86400))  # seconds since last chunk
+    RESUMABLE_UPLOAD_SWEEP_INTERVAL = int(os.environ.get('RESUMABLE_UPLOAD_SWEEP_INTERVAL', 300))
+    
     # Directory Configuration
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
     CONVERTED_FOLDER = os.environ.get('CONVERTED_FOLDER', 'converted')
@@ -32,7 +37,87 @@ class Config:
     
     # Performance
     CONVERSION_TIMEOUT = int(os.environ.get('CONVERSION_TIMEOUT', 300))
+    # Limits applied to every engine subprocess (0 disables a limit)
+    # CPU time is summed over all threads, so multithreaded encoders reach
+    # it long before CONVERSION_TIMEOUT; off by default, the wall timeout bounds runs
+    PROCESS_CPU_TIME_LIMIT = int(os.environ.get('PROCESS_CPU_TIME_LIMIT', 0))  # seconds
+    PROCESS_MEMORY_LIMIT_MB = int(os.environ.get('PROCESS_MEMORY_LIMIT_MB', 4096))
+    PROCESS_FILE_SIZE_LIMIT_MB = int(os.environ.get('PROCESS_FILE_SIZE_LIMIT_MB', 8192))
+    PROCESS_NICE = int(os.environ.get('PROCESS_NICE', 10))
+    FFMPEG_STALL_TIMEOUT = int(os.environ.get('FFMPEG_STALL_TIMEOUT', 60))  # seconds without progress
+    SSE_KEEPALIVE_INTERVAL = int(os.environ.get('SSE_KEEPALIVE_INTERVAL', 15))  # seconds
+    # POST /api/status:batch limits
+    STATUS_BATCH_MAX_JOBS = int(os.environ.get('STATUS_BATCH_MAX_JOBS', 500))
+    STATUS_BATCH_MAX_WAIT = float(os.environ.get('STATUS_BATCH_MAX_WAIT', 30))  # seconds
+    JOBS_PAGE_MAX = int(os.environ.get('JOBS_PAGE_MAX', 200))  # largest /api/jobs page
+    # Jobs and their files are removed this long after creation
+    JOB_TTL_HOURS = float(os.environ.get('JOB_TTL_HOURS', 24))
+    JOB_EXPIRY_RESOLUTION = float(os.environ.get('JOB_EXPIRY_RESOLUTION', 60))  # seconds per expiry tick
+    # ffprobe metadata cache (keyed by file checksum)
+    PROBE_TIMEOUT = int(os.environ.get('PROBE_TIMEOUT', 30))  # seconds
+    PROBE_CACHE_SIZE = int(os.environ.get('PROBE_CACHE_SIZE', 1024))  # entries kept in memory
+    PROBE_CACHE_FOLDER = os.environ.get('PROBE_CACHE_FOLDER', 'data/probe_cache')
+    PROBE_BATCH_WORKERS = int(os.environ.get('PROBE_BATCH_WORKERS', 4))
+    # Documents per LibreOffice process when a batch shares a target format
+    LIBREOFFICE_BATCH_SIZE = int(os.environ.get('LIBREOFFICE_BATCH_SIZE', 20))
+    # Long-lived pandoc-server processes on consecutive local ports
+    PANDOC_SERVER_ENABLED = os.environ.get('PANDOC_SERVER_ENABLED', 'False').lower() == 'true'
+    PANDOC_SERVER_COMMAND = os.environ.get('PANDOC_SERVER_COMMAND', 'pandoc-server')
+    PANDOC_SERVER_POOL_SIZE = int(os.environ.get('PANDOC_SERVER_POOL_SIZE', 2))
+    PANDOC_SERVER_BASE_PORT = int(os.environ.get('PANDOC_SERVER_BASE_PORT', 3030))
+    # Ports shared by the pools of all worker processes, from the base port up
+    PANDOC_SERVER_PORT_RANGE = int(os.environ.get('PANDOC_SERVER_PORT_RANGE', 100))
+    PANDOC_SERVER_TIMEOUT = int(os.environ.get('PANDOC_SERVER_TIMEOUT', 30))  # seconds per request
+    # Page-parallel PDF conversion (0 workers = one per CPU)
+    PDF_WORKERS = int(os.environ.get('PDF_WORKERS', 0))
+    PDF_MIN_PAGES_PER_TASK = int(os.environ.get('PDF_MIN_PAGES_PER_TASK', 4))
+    PDF_RASTER_DPI = int(os.environ.get('PDF_RASTER_DPI', 150))
+    # Rows per pandas chunk and per progress report for spreadsheet streaming
+    SPREADSHEET_CHUNK_ROWS = int(os.environ.get('SPREADSHEET_CHUNK_ROWS', 50000))
+    # Archive repacking (levels 0-9; threads > 1 decompress ahead of the writer)
+    ARCHIVE_COMPRESSION_LEVEL = int(os.environ.get('ARCHIVE_COMPRESSION_LEVEL', 6))
+    ARCHIVE_THREADS = int(os.environ.get('ARCHIVE_THREADS', 2))
+    # Zip-bomb limits on the expanded contents (0 disables a limit)
+    ARCHIVE_MAX_EXPANDED_MB = int(os.environ.get('ARCHIVE_MAX_EXPANDED_MB', 2048))
+    ARCHIVE_MAX_MEMBERS = int(os.environ.get('ARCHIVE_MAX_MEMBERS', 10000))
+    ARCHIVE_MAX_RATIO = float(os.environ.get('ARCHIVE_MAX_RATIO', 250))
+    # Parsed fonts kept for repeat conversions of the same family
+    FONT_CACHE_SIZE = int(os.environ.get('FONT_CACHE_SIZE', 16))
+    # Longest edge of slide previews served without rendering
+    PRESENTATION_THUMBNAIL_SIZE = int(os.environ.get('PRESENTATION_THUMBNAIL_SIZE', 512))
+    # Watched drop folders (python -m app.cli watch)
+    WATCH_RULES_FILE = os.environ.get('WATCH_RULES_FILE', 'watch_rules.json')
+    WATCH_JOURNAL_PATH = os.environ.get('WATCH_JOURNAL_PATH', 'data/watch_journal.jsonl')
+    WATCH_SETTLE_SECONDS = float(os.environ.get('WATCH_SETTLE_SECONDS', 5))  # quiet time before converting
+    WATCH_POLL_INTERVAL = float(os.environ.get('WATCH_POLL_INTERVAL', 60))  # seconds, polling mode only
+    # Multi-step conversion planning through intermediate formats
+    PLANNER_MAX_HOPS = int(os.environ.get('PLANNER_MAX_HOPS', 3))
+    PLANNER_HOP_PENALTY = float(os.environ.get('PLANNER_HOP_PENALTY', 0.25))  # seconds added per step when ranking paths
+    PLANNER_REPLAN_INTERVAL = float(os.environ.get('PLANNER_REPLAN_INTERVAL', 60))  # seconds
+    # Adaptive conversion concurrency: heavy = FFmpeg video/LibreOffice, light = everything else
+    CONCURRENCY_HEAVY_MIN = int(os.environ.get('CONCURRENCY_HEAVY_MIN', 1))
+    CONCURRENCY_HEAVY_MAX = int(os.environ.get('CONCURRENCY_HEAVY_MAX', max(1, (os.cpu_count() or 2) // 2)))
+    CONCURRENCY_LIGHT_MIN = int(os.environ.get('CONCURRENCY_LIGHT_MIN', 1))
+    CONCURRENCY_LIGHT_MAX = int(os.environ.get('CONCURRENCY_LIGHT_MAX', os.cpu_count() or 2))
+    CONCURRENCY_MEMORY_HIGH = float(os.environ.get('CONCURRENCY_MEMORY_HIGH', 85))  # percent
+    CONCURRENCY_CPU_LOW = float(os.environ.get('CONCURRENCY_CPU_LOW', 75))  # percent
+    CONCURRENCY_SAMPLE_INTERVAL = float(os.environ.get('CONCURRENCY_SAMPLE_INTERVAL', 2))  # seconds
+    # Weighted fair job scheduling across clients
+    SCHEDULER_PRIORITY_WEIGHTS = {'interactive': 8.0, 'normal': 2.0, 'bulk': 1.0}
+    SCHEDULER_INTERACTIVE_MAX_COST = float(os.environ.get('SCHEDULER_INTERACTIVE_MAX_COST', 30))  # est. seconds
+    SCHEDULER_MAX_RUNNING_JOBS = int(os.environ.get('SCHEDULER_MAX_RUNNING_JOBS', 0))  # 0 = executor size
+    # Reject new jobs while the queued work exceeds this many seconds per running slot (0 disables)
+    ADMISSION_MAX_BACKLOG_SECONDS = float(os.environ.get('ADMISSION_MAX_BACKLOG_SECONDS', 3600))
+    # Learned conversion-time model
+    ESTIMATOR_MODEL_PATH = os.environ.get('ESTIMATOR_MODEL_PATH', 'data/estimator_model.json')
+    ESTIMATOR_ALPHA = float(os.environ.get('ESTIMATOR_ALPHA', 0.2))
+    ESTIMATOR_MIN_SAMPLES = int(os.environ.get('ESTIMATOR_MIN_SAMPLES', 3))
+    ESTIMATOR_SAVE_INTERVAL = float(os.environ.get('ESTIMATOR_SAVE_INTERVAL', 60))  # seconds
     CLEANUP_INTERVAL = int(os.environ.get('CLEANUP_INTERVAL', 3600))
+    FORMATS_CACHE_MAX_AGE = int(os.environ.get('FORMATS_CACHE_MAX_AGE', 3600))  # seconds
+    DOWNLOAD_CACHE_MAX_AGE = int(os.environ.get('DOWNLOAD_CACHE_MAX_AGE', 3600))  # seconds
+    # Let the front-end server (nginx/Apache) send download bodies via X-Sendfile
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
     
     # Comprehensive file type configurations
     ALLOWED_EXTENSIONS = {
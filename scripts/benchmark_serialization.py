@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Serialization Microbenchmark for FileConverter Pro
+
+Compares the job model's current serialization (slotted dataclasses,
+orjson/msgpack when installed) with the previous path (dataclasses.asdict
+plus json.dumps, nested dicts re-hydrated in __post_init__), and the
+memory held per job by slotted and regular dataclasses.
+
+Usage:
+    python scripts/benchmark_serialization.py [--files 50] [--jobs 2000] [--rounds 200]
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.conversion import (  # noqa: E402
+    ConversionError,
+    ConversionJob,
+    ConversionProgress,
+    ConvertedFile,
+    FileInfo,
+)
+from app.utils import serialization  # noqa: E402
+
+
+def make_job(file_count: int) -> ConversionJob:
+    """Build a finished job with file_count inputs, outputs and a few errors"""
+    files = [
+        FileInfo(
+            id=f"file-{i}", original_filename=f"holiday photo {i}.heic", filename=f"{i}_photo.heic",
+            path=f"uploads/{i}_photo.heic", size=3_500_000 + i, extension='heic', file_type='image',
+            mime_type='image/heic', checksum='9e107d9d372bb6826bd81d3542a419d6',
+            uploaded_at='2024-01-01T12:00:00'
+        )
+        for i in range(file_count)
+    ]
+    job = ConversionJob.create_new('jpg', files)
+    job.converted_files = [
+        ConvertedFile(
+            id=f"file-{i}", original_filename=f"holiday photo {i}.jpg", filename=f"{i}_photo.jpg",
+            path=f"converted/{i}_photo.jpg", size=900_000 + i, extension='jpg', file_type='image',
+            converted_at='2024-01-01T12:00:05', conversion_time=0.42, engine='imagemagick',
+            original_size=3_500_000 + i, compression_ratio=74.3,
+            checksum='e4d909c290d0fb1ca068ffaddf22cbd0'
+        )
+        for i in range(file_count)
+    ]
+    job.errors = [ConversionError(filename='broken.heic', error_message='Unsupported codec')]
+    job.completed_files = file_count
+    return job
+
+
+def legacy_dumps(job: ConversionJob) -> str:
+    """Previous serialization path"""
+    result = dataclasses.asdict(job)
+    result['status'] = job.status.value
+    return json.dumps(result, default=str)
+
+
+def legacy_loads(data: str) -> ConversionJob:
+    """Previous deserialization path, hydrating nested dicts one by one"""
+    raw = json.loads(data)
+    raw['files'] = [FileInfo.from_dict(f) if isinstance(f, dict) else f for f in raw['files']]
+    raw['converted_files'] = [
+        ConvertedFile.from_dict(f) if isinstance(f, dict) else f for f in raw['converted_files']
+    ]
+    raw['errors'] = [ConversionError.from_dict(e) if isinstance(e, dict) else e for e in raw['errors']]
+    raw['progress'] = ConversionProgress.from_dict(raw['progress'])
+    return ConversionJob(**raw)
+
+
+def unslotted(cls):
+    """Regular (dict-backed) dataclass with the same fields as a slotted one"""
+    specs = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+        elif f.default_factory is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type))
+    return dataclasses.make_dataclass(cls.__name__, specs)
+
+
+def measure_memory(build, count: int) -> float:
+    """Average bytes allocated per object built"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    held = [build() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return (after - before) / count
+
+
+def time_per_call(fn, rounds: int) -> float:
+    """Best-of-five microseconds per call"""
+    return min(timeit.repeat(fn, number=rounds, repeat=5)) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=50, help='Files per job')
+    parser.add_argument('--jobs', type=int, default=2000, help='Jobs held for the memory measurement')
+    parser.add_argument('--rounds', type=int, default=200, help='Calls per timing sample')
+    args = parser.parse_args()
+
+    job = make_job(args.files)
+    legacy_json = legacy_dumps(job)
+    fast_json = job.to_json()
+    packed = job.to_bytes()
+    assert ConversionJob.from_bytes(packed).to_dict() == ConversionJob.from_json(fast_json).to_dict()
+
+    print(f"orjson: {'yes' if serialization.orjson else 'no'}, "
+          f"msgpack: {'yes' if serialization.msgpack else 'no'}")
+    print(f"Job with {args.files} files: legacy JSON {len(legacy_json)} B, "
+          f"JSON {len(fast_json)} B, packed {len(packed)} B\n")
+
+    rows = [
+        ('serialize', time_per_call(lambda: legacy_dumps(job), args.rounds),
+         time_per_call(job.to_json, args.rounds), time_per_call(job.to_bytes, args.rounds)),
+        ('deserialize', time_per_call(lambda: legacy_loads(legacy_json), args.rounds),
+         time_per_call(lambda: ConversionJob.from_json(fast_json), args.rounds),
+         time_per_call(lambda: ConversionJob.from_bytes(packed), args.rounds)),
+    ]
+    print(f"{'us per job':<12}{'legacy':>12}{'json':>12}{'packed':>12}{'speedup':>10}")
+    for name, legacy, fast, binary in rows:
+        print(f"{name:<12}{legacy:>12.1f}{fast:>12.1f}{binary:>12.1f}{legacy / min(fast, binary):>9.1f}x")
+
+    # Memory held by the per-file records that dominate a job
+    plain_file_info = unslotted(FileInfo)
+    plain_converted = unslotted(ConvertedFile)
+    source = make_job(args.files)
+    file_fields = [dataclasses.asdict(f) for f in source.files]
+    converted_fields = [dataclasses.asdict(f) for f in source.converted_files]
+
+    def build(file_cls, converted_cls):
+        return lambda: (
+            [file_cls(**f) for f in file_fields],
+            [converted_cls(**f) for f in converted_fields],
+        )
+
+    regular = measure_memory(build(plain_file_info, plain_converted), args.jobs // 10 or 1)
+    slotted = measure_memory(build(FileInfo, ConvertedFile), args.jobs // 10 or 1)
+    print(f"\nFile records per job: regular {regular / 1024:.1f} KiB, slotted {slotted / 1024:.1f} KiB "
+          f"({(1 - slotted / regular) * 100:.0f}% less)")
+
+
+if __name__ == '__main__':
+    main()